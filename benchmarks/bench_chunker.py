@@ -0,0 +1,58 @@
+"""
+Microbenchmark: native Chunker vs langchain's TokenTextSplitter on a 10-K-sized document.
+
+    python benchmarks/bench_chunker.py --words 80000 --repeat 5
+"""
+
+import argparse
+import statistics
+import time
+from typing import Callable, List
+
+from langchain_text_splitters import TokenTextSplitter
+
+from findodo.parsers.chunker import Chunker
+
+from fixtures import synthetic_filing
+
+
+def timed(fn: Callable[[], object], repeat: int) -> float:
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        durations.append(time.perf_counter() - start)
+    return statistics.median(durations)
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--words", type=int, default=80_000, help="Words per synthetic filing")
+    arg_parser.add_argument("--docs", type=int, default=8, help="Documents for the batch measurement")
+    arg_parser.add_argument("--chunk-size", type=int, default=1024)
+    arg_parser.add_argument("--chunk-overlap", type=int, default=100)
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    args = arg_parser.parse_args()
+
+    text = synthetic_filing(args.words)
+    docs: List[str] = [synthetic_filing(args.words, seed) for seed in range(args.docs)]
+    splitter = TokenTextSplitter(chunk_size=args.chunk_size, chunk_overlap=args.chunk_overlap)
+    chunker = Chunker(chunk_size=args.chunk_size, chunk_overlap=args.chunk_overlap)
+
+    # Warm up tokenizers and lookup tables outside the timings
+    assert chunker.split(text) == splitter.split_text(text)
+
+    results = {
+        "TokenTextSplitter.split_text": timed(lambda: splitter.split_text(text), args.repeat),
+        "Chunker.chunk": timed(lambda: chunker.chunk(text), args.repeat),
+        f"TokenTextSplitter x{args.docs} docs": timed(lambda: [splitter.split_text(d) for d in docs], args.repeat),
+        f"Chunker.chunk_batch x{args.docs} docs": timed(lambda: chunker.chunk_batch(docs), args.repeat),
+    }
+
+    print(f"Input: {len(text):,} chars, {sum(c.num_tokens for c in chunker.chunk(text)):,} window tokens")
+    for name, seconds in results.items():
+        print(f"{name:<40} {seconds * 1000:9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Dataset loading benchmark: the flat JSONL output vs the partitioned Parquet dataset, on synthetic QA rows.
+
+    python benchmarks/bench_dataset_io.py --rows 500000 --tickers 50
+
+Every load runs in a fresh interpreter, so its peak RSS is measured on its own. Reported per mode:
+wall time of the load, peak RSS above the interpreter's baseline after imports, and rows returned.
+"""
+
+import argparse
+import json
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict
+
+from findodo.models import DatasetItem, SECJob
+from findodo.storage import JsonlWriter, iter_partitioned, open_writer, read_jsonl, read_partitioned
+
+from fixtures import synthetic_filing
+
+# Questions per chunk, roughly what a generation run produces
+QUESTIONS_PER_CHUNK = 4
+MODES = ["jsonl", "parquet", "parquet_projected", "parquet_filtered", "parquet_iter_filtered"]
+
+
+def peak_rss_mb() -> float:
+    # Linux keeps ru_maxrss across exec, so a fresh child would report its parent's peak; VmHWM is per process
+    status = Path("/proc/self/status")
+    if status.exists():
+        for line in status.read_text().splitlines():
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+    # ru_maxrss is in bytes on macOS
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (1024 * 1024)
+
+
+def build(root: Path, rows: int, tickers: int, years: int, context_words: int, seed: int) -> Dict[str, float]:
+    """Writes the same rows as a flat JSONL file and as a partitioned dataset; returns their sizes in MB."""
+    rng = random.Random(seed)
+    jobs = [SECJob(ticker=f"T{t:03d}", year=2020 + y, quarter=None) for t in range(tickers) for y in range(years)]
+    per_job = max(1, rows // len(jobs))
+    contexts = [synthetic_filing(context_words, seed + i) for i in range(64)]
+
+    with (
+        JsonlWriter(root / "flat.jsonl") as flat,
+        open_writer(root / "dataset", "parquet", "partitioned", run_id="bench") as dataset,
+    ):
+        for job in jobs:
+            dataset.begin_target(job.label, (), job.partition)
+            for i in range(per_job):
+                context = contexts[(i // QUESTIONS_PER_CHUNK + rng.randrange(64)) % 64]
+                item = DatasetItem(question=f"{job.label} question {i}?", answer=context[:200], context=context)
+                flat.write(item)
+                dataset.write(item)
+
+    dataset_mb = sum(p.stat().st_size for p in (root / "dataset").rglob("*.parquet")) / 1e6
+    return {
+        "jsonl_mb": (root / "flat.jsonl").stat().st_size / 1e6,
+        "parquet_mb": dataset_mb,
+        "rows": per_job * len(jobs),
+    }
+
+
+def load(mode: str, root: Path, ticker: str) -> Dict[str, Any]:
+    if mode != "jsonl":
+        # Import cost is not part of the load
+        import pyarrow.dataset  # noqa: F401
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+    if mode == "jsonl":
+        num_rows = len(read_jsonl(root / "flat.jsonl"))
+    elif mode == "parquet":
+        num_rows = read_partitioned(root / "dataset").num_rows
+    elif mode == "parquet_projected":
+        num_rows = read_partitioned(root / "dataset", columns=["question", "answer"]).num_rows
+    elif mode == "parquet_filtered":
+        num_rows = read_partitioned(root / "dataset", filters=[("ticker", "=", ticker)]).num_rows
+    else:
+        num_rows = sum(1 for _ in iter_partitioned(root / "dataset", filters=[("ticker", "=", ticker)]))
+    seconds = time.perf_counter() - start
+    return {"seconds": seconds, "peak_rss_mb": peak_rss_mb() - baseline, "rows": num_rows}
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--rows", type=int, default=200_000)
+    arg_parser.add_argument("--tickers", type=int, default=20)
+    arg_parser.add_argument("--years", type=int, default=3)
+    arg_parser.add_argument("--context-words", type=int, default=300, help="Words per chunk context")
+    arg_parser.add_argument("--modes", nargs="+", choices=MODES, default=MODES)
+    arg_parser.add_argument("--seed", type=int, default=0)
+    arg_parser.add_argument("--output", type=Path, help="Also write the results as JSON")
+    # Internal: run a single load in this process and print its result
+    arg_parser.add_argument("--load", choices=MODES, help=argparse.SUPPRESS)
+    arg_parser.add_argument("--root", type=Path, help=argparse.SUPPRESS)
+    args = arg_parser.parse_args()
+
+    if args.load:
+        print(json.dumps(load(args.load, args.root, ticker="T000")))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        start = time.perf_counter()
+        sizes = build(root, args.rows, args.tickers, args.years, args.context_words, args.seed)
+        print(f"Wrote {sizes['rows']:.0f} rows in {time.perf_counter() - start:.1f}s")
+        print(f"  flat JSONL         {sizes['jsonl_mb']:10.1f} MB")
+        print(f"  partitioned Parquet {sizes['parquet_mb']:9.1f} MB")
+
+        results: Dict[str, Any] = {"sizes": sizes}
+        print(f"\n{'mode':<24} {'seconds':>10} {'peak RSS MB':>12} {'rows':>10}")
+        for mode in args.modes:
+            command = [sys.executable, __file__, "--load", mode, "--root", str(root)]
+            output = subprocess.run(command, capture_output=True, text=True, check=True).stdout
+            results[mode] = json.loads(output.strip().splitlines()[-1])
+            r = results[mode]
+            print(f"{mode:<24} {r['seconds']:10.3f} {r['peak_rss_mb']:12.1f} {r['rows']:10d}")
+
+    if args.output is not None:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
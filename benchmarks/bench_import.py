@@ -0,0 +1,68 @@
+"""
+Import-time benchmark: how long `import <module>` takes in a fresh interpreter, and which
+third-party packages dominate it (parsed from `python -X importtime`).
+
+    python benchmarks/bench_import.py findodo.generator findodo.main --repeat 5
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+LINE_PATTERN = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+
+def import_profile(module: str) -> Tuple[float, Dict[str, float]]:
+    """
+    Returns the total import time of `module` in ms and, per top-level package, the cumulative ms
+    of its outermost import (what the package costs, including its own dependencies).
+    """
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [str(SRC), os.environ.get("PYTHONPATH")]))}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    packages: Dict[str, float] = {}
+    total = 0.0
+    for line in result.stderr.splitlines():
+        match = LINE_PATTERN.match(line)
+        if match is None:
+            continue
+        cumulative_ms = int(match.group(2)) / 1000
+        name = match.group(4)
+        if name == module:
+            total = cumulative_ms
+        top = name.split(".")[0]
+        if top != "findodo":
+            packages[top] = max(packages.get(top, 0.0), cumulative_ms)
+    return total, packages
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("modules", nargs="*", default=["findodo.config", "findodo.generator", "findodo.main"])
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    arg_parser.add_argument("--top", type=int, default=8, help="Heaviest packages to list per module")
+    args = arg_parser.parse_args()
+
+    for module in args.modules:
+        runs: List[Tuple[float, Dict[str, float]]] = [import_profile(module) for _ in range(args.repeat)]
+        total = statistics.median(run[0] for run in runs)
+        packages = runs[-1][1]
+        heaviest = sorted(packages.items(), key=lambda item: -item[1])[: args.top]
+        print(f"{module:<24} {total:9.1f} ms")
+        for name, ms in heaviest:
+            print(f"    {name:<20} {ms:9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
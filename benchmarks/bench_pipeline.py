@@ -0,0 +1,234 @@
+"""
+End-to-end throughput benchmark: chunking, PDF parsing and generation at several concurrency levels,
+with generation served by local fakes instead of the OpenAI API.
+
+    python benchmarks/bench_pipeline.py --concurrency 1 4 16 --latency 0.2 --rate-limit-rate 0.05
+    python benchmarks/bench_pipeline.py --scenarios chunk parse_pdf --compare benchmarks/results/pipeline-abc1234.json
+
+Results are written as JSON (default: benchmarks/results/pipeline-<commit>.json); `--compare` prints the
+change against an earlier result file, so regressions show up between commits.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from findodo.config import ChunkerConfig, Config, PackingConfig, ParserConfig, PromptConfig, ProviderConfig
+from findodo.core.metrics import METRICS
+from findodo.generator import Generator
+from findodo.parsers.chunker import Chunker
+from findodo.parsers.pdf import PDFParser
+
+from fakes import FakeOpenAIServer, FakeProvider
+from fixtures import synthetic_10k_items, synthetic_pages, write_pdf
+
+SCENARIOS = ["chunk", "parse_pdf", "generate_fake", "generate_http", "generate_http_packed"]
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+# Metrics kept from a generation run against the fake server
+GENERATION_METRICS = [
+    "llm.requests",
+    "llm.retries",
+    "llm.rate_limited",
+    "llm.failed_requests",
+    "items.dropped_malformed",
+    "llm.unparseable_responses",
+    "questions.requested",
+    "questions.delivered",
+    "llm.latency_s.p50",
+    "llm.latency_s.p99",
+    "llm.time_to_first_item_s.p50",
+    "llm.truncated_responses",
+]
+
+
+def git_commit() -> Optional[str]:
+    try:
+        result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+def timed(fn: Callable[[], Any], repeat: int) -> Tuple[float, Any]:
+    """Median wall time over `repeat` runs, and the result of the last run."""
+    durations = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        durations.append(time.perf_counter() - start)
+    return statistics.median(durations), result
+
+
+def generation_config(args: argparse.Namespace, concurrency: int, base_url: Optional[str] = None) -> Config:
+    return Config(
+        chunker=ChunkerConfig(chunk_size=args.chunk_size, chunk_overlap=args.chunk_overlap),
+        parser=ParserConfig(name="sec"),
+        provider=ProviderConfig(
+            name="openai",
+            model="gpt-4",
+            api_key="sk-benchmark",
+            base_url=base_url,
+            max_concurrency=concurrency,
+            stream=args.stream,
+            packing=PackingConfig(enabled=args.packed),
+        ),
+        prompt=PromptConfig(name="bench", system_prompt="You generate financial QA pairs."),
+    )
+
+
+def bench_chunk(args: argparse.Namespace, chunks: List[str]) -> Dict[str, Any]:
+    text = "\n\n".join(synthetic_10k_items(args.words).values())
+    chunker = Chunker(chunk_size=args.chunk_size, chunk_overlap=args.chunk_overlap)
+    chunker.chunk(text[:1000])
+    seconds, result = timed(lambda: chunker.chunk(text), args.repeat)
+    tokens = len(chunker.encoding.encode_ordinary(text))
+    return {"seconds": seconds, "chunks": len(result), "tokens_per_s": tokens / seconds}
+
+
+def bench_parse_pdf(args: argparse.Namespace, chunks: List[str]) -> Dict[str, Any]:
+    results: Dict[str, Any] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        path = write_pdf(Path(tmp) / "annual-report.pdf", synthetic_pages(args.pages))
+        chunker_config = ChunkerConfig(chunk_size=args.chunk_size, chunk_overlap=args.chunk_overlap)
+        for workers in sorted({0, *args.page_workers}):
+            parser = PDFParser(ParserConfig(name="pdf", page_workers=workers), chunker_config)
+            seconds, parsed = timed(lambda: parser.parse(str(path)), args.repeat)
+            results[f"page_workers={workers}"] = {
+                "seconds": seconds,
+                "chunks": len(parsed),
+                "pages_per_s": args.pages / seconds,
+            }
+    return results
+
+
+def _generate(generator: Generator, chunks: List[str], questions: int) -> Dict[str, Any]:
+    METRICS.reset()
+    start = time.perf_counter()
+    dataset = generator.generate_from_texts(chunks, questions)
+    seconds = time.perf_counter() - start
+    summary = METRICS.summary()
+    return {
+        "seconds": seconds,
+        "items": len(dataset.items),
+        "items_per_s": len(dataset.items) / seconds,
+        **{name: summary[name] for name in GENERATION_METRICS if name in summary},
+    }
+
+
+def bench_generate_fake(args: argparse.Namespace, chunks: List[str]) -> Dict[str, Any]:
+    results = {}
+    for concurrency in args.concurrency:
+        provider = FakeProvider(latency_s=args.latency, jitter_s=args.jitter, seed=args.seed)
+        generator = Generator(generation_config(args, concurrency), provider=provider)
+        results[f"concurrency={concurrency}"] = _generate(generator, chunks, args.questions)
+    return results
+
+
+def bench_generate_http(args: argparse.Namespace, chunks: List[str]) -> Dict[str, Any]:
+    results = {}
+    for concurrency in args.concurrency:
+        with FakeOpenAIServer(
+            latency_s=args.latency,
+            jitter_s=args.jitter,
+            rate_limit_rate=args.rate_limit_rate,
+            malformed_rate=args.malformed_rate,
+            seed=args.seed,
+        ) as server:
+            generator = Generator(generation_config(args, concurrency, base_url=server.base_url))
+            results[f"concurrency={concurrency}"] = {**_generate(generator, chunks, args.questions), **server.stats}
+    return results
+
+
+def bench_generate_http_packed(args: argparse.Namespace, chunks: List[str]) -> Dict[str, Any]:
+    return bench_generate_http(argparse.Namespace(**{**vars(args), "packed": True}), chunks)
+
+
+def flatten(results: Dict[str, Any], prefix: str = "") -> Dict[str, float]:
+    """{"generate_fake": {"concurrency=4": {"seconds": 1.0}}} -> {"generate_fake/concurrency=4/seconds": 1.0}"""
+    flat: Dict[str, float] = {}
+    for key, value in results.items():
+        name = f"{prefix}/{key}" if prefix else key
+        if isinstance(value, dict):
+            flat.update(flatten(value, name))
+        elif isinstance(value, (int, float)):
+            flat[name] = float(value)
+    return flat
+
+
+def compare(current: Dict[str, Any], baseline_path: Path) -> None:
+    baseline = flatten(json.loads(baseline_path.read_text(encoding="utf-8"))["scenarios"])
+    print(f"\nChange in wall time vs {baseline_path.name} (negative is faster):")
+    for name, seconds in flatten(current).items():
+        if not name.endswith("/seconds") or not baseline.get(name):
+            continue
+        change = (seconds - baseline[name]) / baseline[name] * 100
+        print(f"{name.removesuffix('/seconds'):<50} {baseline[name]:8.3f}s -> {seconds:8.3f}s  {change:+6.1f}%")
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=SCENARIOS)
+    arg_parser.add_argument("--words", type=int, default=80_000, help="Words in the synthetic 10-K")
+    arg_parser.add_argument("--pages", type=int, default=300, help="Pages in the synthetic PDF")
+    arg_parser.add_argument("--page-workers", type=int, nargs="+", default=[4], help="PDF extraction processes")
+    arg_parser.add_argument("--chunks", type=int, default=64, help="Chunks sent to generation")
+    arg_parser.add_argument("--questions", type=int, default=128, help="Question budget of a generation run")
+    arg_parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    arg_parser.add_argument("--latency", type=float, default=0.05, help="Seconds per fake LLM request")
+    arg_parser.add_argument("--jitter", type=float, default=0.02, help="Uniform +/- jitter on the latency")
+    arg_parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Share of 429 answers")
+    arg_parser.add_argument("--malformed-rate", type=float, default=0.0, help="Share of malformed answers")
+    arg_parser.add_argument("--stream", action="store_true", help="Stream completions from the fake server")
+    arg_parser.add_argument("--chunk-size", type=int, default=512)
+    arg_parser.add_argument("--chunk-overlap", type=int, default=50)
+    arg_parser.add_argument("--repeat", type=int, default=3, help="Runs per chunk/parse measurement (median)")
+    arg_parser.add_argument("--seed", type=int, default=0)
+    arg_parser.add_argument("--output", type=Path, help="Result file (default: results/pipeline-<commit>.json)")
+    arg_parser.add_argument("--compare", type=Path, help="Earlier result file to compare against")
+    args = arg_parser.parse_args()
+    args.packed = False
+
+    chunker = Chunker(chunk_size=args.chunk_size, chunk_overlap=args.chunk_overlap)
+    chunks = chunker.split("\n\n".join(synthetic_10k_items(args.words).values()))[: args.chunks]
+
+    METRICS.enabled = True
+    scenarios: Dict[str, Any] = {}
+    for name in args.scenarios:
+        print(f"Running {name}...")
+        scenarios[name] = globals()[f"bench_{name}"](args, chunks)
+
+    commit = git_commit()
+    report = {
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "args": {key: str(value) if isinstance(value, Path) else value for key, value in vars(args).items()},
+        "scenarios": scenarios,
+    }
+    output = args.output or RESULTS_DIR / f"pipeline-{commit or 'local'}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    for name, value in flatten(scenarios).items():
+        if name.endswith(("/seconds", "_per_s")):
+            print(f"{name:<60} {value:12.3f}")
+    print(f"\nResults written to {output}")
+
+    if args.compare is not None:
+        compare(scenarios, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+"""
+Offline stand-ins for the LLM, so pipeline throughput can be measured without paying for API calls.
+
+FakeProvider     A deterministic BaseProvider with a fixed (optionally jittered) latency per request.
+FakeOpenAIServer An OpenAI-compatible HTTP server for /v1/chat/completions. It answers the generation
+                 tool call with configurable latency, jitter, 429 rate and malformed-output rate, so the
+                 real OpenAIProvider (retries, rate limiting, parsing) runs end to end against it.
+"""
+
+import asyncio
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+from findodo.core.providing import BaseProvider
+from findodo.models import DatasetItem, QAPair
+
+SINGLE_PATTERN = re.compile(r"Generate (\d+) questions for this text: (.*)", re.DOTALL)
+PACKED_PATTERN = re.compile(r'<chunk id="(\d+)" questions="(\d+)">\n(.*?)\n</chunk>', re.DOTALL)
+
+
+def fake_items(text: str, num_questions: int) -> List[Dict[str, str]]:
+    """Deterministic QA pairs for a chunk: the same text always yields the same questions."""
+    digest = hashlib.sha256(text.encode("utf-8")).hexdigest()[:8]
+    words = text.split()
+    return [
+        {"question": f"Question {i} about section {digest}?", "answer": " ".join(words[i : i + 12])}
+        for i in range(num_questions)
+    ]
+
+
+class FakeProvider(BaseProvider):
+    """
+    Answers every request with fake_items after `latency_s` (+/- `jitter_s`), without any network.
+    The jitter is drawn from a seeded RNG, so repeated runs sleep the same amounts.
+    """
+
+    def __init__(self, latency_s: float = 0.0, jitter_s: float = 0.0, seed: int = 0):
+        super().__init__(config=None, prompt_config=None)
+        self.latency_s = latency_s
+        self.jitter_s = jitter_s
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.requests = 0
+
+    def _delay(self) -> float:
+        with self._lock:
+            self.requests += 1
+            return max(0.0, self.latency_s + self._rng.uniform(-self.jitter_s, self.jitter_s))
+
+    def generate_qa(self, text: str, num_questions: int) -> List[DatasetItem]:
+        time.sleep(self._delay())
+        return [DatasetItem.from_chunk(QAPair(**item), text) for item in fake_items(text, num_questions)]
+
+    async def agenerate_qa(self, text: str, num_questions: int) -> List[DatasetItem]:
+        await asyncio.sleep(self._delay())
+        return [DatasetItem.from_chunk(QAPair(**item), text) for item in fake_items(text, num_questions)]
+
+
+class FakeOpenAIServer:
+    """
+    Local OpenAI-compatible chat completions endpoint. Use it as a context manager and point the
+    provider's `base_url` at `server.base_url`:
+
+        with FakeOpenAIServer(latency_s=0.2, rate_limit_rate=0.05) as server:
+            config.provider.base_url = server.base_url
+
+    rate_limit_rate: share of requests answered with 429 and a `retry-after-ms` header.
+    malformed_rate:  share of answers with one item missing its answer, or with truncated JSON arguments.
+
+    Streamed requests (`stream: true`) get server-sent events: the arguments arrive in `stream_piece_chars`
+    pieces spread evenly over the latency, like tokens from a real model, followed by a usage chunk.
+    """
+
+    def __init__(
+        self,
+        latency_s: float = 0.0,
+        jitter_s: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        malformed_rate: float = 0.0,
+        retry_after_ms: int = 50,
+        stream_piece_chars: int = 16,
+        seed: int = 0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        self.latency_s = latency_s
+        self.jitter_s = jitter_s
+        self.rate_limit_rate = rate_limit_rate
+        self.malformed_rate = malformed_rate
+        self.retry_after_ms = retry_after_ms
+        self.stream_piece_chars = stream_piece_chars
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "rate_limited": 0, "malformed": 0}
+
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host!s}:{port}/v1"
+
+    def start(self) -> "FakeOpenAIServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "FakeOpenAIServer":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def _draw(self) -> Tuple[float, bool, bool, float]:
+        """Latency, whether to answer 429, whether to answer malformed, and a value to pick the malformation."""
+        with self._lock:
+            self.stats["requests"] += 1
+            latency = max(0.0, self.latency_s + self._rng.uniform(-self.jitter_s, self.jitter_s))
+            limited = self._rng.random() < self.rate_limit_rate
+            malformed = not limited and self._rng.random() < self.malformed_rate
+            if limited:
+                self.stats["rate_limited"] += 1
+            if malformed:
+                self.stats["malformed"] += 1
+            return latency, limited, malformed, self._rng.random()
+
+    def completion(self, body: Dict[str, Any], malformed: bool = False, pick: float = 0.0) -> Dict[str, Any]:
+        """The chat completion answering `body`, as a JSON-ready dict."""
+        prompt = body["messages"][-1]["content"]
+        packed = PACKED_PATTERN.findall(prompt)
+        items: List[Dict[str, Any]] = []
+        if packed:
+            for chunk_id, num_questions, text in packed:
+                items.extend({**item, "chunk_id": int(chunk_id)} for item in fake_items(text, int(num_questions)))
+        else:
+            match = SINGLE_PATTERN.match(prompt)
+            if match is not None:
+                items = fake_items(match.group(2), int(match.group(1)))
+
+        arguments = json.dumps({"items": items})
+        if malformed and items:
+            if pick < 0.5:
+                items[-1].pop("answer")
+                arguments = json.dumps({"items": items})
+            else:
+                arguments = arguments[: len(arguments) // 2]
+
+        prompt_tokens = sum(len(str(m.get("content", "")).split()) for m in body["messages"])
+        completion_tokens = len(arguments.split())
+        return {
+            "id": f"chatcmpl-{self.stats['requests']}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "fake"),
+            "choices": [
+                {
+                    "index": 0,
+                    "finish_reason": "tool_calls",
+                    "message": {
+                        "role": "assistant",
+                        "content": None,
+                        "tool_calls": [
+                            {
+                                "id": "call_0",
+                                "type": "function",
+                                "function": {"name": "generate_dataset", "arguments": arguments},
+                            }
+                        ],
+                    },
+                }
+            ],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        }
+
+    def _handler_class(self) -> type:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self) -> None:
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+                latency, limited, malformed, pick = server._draw()
+                if limited:
+                    time.sleep(latency)
+                    error = {
+                        "error": {"message": "Rate limit reached", "type": "requests", "code": "rate_limit_exceeded"}
+                    }
+                    self._send(429, error, {"retry-after-ms": str(server.retry_after_ms)})
+                elif body.get("stream"):
+                    self._send_stream(server.completion(body, malformed, pick), latency)
+                else:
+                    time.sleep(latency)
+                    self._send(200, server.completion(body, malformed, pick))
+
+            def _send_stream(self, completion: Dict[str, Any], latency: float) -> None:
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Connection", "close")
+                self.end_headers()
+                self.close_connection = True
+
+                arguments = completion["choices"][0]["message"]["tool_calls"][0]["function"]["arguments"]
+                size = server.stream_piece_chars
+                pieces = [arguments[i : i + size] for i in range(0, len(arguments), size)] or [""]
+                base = {key: completion[key] for key in ("id", "created", "model")}
+                try:
+                    for piece in pieces:
+                        time.sleep(latency / len(pieces))
+                        call = {"index": 0, "id": "call_0", "type": "function"}
+                        call["function"] = {"name": "generate_dataset", "arguments": piece}
+                        delta = {"role": "assistant", "tool_calls": [call]}
+                        chunk = {**base, "object": "chat.completion.chunk", "choices": [{"index": 0, "delta": delta}]}
+                        self._event(chunk)
+                    self._event(
+                        {**base, "object": "chat.completion.chunk", "choices": [], "usage": completion["usage"]}
+                    )
+                    self.wfile.write(b"data: [DONE]\n\n")
+                except (BrokenPipeError, ConnectionResetError):
+                    # The client stopped reading, e.g. because its quota was met
+                    pass
+
+            def _event(self, payload: Dict[str, Any]) -> None:
+                self.wfile.write(b"data: " + json.dumps(payload).encode("utf-8") + b"\n\n")
+                self.wfile.flush()
+
+            def _send(self, status: int, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None) -> None:
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        return Handler
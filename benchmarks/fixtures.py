@@ -0,0 +1,82 @@
+"""
+Synthetic benchmark documents: 10-K style text and multi-hundred-page text PDFs.
+Everything is generated from a seed, so every run and every commit measures the same input.
+"""
+
+import random
+from pathlib import Path
+from typing import List
+
+VOCABULARY = (
+    "revenue net income operating segment fiscal year compared increase decrease primarily due to "
+    "higher lower services products gross margin cash flows liquidity capital expenditures risk factors "
+    "the company our we in of and for with million billion percent quarter results customers demand"
+).split()
+
+ITEM_TITLES = [
+    "Item 1. Business",
+    "Item 1A. Risk Factors",
+    "Item 7. Management's Discussion and Analysis of Financial Condition and Results of Operations",
+    "Item 7A. Quantitative and Qualitative Disclosures About Market Risk",
+    "Item 8. Financial Statements and Supplementary Data",
+]
+
+
+def synthetic_filing(num_words: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    sentences = []
+    for _ in range(num_words // 12):
+        words = rng.choices(VOCABULARY, k=11)
+        sentences.append(" ".join(words).capitalize() + f" {rng.randint(1, 999)}.{rng.randint(0, 9)}%.")
+    return " ".join(sentences)
+
+
+def synthetic_10k_items(num_words: int, seed: int = 0) -> dict[str, str]:
+    """A 10-K as SECParser.fetch_items returns it: item title -> cleaned text, `num_words` in total."""
+    per_item = num_words // len(ITEM_TITLES)
+    return {title: synthetic_filing(per_item, seed + i) for i, title in enumerate(ITEM_TITLES)}
+
+
+def synthetic_pages(num_pages: int, lines_per_page: int = 40, seed: int = 0) -> List[str]:
+    """Page texts of an annual report; every fifth page is a numeric table."""
+    rng = random.Random(seed)
+    pages = []
+    for page in range(num_pages):
+        if page % 5 == 4:
+            lines = [
+                f"{rng.choice(VOCABULARY).title()} {rng.randint(100, 99999)} {rng.randint(100, 99999)}"
+                for _ in range(lines_per_page)
+            ]
+        else:
+            lines = [" ".join(rng.choices(VOCABULARY, k=10)).capitalize() + "." for _ in range(lines_per_page)]
+        pages.append("\n".join(lines))
+    return pages
+
+
+def write_pdf(path: Path, pages: List[str]) -> Path:
+    """Writes a minimal PDF with Helvetica text; each page's lines are separated by newlines."""
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", b"", b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for text in pages:
+        escaped = text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+        lines = " T* ".join(f"({line}) Tj" for line in escaped.split("\n"))
+        stream = f"BT /F1 10 Tf 12 TL 72 760 Td {lines} ET".encode("latin-1", "replace")
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % (len(objects))
+        )
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(pages)} >>".encode()
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    path.write_bytes(bytes(out))
+    return path
@@ -0,0 +1,192 @@
+import hashlib
+import re
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import tiktoken
+from pydantic import BaseModel
+
+# Phrases that mark cover pages, tables of contents, signature blocks and other filing boilerplate
+BOILERPLATE_PATTERNS = [
+    re.compile(pattern, re.IGNORECASE)
+    for pattern in (
+        r"table of contents",
+        r"indicate by check mark",
+        r"pursuant to the requirements of",
+        r"securities registered pursuant to section",
+        r"exhibit index",
+        r"incorporated (?:herein )?by reference",
+        r"/s/\s*\w+",
+        r"thereunto duly authorized",
+        r"\bpage \d+ of \d+\b",
+        r"(?:\.\s?){5,}\s*\d+",  # dotted leaders to a page number
+    )
+]
+NUMBER_PATTERN = re.compile(r"^\(?[-$]?\d[\d,]*(?:\.\d+)?\)?%?$")
+
+
+class ChunkScore(BaseModel):
+    index: int
+    num_tokens: int
+    numeric_density: float
+    boilerplate_hits: int
+    duplicate_of: Optional[int] = None
+    # diverse strategy: how many eligible chunks are closest to this selected one
+    represents: Optional[int] = None
+    weight: float = 0.0
+    questions: int = 0
+    skipped: Optional[str] = None
+
+
+class AllocationPlan(BaseModel):
+    strategy: str
+    total_questions: int
+    chunks: List[ChunkScore]
+
+    @property
+    def allocation(self) -> List[int]:
+        return [chunk.questions for chunk in self.chunks]
+
+    def summary(self) -> Dict[str, int]:
+        skipped = [chunk for chunk in self.chunks if chunk.skipped]
+        return {
+            "chunks_total": len(self.chunks),
+            "chunks_skipped": len(skipped),
+            "chunks_skipped_boilerplate": sum(1 for chunk in skipped if chunk.skipped == "boilerplate"),
+            "chunks_skipped_duplicate": sum(1 for chunk in skipped if chunk.skipped == "duplicate"),
+            "chunks_skipped_short": sum(1 for chunk in skipped if chunk.skipped == "short"),
+            "chunks_not_selected": sum(1 for chunk in skipped if chunk.skipped == "not_selected"),
+            "chunks_with_questions": sum(1 for chunk in self.chunks if chunk.questions > 0),
+        }
+
+
+def numeric_density(text: str) -> float:
+    """Share of whitespace-separated words that are numbers or amounts."""
+    words = text.split()
+    if not words:
+        return 0.0
+    return sum(1 for word in words if NUMBER_PATTERN.match(word.rstrip(".,;:"))) / len(words)
+
+
+def boilerplate_hits(text: str) -> int:
+    """Number of distinct boilerplate patterns found in the text."""
+    return sum(1 for pattern in BOILERPLATE_PATTERNS if pattern.search(text))
+
+
+def _fingerprint(text: str) -> str:
+    # Case and whitespace differences do not make a chunk new
+    return hashlib.sha1(" ".join(text.lower().split()).encode("utf-8")).hexdigest()
+
+
+def allocate_proportionally(weights: Sequence[float], total: int) -> List[int]:
+    """
+    Splits `total` into integers proportional to `weights` (largest remainder method).
+    Ties in the remainder go to the earlier chunk.
+    """
+    weight_sum = sum(weights)
+    if weight_sum <= 0:
+        return [0] * len(weights)
+    quotas = [total * weight / weight_sum for weight in weights]
+    allocation = [int(quota) for quota in quotas]
+    by_remainder = sorted(range(len(weights)), key=lambda i: (-(quotas[i] - allocation[i]), i))
+    for i in by_remainder[: total - sum(allocation)]:
+        allocation[i] += 1
+    return allocation
+
+
+def score_chunks(
+    texts: Sequence[str],
+    encoding: tiktoken.Encoding,
+    config: Any,
+    tokens: Optional[Sequence[Sequence[int]]] = None,
+) -> List[ChunkScore]:
+    """
+    Scores every chunk locally: token count, numeric density, boilerplate and exact-duplicate detection.
+    Skipped chunks get weight 0; the others are weighted by tokens, boosted by their share of numbers.
+    `tokens` are the chunks' token IDs, if the caller has already encoded them.
+    """
+    if tokens is None:
+        tokens = encoding.encode_ordinary_batch(list(texts))
+    token_counts = [len(chunk_tokens) for chunk_tokens in tokens]
+    seen: Dict[str, int] = {}
+    scores = []
+    for index, (text, num_tokens) in enumerate(zip(texts, token_counts)):
+        score = ChunkScore(
+            index=index,
+            num_tokens=num_tokens,
+            numeric_density=round(numeric_density(text), 4),
+            boilerplate_hits=boilerplate_hits(text),
+        )
+        fingerprint = _fingerprint(text)
+        if config.skip_duplicates and fingerprint in seen:
+            score.duplicate_of = seen[fingerprint]
+            score.skipped = "duplicate"
+        elif num_tokens < config.min_tokens:
+            score.skipped = "short"
+        elif score.boilerplate_hits >= config.boilerplate_min_hits:
+            score.skipped = "boilerplate"
+        else:
+            score.weight = num_tokens * (1 + config.numeric_weight * score.numeric_density)
+        seen.setdefault(fingerprint, index)
+        scores.append(score)
+    return scores
+
+
+def select_diverse(
+    scores: List[ChunkScore],
+    tokens: Sequence[Sequence[int]],
+    total_questions: int,
+    config: Any,
+    seed: int = 0,
+) -> None:
+    """
+    Narrows the eligible chunks (weight > 0) to a diverse subset when the budget cannot cover them all at
+    `questions_per_chunk` each: chunks are embedded as hashed n-gram TF-IDF vectors and picked by farthest-point
+    sampling. The others are skipped as "not_selected"; each selected chunk's weight is scaled by the number of
+    chunks it represents, so the budget follows how much of the filing each one stands for.
+    """
+    from findodo.selection import chunk_vectors, farthest_point_sample
+
+    eligible = [score for score in scores if score.weight > 0]
+    num_selected = max(1, -(-total_questions // config.questions_per_chunk))
+    if num_selected >= len(eligible):
+        return
+
+    vectors = chunk_vectors([tokens[score.index] for score in eligible], config.num_features, seed)
+    picked, assignment = farthest_point_sample(vectors, num_selected, seed)
+    sizes = np.bincount(assignment, minlength=len(picked))
+    selected = {eligible[row].index: int(size) for row, size in zip(picked, sizes)}
+    for score in eligible:
+        if score.index in selected:
+            score.represents = selected[score.index]
+            score.weight *= score.represents
+        else:
+            score.skipped = "not_selected"
+            score.weight = 0.0
+
+
+def plan_allocation(
+    texts: Sequence[str], total_questions: int, encoding: tiktoken.Encoding, config: Any, seed: int = 0
+) -> AllocationPlan:
+    """
+    Builds the question plan for a run: low-value chunks are skipped and the budget is split
+    in proportion to the remaining chunks' weights.
+    With the "diverse" strategy, a small budget first goes to a diverse subset of the chunks (select_diverse),
+    each of which gets at least one question.
+    If every chunk would be skipped, the budget is spread evenly instead so the run still produces data.
+    """
+    tokens = encoding.encode_ordinary_batch(list(texts))
+    scores = score_chunks(texts, encoding, config, tokens)
+    if config.strategy == "diverse":
+        select_diverse(scores, tokens, total_questions, config, seed)
+    weights = [score.weight for score in scores]
+    if not any(weights):
+        print("Warning: Every chunk scored as low-value; falling back to an even allocation.")
+        weights = [1.0] * len(scores)
+
+    # Selected chunks were chosen to be covered, so each gets one question before the rest is split
+    floor = [1 if score.represents else 0 for score in scores]
+    allocation = allocate_proportionally(weights, total_questions - sum(floor))
+    for score, base, questions in zip(scores, floor, allocation):
+        score.questions = base + questions
+    return AllocationPlan(strategy=config.strategy, total_questions=total_questions, chunks=scores)
@@ -0,0 +1,158 @@
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Literal, Optional, Set, Tuple
+
+from pydantic import BaseModel
+
+from findodo.generator import Generator
+from findodo.models import FilingItem, SECJob
+from findodo.parsers.chunker import Chunker
+from findodo.parsers.sec import select_items
+from findodo.storage.writers import DatasetWriter
+
+
+class JobResult(BaseModel):
+    job: SECJob
+    status: Literal["succeeded", "failed"]
+    num_chunks: int = 0
+    num_items: int = 0
+    error: Optional[str] = None
+
+
+@lru_cache(maxsize=4)
+def _get_chunker(chunk_size: int, chunk_overlap: int, encoding: str) -> Chunker:
+    # One chunker (and tokenizer) per worker process
+    return Chunker(chunk_size=chunk_size, chunk_overlap=chunk_overlap, encoding=encoding)
+
+
+def _chunk_job(
+    item_texts: Dict[str, str], items: Optional[List[FilingItem]], chunk_size: int, chunk_overlap: int, encoding: str
+) -> List[str]:
+    """Process-pool task: select the requested items and split them into chunks."""
+    return _get_chunker(chunk_size, chunk_overlap, encoding).split(select_items(item_texts, items))
+
+
+class BulkSECPipeline:
+    """
+    Runs many (ticker, year, quarter, items) jobs:
+
+    1. Filings are fetched concurrently in a thread pool; the shared SEC parser throttles every EDGAR
+       request to `edgar_requests_per_second` (cache hits make none).
+    2. Each fetched filing is chunked in a process pool as soon as it arrives.
+    3. Chunks stream into generation job by job as they become ready.
+
+    A failing job is reported in its JobResult and never aborts the rest of the batch.
+    """
+
+    def __init__(
+        self,
+        generator: Generator,
+        fetch_workers: int = 4,
+        parse_workers: int = 4,
+    ):
+        self.generator = generator
+        self.parser = generator.sec_parser
+        self.fetch_workers = fetch_workers
+        self.parse_workers = parse_workers
+
+    @classmethod
+    def from_generator(cls, generator: Generator) -> "BulkSECPipeline":
+        parser_config = generator.config.parser
+        return cls(
+            generator,
+            fetch_workers=getattr(parser_config, "fetch_workers", 4),
+            parse_workers=getattr(parser_config, "parse_workers", 4),
+        )
+
+    def _fetch(self, job: SECJob) -> Dict[str, str]:
+        return self.parser.fetch_items(job.ticker, job.year, job.quarter)
+
+    def run(self, jobs: List[SECJob], questions_per_job: int, writer: DatasetWriter) -> List[JobResult]:
+        results: Dict[int, JobResult] = {}
+        for index, parsed in self.iter_chunks(jobs):
+            # Generate for a job as soon as its chunks are ready, while the pools keep working
+            results[index] = self._generate(jobs[index], parsed, questions_per_job, writer)
+        return [results[i] for i in range(len(jobs))]
+
+    def iter_chunks(self, jobs: List[SECJob]) -> Iterator[Tuple[int, "Future[List[str]]"]]:
+        """
+        Fetches and chunks `jobs` concurrently. Yields (job index, future) in completion order; the future
+        holds the job's chunks, or raises the error of its failed fetch or chunking.
+
+        At most 2 x fetch_workers jobs are fetched or chunked ahead of the consumer, and a job is forgotten
+        once yielded, so memory stays bounded however long the job list is.
+        """
+        chunker_config = self.generator.config.chunker
+        upcoming = iter(enumerate(jobs))
+
+        # parse_workers=0 chunks in a single background thread instead of separate processes
+        parse_pool: Executor = (
+            ProcessPoolExecutor(max_workers=self.parse_workers)
+            if self.parse_workers > 0
+            else ThreadPoolExecutor(max_workers=1)
+        )
+        with ThreadPoolExecutor(max_workers=self.fetch_workers) as fetch_pool, parse_pool:
+            fetches: Dict[Future[Any], int] = {}
+            parses: Dict[Future[Any], int] = {}
+            pending: Set[Future[Any]] = set()
+
+            def submit_next() -> None:
+                job = next(upcoming, None)
+                if job is not None:
+                    fetched = fetch_pool.submit(self._fetch, job[1])
+                    fetches[fetched] = job[0]
+                    pending.add(fetched)
+
+            for _ in range(2 * self.fetch_workers):
+                submit_next()
+
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                pending -= done
+                for future in done:
+                    if future in fetches:
+                        # Hand each filing to the parse pool the moment it has been fetched
+                        index = fetches.pop(future)
+                        if future.exception() is not None:
+                            yield index, future
+                            submit_next()
+                            continue
+                        parsed = parse_pool.submit(
+                            _chunk_job,
+                            future.result(),
+                            jobs[index].items,
+                            chunker_config.chunk_size,
+                            chunker_config.chunk_overlap,
+                            chunker_config.encoding,
+                        )
+                        parses[parsed] = index
+                        pending.add(parsed)
+                    else:
+                        yield parses.pop(future), future
+                        submit_next()
+
+    def _generate(
+        self, job: SECJob, parsed: "Future[List[str]]", questions_per_job: int, writer: DatasetWriter
+    ) -> JobResult:
+        try:
+            chunks = parsed.result()
+        except Exception as e:
+            print(f"Failed to process {job.label}: {e}")
+            return JobResult(job=job, status="failed", error=str(e))
+
+        print(f"Generating for {job.label} ({len(chunks)} chunks)...")
+        try:
+            num_items = self.generator.write_from_texts(
+                chunks, writer, questions_per_job, source=job.label, partition=job.partition
+            )
+        except Exception as e:
+            print(f"Failed to process {job.label}: {e}")
+            # Items written before the failure are in the output all the same
+            return JobResult(
+                job=job,
+                status="failed",
+                num_chunks=len(chunks),
+                num_items=self.generator.items_written,
+                error=str(e),
+            )
+        return JobResult(job=job, status="succeeded", num_chunks=len(chunks), num_items=num_items)
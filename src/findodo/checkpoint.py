@@ -0,0 +1,100 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+from types import TracebackType
+from typing import Any, Dict, List, Optional, TextIO, Type
+
+from findodo.models import DatasetItem, QAPair, make_chunk_id
+
+
+class RunManifest:
+    """
+    Checkpoint of a generation run, stored in its run directory:
+
+        manifest.json  Run metadata (MLflow run ID, validated config). Replaced atomically.
+        chunks.jsonl   One line per finished chunk: chunk hash, questions requested, QA pairs produced
+                       (the chunk text is the context of every pair and is not stored again).
+                       Appended and fsync'ed as each chunk completes; a torn last line is ignored on load.
+                       The file is opened on the first record after construction or close().
+
+    A resumed run skips every chunk recorded here and only generates the remainder.
+    """
+
+    META_FILE = "manifest.json"
+    CHUNKS_FILE = "chunks.jsonl"
+
+    def __init__(self, run_dir: str | Path):
+        self.run_dir = Path(run_dir)
+        self.run_dir.mkdir(parents=True, exist_ok=True)
+        self.meta: Dict[str, Any] = {}
+        self._chunks: Dict[str, Dict[str, Any]] = {}
+
+        meta_path = self.run_dir / self.META_FILE
+        if meta_path.exists():
+            self.meta = json.loads(meta_path.read_text(encoding="utf-8"))
+
+        chunks_path = self.run_dir / self.CHUNKS_FILE
+        self._file: Optional[TextIO] = None
+        if chunks_path.exists():
+            with open(chunks_path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    self._chunks[record["chunk"]] = record
+
+    @staticmethod
+    def chunk_key(text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def update_meta(self, **values: Any) -> None:
+        """Merges values into manifest.json via write-to-temp + rename, so readers never see a partial file."""
+        self.meta.update(values)
+        tmp_path = self.run_dir / f"{self.META_FILE}.tmp"
+        tmp_path.write_text(json.dumps(self.meta, indent=2, default=str), encoding="utf-8")
+        os.replace(tmp_path, self.run_dir / self.META_FILE)
+
+    def completed(self, text: str, num_questions: int) -> Optional[List[DatasetItem]]:
+        """
+        Returns the stored items if this chunk already finished with at least `num_questions` requested.
+        """
+        record = self._chunks.get(self.chunk_key(text))
+        if record is None or record["requested"] < num_questions:
+            return None
+        chunk_id = make_chunk_id(text)
+        return [DatasetItem.from_chunk(QAPair(**pair), text, chunk_id) for pair in record["items"][:num_questions]]
+
+    def record(self, text: str, num_questions: int, items: List[DatasetItem]) -> None:
+        # Failed chunks (no items) are left out so a resume retries them
+        if not items:
+            return
+        key = self.chunk_key(text)
+        pairs = [item.model_dump(include={"question", "answer"}) for item in items]
+        record = {"chunk": key, "requested": num_questions, "items": pairs}
+        self._chunks[key] = record
+        if self._file is None:
+            self._file = open(self.run_dir / self.CHUNKS_FILE, "a", encoding="utf-8")
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def __len__(self) -> int:
+        return len(self._chunks)
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> "RunManifest":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        self.close()
@@ -1,12 +1,15 @@
-from typing import Optional
+from typing import List, Literal, Optional
 from pydantic import BaseModel, Field, SecretStr
 
+from findodo.models import FilingItem, SECJob
+
 
 #  Sub-Configurations
 class ChunkerConfig(BaseModel):
     name: str = "token"
     chunk_size: int = Field(1024, gt=0, description="Tokens per chunk")
     chunk_overlap: int = Field(100, ge=0, description="Overlap between chunks")
+    encoding: str = Field("gpt2", description="tiktoken encoding used to count and split tokens")
 
 
 class ParserConfig(BaseModel):
@@ -16,11 +19,48 @@ class ParserConfig(BaseModel):
     model_config = {"extra": "allow"}
 
 
+class CacheConfig(BaseModel):
+    mode: Literal["read_write", "read_only", "bypass"] = Field("bypass", description="LLM response cache behaviour")
+    path: Optional[str] = Field(None, description="SQLite file (defaults to <output_dir>/cache/llm_responses.sqlite)")
+    max_size_mb: Optional[float] = Field(512, gt=0, description="Evict least recently used entries above this size")
+    max_age_days: Optional[float] = Field(30, gt=0, description="Evict entries older than this")
+
+
+class RateLimitConfig(BaseModel):
+    enabled: bool = Field(False, description="Throttle requests through the shared rate-limit controller")
+    requests_per_minute: Optional[int] = Field(None, gt=0, description="Request budget (RPM)")
+    tokens_per_minute: Optional[int] = Field(None, gt=0, description="Prompt + completion token budget (TPM)")
+    min_concurrency: int = Field(1, ge=1, description="Floor for the adaptive in-flight limit")
+    target_latency_s: Optional[float] = Field(None, gt=0, description="Shrink concurrency above this latency")
+    completion_tokens_per_question: int = Field(150, ge=0, description="Completion tokens reserved per question")
+
+
+class BatchConfig(BaseModel):
+    dir: Optional[str] = Field(None, description="Batch request/result files (defaults to <output_dir>/batches)")
+    poll_interval_s: float = Field(30.0, gt=0, description="Seconds between status polls")
+    timeout_h: float = Field(24.0, gt=0, description="Give up on a batch after this many hours")
+    max_rounds: int = Field(3, ge=1, description="Submissions per run, including resubmits of failed requests")
+    completion_window: str = Field("24h", description="Completion window requested from the batch API")
+
+
+class PackingConfig(BaseModel):
+    enabled: bool = Field(False, description="Send several small chunks in one request")
+    max_tokens: int = Field(4000, gt=0, description="Token budget for the chunk text of one packed request")
+    max_chunks: int = Field(8, ge=1, description="Most chunks in one packed request")
+
+
 class ProviderConfig(BaseModel):
     name: str
     model: str
     api_key: Optional[SecretStr] = Field(None, description="API Key (loaded from env if None)")
+    base_url: Optional[str] = Field(None, description="Override the API endpoint (e.g. a local compatible server)")
     temperature: float = Field(0.0, ge=0.0, le=1.0)
+    max_concurrency: int = Field(1, ge=1, description="Maximum number of in-flight generation requests")
+    stream: bool = Field(False, description="Stream completions and emit each item as soon as it is complete")
+    cache: CacheConfig = Field(default_factory=CacheConfig)
+    rate_limit: RateLimitConfig = Field(default_factory=RateLimitConfig)
+    batch: BatchConfig = Field(default_factory=BatchConfig)
+    packing: PackingConfig = Field(default_factory=PackingConfig)
     # Allow extra fields for different providers (OpenAI vs Azure)
     model_config = {"extra": "allow"}
 
@@ -30,6 +70,64 @@ class PromptConfig(BaseModel):
     system_prompt: str
 
 
+class TaskConfig(BaseModel):
+    target: Optional[str] = Field(None, description="Ticker for SEC, URL or file path for PDF/Docling")
+    year: Optional[int] = Field(None, description="Filing year (SEC only)")
+    quarter: Optional[int] = Field(None, ge=1, le=4, description="Quarter for a 10-Q; None selects the 10-K")
+    items: Optional[List[FilingItem]] = Field(None, description="SEC items to keep (None = all)")
+    total_questions: int = Field(10, gt=0, description="Question budget for the run (per job in bulk runs)")
+    jobs: Optional[List[SECJob]] = Field(None, description="Bulk SEC run: many filings instead of one target")
+
+
+class AllocationConfig(BaseModel):
+    strategy: Literal["even", "weighted", "diverse"] = Field(
+        "even", description="How the question budget is split over chunks"
+    )
+    min_tokens: int = Field(50, ge=0, description="Chunks shorter than this get no questions")
+    boilerplate_min_hits: int = Field(2, ge=1, description="Boilerplate phrases that mark a chunk as boilerplate")
+    numeric_weight: float = Field(1.0, ge=0.0, description="Weight boost per unit of numeric density")
+    skip_duplicates: bool = Field(True, description="Give repeated chunks no questions")
+    questions_per_chunk: int = Field(
+        2, ge=1, description="diverse: questions per selected chunk, i.e. total_questions / this many are selected"
+    )
+    num_features: int = Field(256, ge=16, description="diverse: hashed n-gram buckets per chunk vector")
+
+
+class ChunkStoreConfig(BaseModel):
+    enabled: bool = Field(False, description="Reuse parsed chunks across runs and sweep jobs")
+    dir: Optional[str] = Field(None, description="Chunk store directory (defaults to <output_dir>/chunks)")
+
+
+class DedupConfig(BaseModel):
+    enabled: bool = Field(False, description="Drop near-duplicate QA items (MinHash/LSH) before they are written")
+    fields: List[Literal["question", "answer"]] = Field(
+        ["question", "answer"], description="Item fields compared for similarity"
+    )
+    threshold: float = Field(0.8, gt=0.0, le=1.0, description="Estimated Jaccard similarity that marks a duplicate")
+    num_perm: int = Field(128, ge=8, description="MinHash permutations per signature")
+    bands: int = Field(16, ge=1, description="LSH bands; must divide num_perm")
+    shingle_size: int = Field(5, ge=1, description="Character n-gram length of the shingles")
+    batch_size: int = Field(2000, ge=1, description="Items hashed per vectorized pass")
+    seed: int = Field(1, description="Hash seed; an index only matches signatures built with the same seed")
+    index_path: Optional[str] = Field(None, description="Signature index (defaults to <output_dir>/dedup/index.npz)")
+
+
+class EstimateConfig(BaseModel):
+    prompt_usd_per_1m: Optional[float] = Field(
+        None, ge=0, description="Prompt price per 1M tokens (None = built-in list price of the model)"
+    )
+    completion_usd_per_1m: Optional[float] = Field(
+        None, ge=0, description="Completion price per 1M tokens (None = built-in list price of the model)"
+    )
+    batch_discount: float = Field(0.5, ge=0.0, le=1.0, description="Share of the price saved by batch providers")
+    request_overhead_s: float = Field(1.0, ge=0.0, description="Latency of a request before its first output token")
+    completion_tokens_per_s: float = Field(50.0, gt=0, description="Output speed used to project request latency")
+
+
+class MetricsConfig(BaseModel):
+    enabled: bool = Field(False, description="Collect per-stage timings and token/latency metrics for MLflow")
+
+
 #  Master Configuration
 class Config(BaseModel):
     """
@@ -42,10 +140,27 @@ class Config(BaseModel):
     parser: ParserConfig
     provider: ProviderConfig
     prompt: PromptConfig
+    task: TaskConfig = Field(default_factory=TaskConfig)
+    allocation: AllocationConfig = Field(default_factory=AllocationConfig)
+    chunk_store: ChunkStoreConfig = Field(default_factory=ChunkStoreConfig)
+    metrics: MetricsConfig = Field(default_factory=MetricsConfig)
+    dedup: DedupConfig = Field(default_factory=DedupConfig)
+    estimate: EstimateConfig = Field(default_factory=EstimateConfig)
 
     # Global settings
     seed: int = 42
     output_dir: str = "data/processed"
+    output_format: Literal["jsonl", "parquet"] = "jsonl"
+    output_layout: Literal["flat", "compact", "partitioned"] = Field(
+        "flat",
+        description="flat: one file with a context per item; compact: chunk table + QA rows by chunk ID; "
+        "partitioned: Parquet dataset by ticker/year/form/run_id shared across runs",
+    )
+    dataset_dir: Optional[str] = Field(None, description="Partitioned dataset root (defaults to <output_dir>/dataset)")
+    resume: Optional[str] = Field(None, description="Run directory of an interrupted run to resume")
+    dry_run: bool = Field(
+        False, description="Parse and chunk, then project cost, tokens and wall time without LLM calls"
+    )
 
     # Allow Hydra's internal keys (like hydra.run.dir) to exist without crashing Pydantic
     model_config = {"extra": "ignore"}
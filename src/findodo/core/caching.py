@@ -0,0 +1,102 @@
+import hashlib
+import json
+import os
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+
+class DiskCache:
+    """
+    Small file-per-entry JSON cache with TTL and size-based eviction.
+
+    Entries live under sharded paths (`ab/abcdef....json`) named by the SHA-256 of their key.
+    Writes go through a temp file + rename, so concurrent processes never read a partial entry.
+    An entry's mtime is when it was written and bounds its age (TTL); reads only refresh its atime,
+    which orders size eviction least-recently-used.
+    """
+
+    # Checking the size budget globs the whole cache, so it runs at startup and every this many writes
+    EVICT_EVERY = 100
+
+    def __init__(self, root: str | Path, ttl_days: Optional[float] = None, max_size_mb: Optional[float] = None):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_days * 86400 if ttl_days else None
+        self.max_size_bytes = int(max_size_mb * 1024 * 1024) if max_size_mb else None
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evict()
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        return hashlib.sha256(json.dumps(parts, default=str).encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.json"
+
+    def _expired(self, written_at: float) -> bool:
+        return self.ttl_seconds is not None and time.time() - written_at > self.ttl_seconds
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        path = self._path(key)
+        try:
+            written_at = path.stat().st_mtime
+            if self._expired(written_at):
+                path.unlink(missing_ok=True)
+                raise FileNotFoundError(path)
+            value: Dict[str, Any] = json.loads(path.read_text(encoding="utf-8"))
+            # Record the access without touching the write time the TTL is measured from
+            os.utime(path, (time.time(), written_at))
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return value
+
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+        tmp_path.write_text(json.dumps(value, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp_path, path)
+        self.writes += 1
+        if self.writes % self.EVICT_EVERY == 0:
+            self.evict()
+
+    def evict(self) -> int:
+        """
+        Drops expired entries, then the least recently used ones until the cache fits max_size_mb.
+        Returns the number of removed entries.
+        """
+        entries = []
+        removed = 0
+        for path in self.root.glob("*/*.json"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            if self._expired(stat.st_mtime):
+                path.unlink(missing_ok=True)
+                removed += 1
+            else:
+                entries.append((stat.st_atime, stat.st_size, path))
+
+        if self.max_size_bytes is not None:
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.max_size_bytes:
+                    break
+                path.unlink(missing_ok=True)
+                total -= size
+                removed += 1
+        return removed
+
+    def __contains__(self, key: str) -> bool:
+        try:
+            return not self._expired(self._path(key).stat().st_mtime)
+        except FileNotFoundError:
+            return False
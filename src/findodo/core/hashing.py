@@ -0,0 +1,16 @@
+import numpy as np
+
+# Polynomial base for rolling hashes of n-grams (the 64-bit FNV prime)
+NGRAM_BASE = np.uint64(0x100000001B3)
+MIX_1 = np.uint64(0xBF58476D1CE4E5B9)
+MIX_2 = np.uint64(0x94D049BB133111EB)
+
+
+def mix64(x: np.ndarray) -> np.ndarray:
+    """splitmix64 finalizer: spreads the bits of each uint64 value."""
+    x = x ^ (x >> np.uint64(30))
+    x = x * MIX_1
+    x = x ^ (x >> np.uint64(27))
+    x = x * MIX_2
+    mixed: np.ndarray = x ^ (x >> np.uint64(31))
+    return mixed
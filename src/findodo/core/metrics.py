@@ -0,0 +1,81 @@
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Any, ContextManager, Dict, Iterator, List
+
+import numpy as np
+
+_NOOP = nullcontext()
+
+
+class Metrics:
+    """
+    Process-wide counters and timing samples for the pipeline.
+
+    Counters are summed (tokens, items, retries); samples keep every observation (latencies) so
+    percentiles can be reported at the end of a run. While disabled, every call returns immediately.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self._lock = threading.Lock()
+        self.counters: Dict[str, float] = {}
+        self.samples: Dict[str, List[float]] = {}
+
+    def reset(self) -> None:
+        with self._lock:
+            self.counters = {}
+            self.samples = {}
+
+    def incr(self, name: str, value: float = 1) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def observe(self, name: str, value: float) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self.samples.setdefault(name, []).append(value)
+
+    def timer(self, name: str) -> ContextManager[Any]:
+        """Times a block and records the duration (seconds) as a sample of `name`."""
+        if not self.enabled:
+            return _NOOP
+        return self._timed(name)
+
+    @contextmanager
+    def _timed(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def summary(self) -> Dict[str, float]:
+        """
+        Flat metric dict for MLflow: every counter, and per sample series its count, total,
+        mean, p50, p90, p99 and max.
+        """
+        with self._lock:
+            result = dict(self.counters)
+            for name, values in self.samples.items():
+                array = np.asarray(values, dtype=np.float64)
+                p50, p90, p99 = np.percentile(array, [50, 90, 99])
+                result.update(
+                    {
+                        f"{name}.count": float(len(array)),
+                        f"{name}.total": float(array.sum()),
+                        f"{name}.mean": float(array.mean()),
+                        f"{name}.p50": float(p50),
+                        f"{name}.p90": float(p90),
+                        f"{name}.p99": float(p99),
+                        f"{name}.max": float(array.max()),
+                    }
+                )
+        return result
+
+
+# Shared by every component of a run; main enables it from `metrics.enabled`
+METRICS = Metrics()
@@ -1,5 +1,6 @@
+import asyncio
 from abc import ABC, abstractmethod
-from typing import List, Any
+from typing import AsyncIterator, Iterator, List, Any, Tuple
 from findodo.models import DatasetItem
 
 
@@ -8,6 +9,9 @@ class BaseProvider(ABC):
     The contract that all LLM Providers (OpenAI, Azure, Local) must follow.
     """
 
+    # Batch providers answer a whole run at once; the Generator then uses generate_batch instead of scheduling chunks.
+    is_batch: bool = False
+
     def __init__(self, config: Any, prompt_config: Any):
         """
         All providers are initialized with their specific sub-config.
@@ -28,3 +32,48 @@ class BaseProvider(ABC):
             A list of validated DatasetItems.
         """
         pass
+
+    async def agenerate_qa(self, text: str, num_questions: int) -> List[DatasetItem]:
+        """
+        Async variant of generate_qa, used by the concurrent Generator.
+
+        Providers with a native async client should override this.
+        The default runs the blocking call in a worker thread, so every provider can be scheduled concurrently.
+        """
+        return await asyncio.to_thread(self.generate_qa, text, num_questions)
+
+    def stream_qa(self, text: str, num_questions: int) -> Iterator[DatasetItem]:
+        """
+        Yields the Q&A pairs of a chunk as they become available.
+
+        Providers that can stream their output override this; the default yields the result of generate_qa.
+        """
+        yield from self.generate_qa(text, num_questions)
+
+    async def astream_qa(self, text: str, num_questions: int) -> AsyncIterator[DatasetItem]:
+        """Async variant of stream_qa."""
+        for item in await self.agenerate_qa(text, num_questions):
+            yield item
+
+    def generate_packed(self, requests: List[Tuple[str, int]]) -> List[List[DatasetItem]]:
+        """
+        Generates Q&A pairs for several small chunks in a single request.
+
+        Returns:
+            One list of DatasetItems per chunk, in request order.
+        The default sends one request per chunk; providers that can demultiplex a combined answer override this.
+        """
+        return [self.generate_qa(text, num_questions) for text, num_questions in requests]
+
+    async def agenerate_packed(self, requests: List[Tuple[str, int]]) -> List[List[DatasetItem]]:
+        """Async variant of generate_packed."""
+        return list(await asyncio.gather(*(self.agenerate_qa(text, n) for text, n in requests)))
+
+    def generate_batch(self, requests: List[Tuple[str, int]]) -> List[List[DatasetItem]]:
+        """
+        Generates Q&A pairs for many (text, num_questions) requests at once.
+
+        Returns:
+            One list of DatasetItems per request, in request order.
+        """
+        return [self.generate_qa(text, num_questions) for text, num_questions in requests]
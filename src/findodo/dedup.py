@@ -0,0 +1,345 @@
+import os
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from pydantic import BaseModel, Field
+
+from findodo.core.hashing import NGRAM_BASE, mix64
+from findodo.core.metrics import METRICS
+from findodo.models import DatasetItem, DatasetPartition
+from findodo.storage.writers import DatasetWriter
+
+NON_WORD_PATTERN = re.compile(r"\W+")
+
+# Permutations hashed per vectorized step and documents per step, bounding the (perms x shingles) temporaries
+PERM_BLOCK = 8
+DOC_BLOCK = 2000
+# Index segments queried one after another before they are merged into one
+MAX_SEGMENTS = 8
+# Example duplicate pairs kept in the stats
+MAX_EXAMPLES = 10
+
+
+def normalize(text: str) -> str:
+    return NON_WORD_PATTERN.sub(" ", text.lower()).strip()
+
+
+class MinHasher:
+    """
+    MinHash signatures of character shingles, and their LSH band keys, computed for whole batches in NumPy.
+
+    All texts of a batch are concatenated into one byte buffer; the shingle hashes of every window are computed
+    with k vectorized passes, and each permutation's minimum per text with one `minimum.reduceat`.
+    Shingle hashes are well mixed 32-bit values, so the permutations can be cheap (a * x + b) mod 2^32 maps
+    with odd `a`, drawn from `seed`; 32-bit lanes make this the fastest NumPy can go.
+    """
+
+    def __init__(self, num_perm: int = 128, bands: int = 16, shingle_size: int = 5, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError(f"bands ({bands}) must divide num_perm ({num_perm})")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.seed = seed
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(0, 2**32, size=(num_perm, 1), dtype=np.uint32) | np.uint32(1)
+        self._b = rng.integers(0, 2**32, size=(num_perm, 1), dtype=np.uint32)
+
+    @property
+    def params(self) -> Tuple[int, int, int, int]:
+        return self.num_perm, self.bands, self.shingle_size, self.seed
+
+    def _shingles(self, texts: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """Hashes of every k-byte window of every text, and the offset of each text's first window."""
+        k = self.shingle_size
+        encoded = [text.encode("utf-8").ljust(k) for text in texts]
+        lengths = np.fromiter((len(e) for e in encoded), dtype=np.int64, count=len(encoded))
+        buffer = np.frombuffer(b"".join(encoded), dtype=np.uint8).astype(np.uint64)
+
+        rolling = np.zeros(len(buffer) - k + 1, dtype=np.uint64)
+        for j in range(k):
+            rolling = rolling * NGRAM_BASE + buffer[j : len(buffer) - k + 1 + j]
+
+        # Keep the windows that lie inside one text
+        counts = lengths - k + 1
+        offsets = np.cumsum(counts) - counts
+        starts = np.cumsum(lengths) - lengths
+        positions = np.arange(counts.sum()) + np.repeat(starts - offsets, counts)
+        return (mix64(rolling[positions]) >> np.uint64(32)).astype(np.uint32), offsets
+
+    def signatures(self, texts: Sequence[str]) -> np.ndarray:
+        """(len(texts), num_perm) uint32 MinHash signatures."""
+        result = np.empty((len(texts), self.num_perm), dtype=np.uint32)
+        with np.errstate(over="ignore"):
+            for doc_start in range(0, len(texts), DOC_BLOCK):
+                shingles, offsets = self._shingles(texts[doc_start : doc_start + DOC_BLOCK])
+                block = result[doc_start : doc_start + DOC_BLOCK]
+                for perm in range(0, self.num_perm, PERM_BLOCK):
+                    hashed = self._a[perm : perm + PERM_BLOCK] * shingles
+                    hashed += self._b[perm : perm + PERM_BLOCK]
+                    block[:, perm : perm + PERM_BLOCK] = np.minimum.reduceat(hashed, offsets, axis=1).T
+        return result
+
+    def band_keys(self, signatures: np.ndarray) -> np.ndarray:
+        """(n, bands) uint64 keys; two signatures share a band's key when all its rows are equal."""
+        rows = signatures.reshape(len(signatures), self.bands, self.rows).astype(np.uint64)
+        keys = np.zeros((len(signatures), self.bands), dtype=np.uint64)
+        with np.errstate(over="ignore"):
+            for j in range(self.rows):
+                keys = keys * NGRAM_BASE + rows[:, :, j]
+            return mix64(keys)
+
+
+class SignatureIndex:
+    """
+    Signatures of the kept items of earlier runs, persisted as one .npz file next to the datasets.
+
+    Lookups go through per-band sorted key arrays (binary search), so querying n items against an index of N
+    costs O(n log N) instead of O(n N). Items added during a run form new segments, merged once there are many.
+    """
+
+    def __init__(self, hasher: MinHasher):
+        self.hasher = hasher
+        self.signatures = np.empty((0, hasher.num_perm), dtype=np.uint32)
+        self.run_codes = np.empty(0, dtype=np.int32)
+        self.runs: List[str] = []
+        # Per segment and band: unique keys (sorted) and the first index row holding each key
+        self._segments: List[List[Tuple[np.ndarray, np.ndarray]]] = []
+
+    def __len__(self) -> int:
+        return len(self.signatures)
+
+    @classmethod
+    def load(cls, path: str | Path, hasher: MinHasher, exclude_run: Optional[str] = None) -> "SignatureIndex":
+        """
+        Loads the index at `path` (an empty index if it does not exist). Rows of `exclude_run` are dropped,
+        so a resumed run does not match the items it already wrote against themselves.
+        """
+        index = cls(hasher)
+        if not Path(path).exists():
+            return index
+        with np.load(path) as data:
+            if tuple(int(p) for p in data["params"]) != hasher.params:
+                raise ValueError(
+                    f"Dedup index {path} was built with (num_perm, bands, shingle_size, seed) = "
+                    f"{tuple(data['params'])}, not {hasher.params}. Use another index_path or delete it."
+                )
+            runs = [str(run) for run in data["runs"]]
+            keep = np.ones(len(data["run_codes"]), dtype=bool)
+            if exclude_run in runs:
+                keep = data["run_codes"] != runs.index(exclude_run)
+            index.runs = runs
+            index._append(data["signatures"][keep], data["run_codes"][keep])
+        return index
+
+    def save(self, path: str | Path) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.tmp")
+        with open(tmp_path, "wb") as f:
+            np.savez(
+                f,
+                signatures=self.signatures,
+                run_codes=self.run_codes,
+                runs=np.array(self.runs, dtype=str),
+                params=np.array(self.hasher.params, dtype=np.int64),
+            )
+        os.replace(tmp_path, path)
+
+    def _segment(self, signatures: np.ndarray, first_row: int) -> List[Tuple[np.ndarray, np.ndarray]]:
+        keys = self.hasher.band_keys(signatures)
+        segment = []
+        for band in range(self.hasher.bands):
+            unique, first = np.unique(keys[:, band], return_index=True)
+            segment.append((unique, first + first_row))
+        return segment
+
+    def _append(self, signatures: np.ndarray, run_codes: np.ndarray) -> None:
+        if not len(signatures):
+            return
+        first_row = len(self.signatures)
+        self.signatures = np.concatenate([self.signatures, signatures])
+        self.run_codes = np.concatenate([self.run_codes, run_codes.astype(np.int32)])
+        if len(self._segments) >= MAX_SEGMENTS:
+            self._segments = [self._segment(self.signatures, 0)]
+        else:
+            self._segments.append(self._segment(signatures, first_row))
+
+    def add(self, signatures: np.ndarray, run: str) -> None:
+        if run not in self.runs:
+            self.runs.append(run)
+        self._append(signatures, np.full(len(signatures), self.runs.index(run), dtype=np.int32))
+
+    def query(self, keys: np.ndarray) -> np.ndarray:
+        """(n, bands) index rows sharing each band key (the oldest one), or -1."""
+        candidates = np.full(keys.shape, -1, dtype=np.int64)
+        for segment in self._segments:
+            for band, (unique, rows) in enumerate(segment):
+                column = keys[:, band]
+                pos = np.minimum(np.searchsorted(unique, column), len(unique) - 1)
+                found = (unique[pos] == column) & (candidates[:, band] < 0)
+                candidates[found, band] = rows[pos[found]]
+        return candidates
+
+
+class DedupStats(BaseModel):
+    items: int = 0
+    kept: int = 0
+    duplicates_in_run: int = 0
+    duplicates_of_previous_runs: int = 0
+    candidate_pairs: int = 0
+    index_size: int = 0
+    examples: List[Dict[str, str]] = Field(default_factory=list)
+
+    def metrics(self) -> Dict[str, float]:
+        return {
+            "dedup.items": self.items,
+            "dedup.kept": self.kept,
+            "dedup.duplicates_in_run": self.duplicates_in_run,
+            "dedup.duplicates_of_previous_runs": self.duplicates_of_previous_runs,
+            "dedup.candidate_pairs": self.candidate_pairs,
+            "dedup.index_size": self.index_size,
+            "dedup.duplicate_rate": 1 - self.kept / self.items if self.items else 0.0,
+        }
+
+
+def _matches(signatures: np.ndarray, others: np.ndarray, candidates: np.ndarray, threshold: float) -> np.ndarray:
+    """
+    For each row of `signatures`, the first of its candidate rows in `others` whose estimated Jaccard similarity
+    reaches `threshold`, or -1.
+    """
+    matched = np.full(len(signatures), -1, dtype=np.int64)
+    docs, bands = np.nonzero(candidates >= 0)
+    if len(docs):
+        rows = candidates[docs, bands]
+        similar = (signatures[docs] == others[rows]).mean(axis=1) >= threshold
+        # np.nonzero returns docs in ascending order, so return_index picks each doc's first similar candidate
+        verified, first = np.unique(docs[similar], return_index=True)
+        matched[verified] = rows[similar][first]
+    return matched
+
+
+class Deduplicator:
+    """
+    Drops near-duplicate QA items: items whose question/answer text has an estimated Jaccard similarity of at
+    least `threshold` to an item kept earlier in the run, or in any run recorded in the signature index.
+
+    LSH banding proposes candidates (items sharing all rows of at least one band), and only candidates are
+    compared signature to signature, so the cost grows with the number of items, not with their pairs.
+    """
+
+    def __init__(
+        self,
+        hasher: MinHasher,
+        index: SignatureIndex,
+        threshold: float = 0.8,
+        fields: Sequence[str] = ("question", "answer"),
+        run_id: str = "local",
+        index_path: Optional[str | Path] = None,
+    ):
+        self.hasher = hasher
+        self.index = index
+        self.threshold = threshold
+        self.fields = list(fields)
+        self.run_id = run_id
+        self.index_path = Path(index_path) if index_path is not None else None
+        self.stats = DedupStats(index_size=len(index))
+
+    @classmethod
+    def from_config(cls, config: Any, run_id: str) -> "Deduplicator":
+        dedup = config.dedup
+        hasher = MinHasher(dedup.num_perm, dedup.bands, dedup.shingle_size, dedup.seed)
+        index_path = dedup.index_path or Path(config.output_dir) / "dedup" / "index.npz"
+        index = SignatureIndex.load(index_path, hasher, exclude_run=run_id)
+        print(f"Dedup index: {len(index)} signatures from {len(index.runs)} runs ({index_path})")
+        return cls(hasher, index, dedup.threshold, dedup.fields, run_id, index_path)
+
+    def text(self, item: DatasetItem) -> str:
+        return normalize(" ".join(getattr(item, name) for name in self.fields))
+
+    def filter(self, items: List[DatasetItem]) -> List[DatasetItem]:
+        """Returns the items that are not near-duplicates and adds them to the index."""
+        if not items:
+            return []
+        with METRICS.timer("stage.dedup_s"):
+            signatures = self.hasher.signatures([self.text(item) for item in items])
+            keys = self.hasher.band_keys(signatures)
+
+            # Against the index (earlier runs and earlier batches of this run)
+            indexed = self.index.query(keys)
+            index_match = _matches(signatures, self.index.signatures, indexed, self.threshold)
+
+            # Within the batch: the first item sharing a band key is the candidate of the later ones
+            within = np.full(keys.shape, -1, dtype=np.int64)
+            for band in range(self.hasher.bands):
+                _, first, inverse = np.unique(keys[:, band], return_index=True, return_inverse=True)
+                representative = first[inverse.reshape(-1)]
+                later = representative != np.arange(len(items))
+                within[later, band] = representative[later]
+            batch_match = np.where(index_match < 0, _matches(signatures, signatures, within, self.threshold), -1)
+
+        of_index = index_match >= 0
+        current = self.index.runs.index(self.run_id) if self.run_id in self.index.runs else -1
+        previous = np.zeros(len(items), dtype=bool)
+        previous[of_index] = self.index.run_codes[index_match[of_index]] != current
+        keep = ~of_index & (batch_match < 0)
+        self.index.add(signatures[keep], self.run_id)
+
+        stats = self.stats
+        stats.items += len(items)
+        stats.kept += int(keep.sum())
+        stats.duplicates_in_run += int((of_index & ~previous).sum() + (batch_match >= 0).sum())
+        stats.duplicates_of_previous_runs += int(previous.sum())
+        stats.candidate_pairs += int((indexed >= 0).sum() + (within >= 0).sum())
+        stats.index_size = len(self.index)
+        for doc in np.nonzero(batch_match >= 0)[0][: MAX_EXAMPLES - len(stats.examples)]:
+            stats.examples.append({"duplicate": items[doc].question, "of": items[batch_match[doc]].question})
+        METRICS.incr("dedup.dropped", len(items) - int(keep.sum()))
+        return [item for item, kept in zip(items, keep) if kept]
+
+    def save(self) -> None:
+        if self.index_path is not None:
+            self.index.save(self.index_path)
+
+
+class DedupWriter(DatasetWriter):
+    """
+    Passes items on to `inner` with near-duplicates removed. Items are buffered and hashed `batch_size` at a time;
+    the buffer is flushed before each new target, so every item still reaches the inner writer under its own target.
+    The signature index is saved when the writer closes.
+    """
+
+    def __init__(self, inner: DatasetWriter, deduplicator: Deduplicator, batch_size: int = 2000):
+        super().__init__(inner.path)
+        self.inner = inner
+        self.deduplicator = deduplicator
+        self.batch_size = batch_size
+        self._buffer: List[DatasetItem] = []
+
+    def begin_target(
+        self, source: Optional[str], texts: Sequence[str] = (), partition: Optional[DatasetPartition] = None
+    ) -> None:
+        self.flush()
+        super().begin_target(source, texts, partition)
+        self.inner.begin_target(source, texts, partition)
+
+    def write(self, item: DatasetItem) -> None:
+        self._buffer.append(item)
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        for item in self.deduplicator.filter(self._buffer):
+            self.inner.write(item)
+            self.count += 1
+        self._buffer = []
+
+    def close(self) -> None:
+        try:
+            self.flush()
+        finally:
+            self.inner.close()
+            self.deduplicator.save()
@@ -0,0 +1,69 @@
+import argparse
+import os
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Listener
+from typing import Any, Dict, Optional, Protocol
+
+from findodo.parsers.docling import AUTHKEY_ENV, DoclingConverter, PageRange, is_loopback, load_authkey, parse_address
+
+
+class ConversionBackend(Protocol):
+    def convert(self, paths: list[str], page_range: Optional[PageRange] = None) -> list[Optional[str]]: ...
+
+
+class DoclingWorker:
+    """
+    Long-lived local Docling service. The models are loaded once and stay warm;
+    every connection sends one batch of file paths and receives their Markdown.
+    """
+
+    def __init__(self, backend: ConversionBackend, authkey: bytes, address: str = "localhost:0"):
+        self.backend = backend
+        self.listener = Listener(parse_address(address), authkey=authkey)
+
+    @property
+    def address(self) -> Any:
+        return self.listener.address
+
+    def handle(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            page_range = request.get("page_range")
+            return {"markdown": self.backend.convert(request["paths"], tuple(page_range) if page_range else None)}
+        except Exception as e:
+            return {"error": str(e)}
+
+    def serve_forever(self) -> None:
+        with self.listener:
+            while True:
+                try:
+                    connection = self.listener.accept()
+                except AuthenticationError:
+                    print("Rejected a connection with the wrong authkey")
+                    continue
+                with connection:
+                    request = connection.recv()
+                    if request.get("op") == "shutdown":
+                        connection.send({"ok": True})
+                        return
+                    connection.send(self.handle(request))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run a Docling conversion worker that keeps its models loaded.")
+    parser.add_argument("--address", default="localhost:6100", help="host:port or a Unix socket path")
+    parser.add_argument("--no-ocr", action="store_true", help="Disable OCR for scanned pages")
+    args = parser.parse_args()
+
+    if not is_loopback(parse_address(args.address)) and not os.environ.get(AUTHKEY_ENV):
+        parser.error(f"--address {args.address} is reachable from other machines: set {AUTHKEY_ENV} explicitly")
+    authkey = load_authkey()
+    converter = DoclingConverter(enable_ocr=not args.no_ocr)
+    # Load the models before accepting work
+    _ = converter.converter
+    worker = DoclingWorker(converter, authkey, args.address)
+    print(f"Docling worker listening on {worker.address}")
+    worker.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
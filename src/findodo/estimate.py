@@ -0,0 +1,274 @@
+import heapq
+import json
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple, cast
+
+from pydantic import BaseModel, Field
+
+from findodo.config import Config, TaskConfig
+from findodo.core.providing import BaseProvider
+from findodo.generator import Generator
+from findodo.models import DatasetItem
+from findodo.providers.cache import CachedProvider
+from findodo.providers.openai import build_messages, build_packed_messages, tool_schema
+from findodo.providers.ratelimit import TokenBucket, estimate_prompt_tokens, get_encoding
+from findodo.registry import load_provider
+
+# List prices in USD per 1M (prompt, completion) tokens; the longest model prefix that matches wins.
+# Set estimate.prompt_usd_per_1m / completion_usd_per_1m for other models or negotiated prices.
+MODEL_PRICES: Dict[str, Tuple[float, float]] = {
+    "gpt-3.5-turbo": (0.5, 1.5),
+    "gpt-4": (30.0, 60.0),
+    "gpt-4-turbo": (10.0, 30.0),
+    "gpt-4-1106-preview": (10.0, 30.0),
+    "gpt-4-0125-preview": (10.0, 30.0),
+    "gpt-4o": (2.5, 10.0),
+    "gpt-4o-mini": (0.15, 0.6),
+    "gpt-4.1": (2.0, 8.0),
+    "gpt-4.1-mini": (0.4, 1.6),
+    "gpt-4.1-nano": (0.1, 0.4),
+}
+
+
+def model_prices(model: str) -> Optional[Tuple[float, float]]:
+    matches = [prefix for prefix in MODEL_PRICES if model.startswith(prefix)]
+    return MODEL_PRICES[max(matches, key=len)] if matches else None
+
+
+class DryRunProvider(BaseProvider):
+    """Stands in for the configured provider during a dry run, so no request can reach the API."""
+
+    def __init__(self, config: Any, prompt_config: Any, is_batch: bool = False):
+        super().__init__(config, prompt_config)
+        self.is_batch = is_batch
+
+    @classmethod
+    def from_config(cls, config: Config) -> "DryRunProvider":
+        return cls(config.provider, config.prompt, is_batch=load_provider(config.provider.name).is_batch)
+
+    def generate_qa(self, text: str, num_questions: int) -> List[DatasetItem]:
+        raise RuntimeError("Dry run: no LLM requests are sent")
+
+
+class TargetEstimate(BaseModel):
+    source: Optional[str] = None
+    chunks: int = 0
+    questions: int = 0
+    requests: int = 0
+    cached_chunks: int = Field(0, description="Chunks answered from the response cache")
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+
+
+class DryRunEstimate(BaseModel):
+    model: str
+    targets: List[TargetEstimate]
+    failed: Dict[str, str] = Field(default_factory=dict, description="Targets that could not be parsed, with errors")
+    requests: int
+    cached_chunks: int
+    prompt_tokens: int
+    completion_tokens: int
+    prompt_usd_per_1m: Optional[float] = None
+    completion_usd_per_1m: Optional[float] = None
+    cost_usd: Optional[float] = Field(None, description="None when the model has no known price")
+    wall_time_s: Optional[float] = Field(None, description="None for batch providers")
+    limited_by: str = Field(description="concurrency, requests_per_minute, tokens_per_minute or batch")
+
+    def metrics(self) -> Dict[str, float]:
+        metrics: Dict[str, float] = {
+            "estimate.targets": len(self.targets),
+            "estimate.targets_failed": len(self.failed),
+            "estimate.chunks": sum(t.chunks for t in self.targets),
+            "estimate.questions": sum(t.questions for t in self.targets),
+            "estimate.requests": self.requests,
+            "estimate.cached_chunks": self.cached_chunks,
+            "estimate.prompt_tokens": self.prompt_tokens,
+            "estimate.completion_tokens": self.completion_tokens,
+        }
+        if self.cost_usd is not None:
+            metrics["estimate.cost_usd"] = self.cost_usd
+        if self.wall_time_s is not None:
+            metrics["estimate.wall_time_s"] = self.wall_time_s
+        return metrics
+
+    def report(self) -> str:
+        metrics = self.metrics()
+        lines = [
+            f"Dry run for {self.model} (no LLM requests sent)",
+            f"  Targets: {len(self.targets)} ({len(self.failed)} failed), chunks: {metrics['estimate.chunks']:,.0f}, "
+            f"questions: {metrics['estimate.questions']:,.0f}",
+            f"  Requests: {self.requests:,} ({self.cached_chunks:,} chunks answered from the response cache)",
+            f"  Tokens: {self.prompt_tokens:,} prompt, ~{self.completion_tokens:,} completion",
+        ]
+        if self.cost_usd is None:
+            lines.append("  Cost: unknown model price, set estimate.prompt_usd_per_1m / completion_usd_per_1m")
+        else:
+            lines.append(
+                f"  Cost: ${self.cost_usd:,.2f} at ${self.prompt_usd_per_1m:g}/${self.completion_usd_per_1m:g} "
+                "per 1M prompt/completion tokens"
+            )
+        if self.wall_time_s is None:
+            lines.append("  Wall time: set by the batch completion window")
+        else:
+            lines.append(f"  Wall time: {self.wall_time_s / 60:,.1f} min (limited by {self.limited_by})")
+        return "\n".join(lines)
+
+
+class Estimator:
+    """
+    Projects what generating over a set of targets would cost, without calling the LLM.
+
+    Requests are planned exactly as the Generator plans them (allocation, packing, response cache hits), and their
+    prompts are built and counted with tiktoken the way the rate limiter counts them. Completion tokens are the
+    reserved `completion_tokens_per_question` per allocated question. Wall time replays the requests through
+    `max_concurrency` workers and the RPM/TPM token buckets, with each request taking `request_overhead_s`
+    plus its completion tokens at `completion_tokens_per_s`.
+    """
+
+    def __init__(self, generator: Generator):
+        self.generator = generator
+        self.config = generator.config
+        provider_config = self.config.provider
+        self.encoding = get_encoding(provider_config.model)
+        self.tools_json = {packed: json.dumps(tool_schema(packed)) for packed in (False, True)}
+        self.completion_tokens_per_question = provider_config.rate_limit.completion_tokens_per_question
+
+        rate_limit = provider_config.rate_limit
+        limits = rate_limit.enabled and not generator.provider.is_batch
+        self.request_bucket = (
+            TokenBucket(rate_limit.requests_per_minute) if limits and rate_limit.requests_per_minute else None
+        )
+        self.token_bucket = (
+            TokenBucket(rate_limit.tokens_per_minute) if limits and rate_limit.tokens_per_minute else None
+        )
+        self.concurrency = provider_config.max_concurrency
+        # Simulated clock, in the buckets' time base
+        self.start = self.clock = time.monotonic()
+        self.busy_s = 0.0
+
+        self.targets: List[TargetEstimate] = []
+        self.failed: Dict[str, str] = {}
+
+    def _is_cached(self, text: str, num_questions: int) -> bool:
+        provider = self.generator.provider
+        return isinstance(provider, CachedProvider) and provider.is_cached(text, num_questions)
+
+    def _prompt_tokens(self, todo: List[Tuple[str, int]], packed: bool) -> int:
+        system_prompt = self.config.prompt.system_prompt
+        if packed:
+            messages = build_packed_messages(system_prompt, todo)
+        else:
+            messages = build_messages(system_prompt, *todo[0])
+        return estimate_prompt_tokens(self.encoding, cast(List[Dict[str, Any]], messages), self.tools_json[packed])
+
+    def add(self, texts: Sequence[str], total_questions: int, source: Optional[str] = None) -> TargetEstimate:
+        """Plans the requests of one target and replays them after those of the previous targets."""
+        target = TargetEstimate(source=source, chunks=len(texts))
+        requests: List[Tuple[int, int]] = []
+        for pack in self.generator.plan_requests(texts, total_questions):
+            target.questions += sum(n for _, n in pack)
+            # Cached chunks are dropped from their pack, like CachedProvider does
+            todo = [(text, n) for text, n in pack if not self._is_cached(text, n)]
+            target.cached_chunks += len(pack) - len(todo)
+            if not todo:
+                continue
+            prompt_tokens = self._prompt_tokens(todo, packed=len(pack) > 1)
+            completion_tokens = sum(n for _, n in todo) * self.completion_tokens_per_question
+            target.requests += 1
+            target.prompt_tokens += prompt_tokens
+            target.completion_tokens += completion_tokens
+            requests.append((prompt_tokens + completion_tokens, completion_tokens))
+
+        self._replay(requests)
+        self.targets.append(target)
+        return target
+
+    def add_failure(self, source: str, error: str) -> None:
+        self.failed[source] = error
+
+    def _replay(self, requests: List[Tuple[int, int]]) -> None:
+        """
+        Runs the target's (reserved tokens, completion tokens) requests through the workers and buckets.
+        Targets are generated one after another, so each starts once the previous one has finished.
+        """
+        estimate = self.config.estimate
+        workers = [self.clock] * self.concurrency
+        for tokens, completion_tokens in requests:
+            # Workers are freed in time order, so the buckets are always asked in time order too
+            start = heapq.heappop(workers)
+            delay = 0.0
+            if self.request_bucket is not None:
+                delay = max(delay, self.request_bucket.reserve(1, start))
+            if self.token_bucket is not None:
+                delay = max(delay, self.token_bucket.reserve(tokens, start))
+            latency = estimate.request_overhead_s + completion_tokens / estimate.completion_tokens_per_s
+            self.busy_s += latency
+            heapq.heappush(workers, start + delay + latency)
+        self.clock = max(workers)
+
+    def _limited_by(self, requests: int, tokens: int) -> str:
+        """The limit with the longest lower bound on the wall time (rate limits allow one minute of burst)."""
+        bounds = {"concurrency": self.busy_s / self.concurrency}
+        for name, bucket, amount in (
+            ("requests_per_minute", self.request_bucket, requests),
+            ("tokens_per_minute", self.token_bucket, tokens),
+        ):
+            if bucket is not None:
+                bounds[name] = max(0.0, amount - bucket.capacity) / bucket.rate
+        return max(bounds, key=lambda name: bounds[name])
+
+    def result(self) -> DryRunEstimate:
+        requests = sum(t.requests for t in self.targets)
+        prompt_tokens = sum(t.prompt_tokens for t in self.targets)
+        completion_tokens = sum(t.completion_tokens for t in self.targets)
+        is_batch = self.generator.provider.is_batch
+
+        estimate_config = self.config.estimate
+        prices = model_prices(self.config.provider.model)
+        prompt_price = estimate_config.prompt_usd_per_1m
+        completion_price = estimate_config.completion_usd_per_1m
+        if prices is not None:
+            prompt_price = prices[0] if prompt_price is None else prompt_price
+            completion_price = prices[1] if completion_price is None else completion_price
+        cost = None
+        if prompt_price is not None and completion_price is not None:
+            cost = (prompt_tokens * prompt_price + completion_tokens * completion_price) / 1e6
+            if is_batch:
+                cost *= 1 - estimate_config.batch_discount
+
+        return DryRunEstimate(
+            model=self.config.provider.model,
+            targets=self.targets,
+            failed=self.failed,
+            requests=requests,
+            cached_chunks=sum(t.cached_chunks for t in self.targets),
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            prompt_usd_per_1m=prompt_price,
+            completion_usd_per_1m=completion_price,
+            cost_usd=cost,
+            wall_time_s=None if is_batch else self.clock - self.start,
+            limited_by="batch" if is_batch else self._limited_by(requests, prompt_tokens + completion_tokens),
+        )
+
+
+def estimate_task(generator: Generator, task: TaskConfig) -> DryRunEstimate:
+    """
+    Parses and chunks the task's targets (through the chunk store and filing cache when they are enabled)
+    and projects the generation run over them.
+    """
+    estimator = Estimator(generator)
+    if task.jobs:
+        from findodo.bulk import BulkSECPipeline
+
+        for index, parsed in BulkSECPipeline.from_generator(generator).iter_chunks(task.jobs):
+            label = task.jobs[index].label
+            try:
+                estimator.add(parsed.result(), task.total_questions, source=label)
+            except Exception as e:
+                print(f"Failed to process {label}: {e}")
+                estimator.add_failure(label, str(e))
+    else:
+        with generator.chunks_for_task(task) as chunks:
+            estimator.add(chunks, task.total_questions, source=task.target)
+    return estimator.result()
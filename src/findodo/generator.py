@@ -1,13 +1,27 @@
-from typing import List, Optional
+import asyncio
+from collections import deque
+from contextlib import closing, contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, AsyncIterator, Callable, Deque, Dict, Iterator, List, Optional, Sequence, Tuple, cast
+from typing import Generator as GeneratorType
 from tqdm import tqdm
 
-from findodo.config import Config
-from findodo.models import Dataset, DatasetItem, FilingItem
+from findodo.checkpoint import RunManifest
+from findodo.config import Config, TaskConfig
+from findodo.models import Dataset, DatasetItem, DatasetPartition, FilingItem
+from findodo.core.metrics import METRICS
+from findodo.core.parsing import BaseParser
 from findodo.core.providing import BaseProvider
-from findodo.providers.openai import OpenAIProvider
-from findodo.parsers.sec import SECParser
-from findodo.parsers.pdf import PDFParser
-from findodo.parsers.docling import DoclingParser
+from findodo.providers.cache import CachedProvider, ResponseCache
+from findodo.registry import build_parser, build_provider
+from findodo.storage.writers import DatasetWriter
+
+if TYPE_CHECKING:
+    from findodo.allocation import AllocationPlan
+    from findodo.parsers.docling import DoclingParser
+    from findodo.parsers.hybrid import HybridParser
+    from findodo.parsers.pdf import PDFParser
+    from findodo.parsers.sec import SECParser
 
 
 class Generator:
@@ -16,46 +30,332 @@ class Generator:
     Now fully configurable via Hydra+Pydantic.
     """
 
-    def __init__(self, config: Config, provider: Optional[BaseProvider] = None):
+    def __init__(self, config: Config, provider: Optional[BaseProvider] = None, manifest: Optional[RunManifest] = None):
         # 1. Store the config
         self.config = config
 
+        # Checkpoint of finished chunks; `resume` points at the run directory of an interrupted run
+        if manifest is None and config.resume:
+            manifest = RunManifest(config.resume)
+        self.manifest = manifest
+        # Weighted allocation plans of this generator's runs, in order
+        self.allocation_plans: List["AllocationPlan"] = []
+        # Items write_from_texts has handed to its writer for the current (or last) target, even if it failed
+        self.items_written = 0
+
         # 2. Initialize Provider (Inject config)
-        self.provider = provider or OpenAIProvider(config.provider, config.prompt)
+        self.provider = provider or self._build_provider(config)
 
-        # 3. Initialize Parsers (Inject specific parser config AND chunker config)
-        self.sec_parser = SECParser(config.parser, config.chunker)
-        self.pdf_parser = PDFParser(config.parser, config.chunker)
-        self.docling_parser = DoclingParser(config.parser, config.chunker)
+        # Wrap with the on-disk response cache unless it is bypassed
+        if config.provider.cache.mode != "bypass":
+            cache = ResponseCache.from_config(config.provider.cache, config.output_dir)
+            self.provider = CachedProvider(self.provider, cache, config.provider.cache.mode)
 
-    def generate_from_texts(self, texts: List[str], total_questions: int = 10) -> Dataset:
-        results: List[DatasetItem] = []
-        num_chunks = len(texts)
-        if num_chunks == 0:
-            return Dataset(items=[])
+        # 3. Parsers are imported and built on first use (with the parser config AND chunker config)
+        self._parsers: Dict[str, BaseParser] = {}
+
+    @staticmethod
+    def _build_provider(config: Config) -> BaseProvider:
+        return build_provider(config)
+
+    def get_parser(self, name: Optional[str] = None) -> BaseParser:
+        """Returns the parser `name` (default: the configured `parser.name`), building it on first use."""
+        name = name or self.config.parser.name
+        if name not in self._parsers:
+            self._parsers[name] = build_parser(name, self.config)
+        return self._parsers[name]
+
+    @property
+    def sec_parser(self) -> "SECParser":
+        return cast("SECParser", self.get_parser("sec"))
+
+    @property
+    def pdf_parser(self) -> "PDFParser":
+        return cast("PDFParser", self.get_parser("pdf"))
 
+    @property
+    def docling_parser(self) -> "DoclingParser":
+        return cast("DoclingParser", self.get_parser("docling"))
+
+    @property
+    def hybrid_parser(self) -> "HybridParser":
+        return cast("HybridParser", self.get_parser("hybrid"))
+
+    @staticmethod
+    def _allocate_questions(num_chunks: int, total_questions: int) -> List[int]:
+        """
+        Spreads the question budget evenly over the chunks.
+        The first `total_questions % num_chunks` chunks receive one extra question.
+        """
         base_questions = total_questions // num_chunks
         extra_questions = total_questions % num_chunks
+        return [base_questions + (1 if i < extra_questions else 0) for i in range(num_chunks)]
+
+    def _plan(self, texts: Sequence[str], total_questions: int) -> List[Tuple[str, int]]:
+        """
+        Returns the (text, num_questions) requests to send, in chunk order. Chunks without questions are dropped.
+        With the weighted and diverse strategies, the plan is also kept in `allocation_plans` for logging.
+        """
+        if not texts:
+            return []
+        if self.config.allocation.strategy in ("weighted", "diverse"):
+            from findodo.allocation import plan_allocation
+            from findodo.providers.ratelimit import get_encoding
+
+            plan = plan_allocation(
+                texts,
+                total_questions,
+                get_encoding(self.config.provider.model),
+                self.config.allocation,
+                seed=self.config.seed,
+            )
+            self.allocation_plans.append(plan)
+            allocation = plan.allocation
+        else:
+            allocation = self._allocate_questions(len(texts), total_questions)
+        return [(text, n) for text, n in zip(texts, allocation) if n > 0]
+
+    def _pack(self, requests: List[Tuple[str, int]]) -> List[List[Tuple[str, int]]]:
+        """
+        Groups consecutive requests into packs sent as one LLM request each.
+        Packs are filled in chunk order up to `packing.max_tokens` of chunk text and `packing.max_chunks` chunks;
+        without packing, every request is its own pack.
+        """
+        packing = self.config.provider.packing
+        if not packing.enabled:
+            return [[request] for request in requests]
+
+        from findodo.providers.ratelimit import get_encoding
+
+        encoding = get_encoding(self.config.provider.model)
+        sizes = [len(tokens) for tokens in encoding.encode_ordinary_batch([text for text, _ in requests])]
+
+        packs: List[List[Tuple[str, int]]] = []
+        current: List[Tuple[str, int]] = []
+        current_tokens = 0
+        for request, size in zip(requests, sizes):
+            if current and (current_tokens + size > packing.max_tokens or len(current) >= packing.max_chunks):
+                packs.append(current)
+                current, current_tokens = [], 0
+            current.append(request)
+            current_tokens += size
+        if current:
+            packs.append(current)
+        return packs
+
+    def plan_requests(self, texts: Sequence[str], total_questions: int) -> List[List[Tuple[str, int]]]:
+        """
+        The requests a run over `texts` sends: one LLM request per pack of (text, num_questions).
+        Batch providers are sent every chunk as its own request.
+        """
+        requests = self._plan(texts, total_questions)
+        if self.provider.is_batch:
+            return [[request] for request in requests]
+        return self._pack(requests)
+
+    def _resume_pack(self, pack: List[Tuple[str, int]]) -> Tuple[List[Optional[List[DatasetItem]]], List[int]]:
+        """Results already in the manifest, and the indices of the pack's chunks that still need generating."""
+        results = [self.manifest.completed(text, n) if self.manifest is not None else None for text, n in pack]
+        return results, [i for i, items in enumerate(results) if items is None]
+
+    def _record_pack(
+        self,
+        pack: List[Tuple[str, int]],
+        results: List[Optional[List[DatasetItem]]],
+        missing: List[int],
+        fresh: List[List[DatasetItem]],
+    ) -> List[List[DatasetItem]]:
+        METRICS.incr("chunks.resumed", len(pack) - len(missing))
+        for i, items in zip(missing, fresh):
+            results[i] = items
+            _count_delivered(pack[i][1], items)
+            if self.manifest is not None:
+                self.manifest.record(*pack[i], items)
+        return [items or [] for items in results]
+
+    def _generate_pack(self, pack: List[Tuple[str, int]]) -> List[List[DatasetItem]]:
+        results, missing = self._resume_pack(pack)
+        todo = [pack[i] for i in missing]
+        if len(todo) == 1:
+            fresh = [self.provider.generate_qa(*todo[0])]
+        else:
+            fresh = self.provider.generate_packed(todo) if todo else []
+        return self._record_pack(pack, results, missing, fresh)
+
+    async def _agenerate_pack(
+        self, pack: List[Tuple[str, int]], on_item: Optional[Callable[[DatasetItem], None]] = None
+    ) -> List[List[DatasetItem]]:
+        """Async variant of _generate_pack; `on_item` sees each fresh item of a single-chunk request as it streams in."""
+        results, missing = self._resume_pack(pack)
+        todo = [pack[i] for i in missing]
+        if len(todo) == 1:
+            items = []
+            async for item in self.provider.astream_qa(*todo[0]):
+                items.append(item)
+                if on_item is not None:
+                    on_item(item)
+            fresh = [items]
+        else:
+            fresh = await self.provider.agenerate_packed(todo) if todo else []
+        return self._record_pack(pack, results, missing, fresh)
+
+    def _stream_pack(self, pack: List[Tuple[str, int]]) -> GeneratorType[DatasetItem, None, None]:
+        """
+        Yields the items of a pack in chunk order. A single fresh chunk is streamed from the provider item by item;
+        packs and resumed chunks are answered whole.
+        """
+        results, missing = self._resume_pack(pack)
+        if len(pack) != 1 or not missing:
+            yield from (item for items in self._generate_pack(pack) for item in items)
+            return
+
+        items = []
+        try:
+            for item in self.provider.stream_qa(*pack[0]):
+                items.append(item)
+                yield item
+        except GeneratorExit:
+            # The consumer met its quota partway through the chunk: the items it took are already written,
+            # so they are recorded now and a resume does not generate the chunk again
+            self._record_pack(pack, results, missing, [items])
+            raise
+        self._record_pack(pack, results, missing, [items])
+
+    def _generate_batch(self, requests: List[Tuple[str, int]]) -> List[List[DatasetItem]]:
+        results: List[Optional[List[DatasetItem]]] = [
+            self.manifest.completed(text, n) if self.manifest is not None else None for text, n in requests
+        ]
+        missing = [i for i, items in enumerate(results) if items is None]
+        if missing:
+            print(f"Submitting {len(missing)} requests as a batch job...")
+            fresh = self.provider.generate_batch([requests[i] for i in missing])
+            for i, items in zip(missing, fresh):
+                results[i] = items
+                _count_delivered(requests[i][1], items)
+                if self.manifest is not None:
+                    self.manifest.record(*requests[i], items)
+        return [items or [] for items in results]
+
+    def stream_from_texts(self, texts: Sequence[str], total_questions: int = 10) -> Iterator[DatasetItem]:
+        """
+        Yields DatasetItems in chunk order as soon as they are available, without holding the whole dataset.
+        At most `total_questions` items are yielded.
+        """
+        requests = self._plan(texts, total_questions)
+        if not requests:
+            return
+
+        # Batch providers take the whole run in one submission and return results in chunk order
+        if self.provider.is_batch:
+            batch_results = self._generate_batch(requests)
+            yield from _take((item for items in batch_results for item in items), total_questions)
+            return
+
+        # Route to the concurrent engine when more than one request may be in flight
+        if self.config.provider.max_concurrency > 1:
+            yield from _iterate_async(self.astream_from_texts(texts, total_questions))
+            return
+
+        emitted = 0
+        with tqdm(total=total_questions, desc="Generating Q&A pairs", colour="green") as pbar:
+            for pack in self._pack(requests):
+                # Closed on return, so a pack cut short by the quota is recorded before this generator ends
+                with closing(self._stream_pack(pack)) as items:
+                    for item in items:
+                        pbar.update(1)
+                        yield item
+                        emitted += 1
+                        if emitted >= total_questions:
+                            return
+
+    async def astream_from_texts(self, texts: Sequence[str], total_questions: int = 10) -> AsyncIterator[DatasetItem]:
+        """
+        Concurrent version of stream_from_texts.
+        At most `provider.max_concurrency` requests (single chunks or packs) are in flight at once,
+        and results are yielded in chunk order.
+        Only a bounded window of requests is scheduled ahead, so finished-but-unconsumed results stay small.
+        """
+        packs = self._pack(self._plan(texts, total_questions))
+        max_concurrency = self.config.provider.max_concurrency
+        semaphore = asyncio.Semaphore(max_concurrency)
+        pending: Deque[asyncio.Task[List[DatasetItem]]] = deque()
+        upcoming = iter(packs)
+        emitted = 0
 
         with tqdm(total=total_questions, desc="Generating Q&A pairs", colour="green") as pbar:
-            for i, text in enumerate(texts):
-                questions_for_chunk = base_questions + (1 if i < extra_questions else 0)
 
-                if questions_for_chunk > 0:
-                    new_items = self.provider.generate_qa(text, questions_for_chunk)
-                    results.extend(new_items)
-                    pbar.update(len(new_items))
+            async def worker(pack: List[Tuple[str, int]]) -> List[DatasetItem]:
+                # Streamed items advance the progress bar as they arrive, the rest when their request finishes
+                streamed = 0
 
-        return Dataset(items=results[:total_questions])
+                def advance(item: DatasetItem) -> None:
+                    nonlocal streamed
+                    streamed += 1
+                    pbar.update(1)
 
-    def generate_from_sec(
+                async with semaphore:
+                    results = await self._agenerate_pack(pack, on_item=advance)
+                new_items = [item for items in results for item in items]
+                pbar.update(len(new_items) - streamed)
+                return new_items
+
+            def schedule_next() -> None:
+                pack = next(upcoming, None)
+                if pack is not None:
+                    pending.append(asyncio.create_task(worker(pack)))
+
+            try:
+                for _ in range(2 * max_concurrency):
+                    schedule_next()
+
+                while pending and emitted < total_questions:
+                    new_items = await pending.popleft()
+                    schedule_next()
+                    for item in new_items[: total_questions - emitted]:
+                        yield item
+                        emitted += 1
+            finally:
+                # Stop in-flight requests if the consumer stops early or the quota is met
+                for task in pending:
+                    task.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
+
+    def generate_from_texts(self, texts: List[str], total_questions: int = 10) -> Dataset:
+        return Dataset(items=list(self.stream_from_texts(texts, total_questions)))
+
+    async def agenerate_from_texts(self, texts: List[str], total_questions: int = 10) -> Dataset:
+        return Dataset(items=[item async for item in self.astream_from_texts(texts, total_questions)])
+
+    def write_from_texts(
         self,
-        ticker: str,
-        year: int,
-        quarter: int | None = None,
-        items: List[FilingItem] | None = None,
+        texts: Sequence[str],
+        writer: DatasetWriter,
         total_questions: int = 10,
-    ) -> Dataset:
+        source: Optional[str] = None,
+        partition: Optional[DatasetPartition] = None,
+    ) -> int:
+        """
+        Streams generated items straight into `writer`. Returns the number of items written
+        (also kept in `items_written`, so a caller can tell how many got out before an error).
+        `source` names the target the chunks were parsed from, for the writer's chunk table;
+        `partition` is its ticker/year/form for partitioned datasets.
+        """
+        writer.begin_target(source, texts, partition)
+        self.items_written = 0
+        try:
+            with METRICS.timer("stage.generate_s"):
+                for item in self.stream_from_texts(texts, total_questions):
+                    writer.write(item)
+                    self.items_written += 1
+        finally:
+            # Flushes and releases the checkpoint file; the next target's first record reopens it
+            if self.manifest is not None:
+                self.manifest.close()
+        return self.items_written
+
+    def chunks_from_sec(
+        self, ticker: str, year: int, quarter: int | None = None, items: List[FilingItem] | None = None
+    ) -> List[str]:
         if quarter:
             print(f"Fetching 10-Q for {ticker} Q{quarter} {year}...")
             chunks = self.sec_parser.parse(ticker, year=year, quarter=quarter, items=items)
@@ -64,20 +364,115 @@ class Generator:
             chunks = self.sec_parser.parse(ticker, year=year, items=items)
 
         print(f"Processing {len(chunks)} text chunks...")
-        return self.generate_from_texts(chunks, total_questions)
+        return chunks
 
-    def generate_from_pdf(self, url: str, total_questions: int = 10) -> Dataset:
+    def chunks_from_pdf(self, url: str) -> List[str]:
         print(f"Downloading and parsing PDF from {url}...")
         chunks = self.pdf_parser.parse(url)
         print(f"Processing {len(chunks)} text chunks...")
-        return self.generate_from_texts(chunks, total_questions)
+        return chunks
+
+    def chunks_from_docling(self, url_or_path: str) -> List[str]:
+        print("Starting Docling generation pipeline...")
+        chunks = self.docling_parser.parse(url_or_path)
+        print(f"Docling extraction complete. Processing {len(chunks)} chunks...")
+        return chunks
+
+    def chunks_from_hybrid(self, url_or_path: str) -> List[str]:
+        print("Starting hybrid pypdf + Docling pipeline...")
+        chunks = self.hybrid_parser.parse(url_or_path)
+        print(f"Hybrid extraction complete. Processing {len(chunks)} chunks...")
+        return chunks
+
+    @contextmanager
+    def chunks_for_task(self, task: TaskConfig) -> Iterator[Sequence[str]]:
+        """
+        Yields the chunks of the configured task target, parsed with the parser selected by `parser.name`.
+        With the chunk store enabled, a target is parsed once per parser+chunker config and then
+        memory-mapped by every later run or sweep job; the mapping is closed when the block exits.
+        """
+        if not self.config.chunk_store.enabled:
+            with METRICS.timer("stage.parse_s"):
+                chunks = self._parse_task(task)
+            yield chunks
+            return
+
+        from findodo.storage.chunks import ChunkStore
+
+        with METRICS.timer("stage.parse_s"):
+            store = ChunkStore(self.config.chunk_store.dir or Path(self.config.output_dir) / "chunks")
+            target = task.model_dump(mode="json", include={"target", "year", "quarter", "items"})
+            inputs = ChunkStore.make_key(self.config.parser, self.config.chunker, **target)
+            artifact = store.get_or_create(inputs, lambda: self._parse_task(task))
+        with artifact:
+            yield artifact
+
+    def _parse_task(self, task: TaskConfig) -> List[str]:
+        if task.target is None:
+            raise ValueError("task.target is required (a ticker for SEC, a URL or path for PDF/Docling/hybrid)")
+
+        name = self.config.parser.name
+        if name == "sec":
+            if task.year is None:
+                raise ValueError("task.year is required for SEC parsing")
+            return self.chunks_from_sec(task.target, task.year, task.quarter, task.items)
+        if name == "pdf":
+            return self.chunks_from_pdf(task.target)
+        if name == "docling":
+            return self.chunks_from_docling(task.target)
+        if name == "hybrid":
+            return self.chunks_from_hybrid(task.target)
+        # Parsers registered through entry points
+        return self.get_parser(name).parse(task.target)
+
+    def generate_from_sec(
+        self,
+        ticker: str,
+        year: int,
+        quarter: int | None = None,
+        items: List[FilingItem] | None = None,
+        total_questions: int = 10,
+    ) -> Dataset:
+        return self.generate_from_texts(self.chunks_from_sec(ticker, year, quarter, items), total_questions)
+
+    def generate_from_pdf(self, url: str, total_questions: int = 10) -> Dataset:
+        return self.generate_from_texts(self.chunks_from_pdf(url), total_questions)
 
     def generate_from_docling(self, url_or_path: str, total_questions: int = 10) -> Dataset:
         """
         Generates a dataset using the advanced Docling parser.
         Best for documents with heavy tables.
         """
-        print("Starting Docling generation pipeline...")
-        chunks = self.docling_parser.parse(url_or_path)
-        print(f"Docling extraction complete. Processing {len(chunks)} chunks...")
-        return self.generate_from_texts(chunks, total_questions)
+        return self.generate_from_texts(self.chunks_from_docling(url_or_path), total_questions)
+
+
+def _count_delivered(num_questions: int, items: List[DatasetItem]) -> None:
+    METRICS.incr("questions.requested", num_questions)
+    METRICS.incr("questions.delivered", len(items))
+    if not items:
+        METRICS.incr("chunks.failed")
+
+
+def _take(items: Iterator[DatasetItem], limit: int) -> Iterator[DatasetItem]:
+    for count, item in enumerate(items):
+        if count >= limit:
+            return
+        yield item
+
+
+def _iterate_async(stream: AsyncIterator[DatasetItem]) -> Iterator[DatasetItem]:
+    """
+    Drives an async iterator from synchronous code on a private event loop.
+    """
+    loop = asyncio.new_event_loop()
+    try:
+        while True:
+            try:
+                yield loop.run_until_complete(stream.__anext__())
+            except StopAsyncIteration:
+                break
+    finally:
+        aclose = getattr(stream, "aclose", None)
+        if aclose is not None:
+            loop.run_until_complete(aclose())
+        loop.close()
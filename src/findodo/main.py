@@ -1,13 +1,21 @@
 import hydra
-import mlflow
 from pathlib import Path
 from typing import Dict, Any, cast
 from dotenv import load_dotenv
 from omegaconf import DictConfig, OmegaConf
+from hydra.core.hydra_config import HydraConfig
 from hydra.utils import get_original_cwd
 
+from findodo.checkpoint import RunManifest
 from findodo.config import Config
+from findodo.core.metrics import METRICS
 from findodo.generator import Generator
+from findodo.models import DatasetPartition
+from findodo.registry import lazy_import
+from findodo.storage import open_writer
+
+# MLflow is the slowest import of the CLI; it is only loaded once a run actually starts
+mlflow = lazy_import("mlflow")
 
 # Load environment variables immediately
 load_dotenv()
@@ -32,15 +40,31 @@ def main(cfg: DictConfig) -> None:
     mlflow.set_tracking_uri(tracking_uri)
     mlflow.set_experiment("FinDodo_Phase1_Experiments")
 
-    # 2. Start the Run
-    with mlflow.start_run() as run:
+    # 2. Open the run manifest. A resumed run reuses the original run directory, config and MLflow run.
+    resume = cfg.get("resume")
+    if resume:
+        run_dir = Path(resume) if Path(resume).is_absolute() else Path(get_original_cwd()) / resume
+        if not (run_dir / RunManifest.META_FILE).exists():
+            print(f"Configuration Error: no run manifest found in {run_dir}")
+            return
+        manifest = RunManifest(run_dir)
+        print(f"Resuming run in {run_dir} ({len(manifest)} chunks already finished)")
+    else:
+        manifest = RunManifest(HydraConfig.get().runtime.output_dir)
+
+    # 3. Start the Run
+    with mlflow.start_run(run_id=manifest.meta.get("mlflow_run_id")) as run:
         print(f"MLflow Run ID: {run.info.run_id}")
 
-        # 3. Log all Hydra parameters
-        params = cast(Dict[str, Any], OmegaConf.to_container(cfg, resolve=True))
-        mlflow.log_params(params)
+        # 4. Log all Hydra parameters (a resumed run already has them)
+        if resume:
+            params = cast(Dict[str, Any], manifest.meta["config"])
+        else:
+            params = cast(Dict[str, Any], OmegaConf.to_container(cfg, resolve=True))
+            mlflow.log_params(params)
+            manifest.update_meta(mlflow_run_id=run.info.run_id, config=params)
 
-        # 4. Validate Config (Pydantic)
+        # 5. Validate Config (Pydantic)
         try:
             validated_config = Config(**params)
         except Exception as e:
@@ -48,13 +72,26 @@ def main(cfg: DictConfig) -> None:
             mlflow.set_tag("status", "failed")
             return
 
+        # Hydra changes the working directory per run, so anchor relative outputs
+        # (and the response cache inside them) to the project root to share them across runs.
+        if not Path(validated_config.output_dir).is_absolute():
+            validated_config.output_dir = str(Path(get_original_cwd()) / validated_config.output_dir)
+
         print("FinDodo initialized successfully!")
         print(f"Output: {validated_config.output_dir}")
         print(f"Parser: {validated_config.parser.name}")
         print(f"Provider: {validated_config.provider.name}")
 
-        # 5. Initialize the Generator
-        generator = Generator(validated_config)
+        METRICS.enabled = validated_config.metrics.enabled
+        METRICS.reset()
+
+        # 6. Initialize the Generator. A dry run never builds the real provider, so no request can reach the API.
+        provider = None
+        if validated_config.dry_run:
+            from findodo.estimate import DryRunProvider
+
+            provider = DryRunProvider.from_config(validated_config)
+        generator = Generator(validated_config, provider=provider, manifest=manifest)
         print(f"Instance created: {generator}")
 
         # Check for Docling parser
@@ -63,6 +100,93 @@ def main(cfg: DictConfig) -> None:
 
         print("\nSystem is ready. MLflow tracking is active.")
 
+        # 7. Run the task, streaming items to disk as they are generated
+        task = validated_config.task
+        if task.target is None and not task.jobs:
+            print("No task.target configured, nothing to generate.")
+            return
+
+        if validated_config.dry_run:
+            from findodo.estimate import estimate_task
+
+            estimate = estimate_task(generator, task)
+            print(estimate.report())
+            mlflow.set_tag("dry_run", "true")
+            mlflow.log_metrics(estimate.metrics())
+            mlflow.log_dict(estimate.model_dump(), "dry_run.json")
+            return
+
+        layout = validated_config.output_layout
+        writer_kwargs: Dict[str, Any] = {}
+        output_path = Path(validated_config.output_dir) / run.info.run_id
+        if layout == "flat":
+            output_path = output_path.with_name(f"{run.info.run_id}.{validated_config.output_format}")
+        elif layout == "partitioned":
+            # One dataset for all runs; this run adds its own run_id=<id> partitions
+            output_path = Path(validated_config.dataset_dir or Path(validated_config.output_dir) / "dataset")
+            writer_kwargs["run_id"] = run.info.run_id
+        deduplicator = None
+        try:
+            if validated_config.dedup.enabled:
+                from findodo.dedup import Deduplicator, DedupWriter
+
+                deduplicator = Deduplicator.from_config(validated_config, run.info.run_id)
+            writer = open_writer(output_path, validated_config.output_format, layout, **writer_kwargs)
+        except (ImportError, ValueError) as e:
+            print(f"Configuration Error: {e}")
+            mlflow.set_tag("status", "failed")
+            return
+        if deduplicator is not None:
+            # Near-duplicates of this or earlier runs are dropped before they reach the dataset
+            writer = DedupWriter(writer, deduplicator, validated_config.dedup.batch_size)
+
+        with writer:
+            if task.jobs:
+                from findodo.bulk import BulkSECPipeline
+
+                results = BulkSECPipeline.from_generator(generator).run(task.jobs, task.total_questions, writer)
+                failed = [r for r in results if r.status == "failed"]
+                mlflow.log_metrics({"jobs_succeeded": len(results) - len(failed), "jobs_failed": len(failed)})
+                mlflow.log_dict({"jobs": [r.model_dump(mode="json") for r in results]}, "bulk_jobs.json")
+                count = sum(r.num_items for r in results)
+            else:
+                partition = None
+                if validated_config.parser.name == "sec" and task.target:
+                    partition = DatasetPartition.for_filing(task.target, task.year, task.quarter)
+                with generator.chunks_for_task(task) as chunks:
+                    count = generator.write_from_texts(
+                        chunks, writer, task.total_questions, source=task.target, partition=partition
+                    )
+
+        if deduplicator is not None:
+            stats = deduplicator.stats
+            print(
+                f"Dedup: kept {stats.kept} of {count} items ({stats.duplicates_of_previous_runs} seen in earlier runs)"
+            )
+            mlflow.log_metrics(stats.metrics())
+            mlflow.log_dict(stats.model_dump(), "dedup.json")
+            count = stats.kept
+
+        # Log where the question budget went (weighted and diverse allocation only)
+        if generator.allocation_plans:
+            plans = generator.allocation_plans
+            mlflow.log_dict({"plans": [plan.model_dump() for plan in plans]}, "allocation_plan.json")
+            summaries = [plan.summary() for plan in plans]
+            mlflow.log_metrics({key: sum(s[key] for s in summaries) for key in summaries[0]})
+
+        # Stage timings, token usage, latency percentiles and failure counters
+        if METRICS.enabled:
+            metrics = METRICS.summary()
+            cache = getattr(generator.provider, "cache", None)
+            if cache is not None:
+                metrics.update({f"response_cache.{key}": value for key, value in cache.stats().items()})
+            mlflow.log_metrics(metrics)
+            mlflow.log_dict(metrics, "metrics.json")
+
+        mlflow.log_metric("num_items", count)
+        mlflow.set_tag("output_path", str(output_path))
+        print(f"Wrote {count} items to {output_path}")
+
 
 if __name__ == "__main__":
     main()
@@ -1,5 +1,6 @@
+import hashlib
 from enum import Enum
-from typing import List
+from typing import List, Optional
 from pydantic import BaseModel, Field
 
 
@@ -27,10 +28,86 @@ class FilingItem(str, Enum):
     ITEM_16 = "Item 16"
 
 
-class DatasetItem(BaseModel):
+class DatasetPartition(BaseModel):
+    """
+    Where a target's items land in a partitioned dataset. Unset values go to the default (null) partition,
+    e.g. PDF and URL targets have no ticker, year or form.
+    """
+
+    ticker: Optional[str] = None
+    year: Optional[int] = None
+    form: Optional[str] = None
+
+    @classmethod
+    def for_filing(cls, ticker: str, year: Optional[int], quarter: Optional[int] = None) -> "DatasetPartition":
+        return cls(ticker=ticker.upper(), year=year, form="10-Q" if quarter else "10-K")
+
+
+class SECJob(BaseModel):
+    """
+    One filing to process in a bulk SEC run.
+    """
+
+    ticker: str
+    year: int
+    quarter: Optional[int] = Field(None, ge=1, le=4, description="Set for a 10-Q, None selects the 10-K")
+    items: Optional[List[FilingItem]] = Field(None, description="Items to keep (None = all)")
+
+    @property
+    def label(self) -> str:
+        return f"{self.ticker} {self.year} " + (f"Q{self.quarter}" if self.quarter else "10-K")
+
+    @property
+    def partition(self) -> DatasetPartition:
+        return DatasetPartition.for_filing(self.ticker, self.year, self.quarter)
+
+
+class Chunk(BaseModel):
+    """A token window of a source text, with its character span in that text."""
+
+    text: str
+    num_tokens: int
+    start: int
+    end: int
+
+
+def make_chunk_id(text: str) -> str:
+    """Content-addressed chunk ID: the same chunk text gets the same ID in every run."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+class QAPair(BaseModel):
+    """What the model returns per question; the context is attached by reference to its chunk."""
+
     question: str = Field(..., description="The generated question.")
     answer: str = Field(..., description="The answer directly derived from the context.")
-    context: str = Field(..., description="The specific text chunk used to generate this QA pair.")
+
+
+class DatasetItem(QAPair):
+    context: str = Field(..., description="The text chunk this QA pair was generated from.")
+    chunk_id: Optional[str] = Field(None, description="ID of the chunk in the dataset's chunk table.")
+
+    @classmethod
+    def from_chunk(cls, pair: QAPair, text: str, chunk_id: Optional[str] = None) -> "DatasetItem":
+        """Attaches the chunk to a generated pair. The chunk text is shared, never copied, across its items."""
+        return cls.model_construct(
+            question=pair.question, answer=pair.answer, context=text, chunk_id=chunk_id or make_chunk_id(text)
+        )
+
+
+class ChunkRecord(BaseModel):
+    """One row of a compact dataset's chunk table."""
+
+    chunk_id: str
+    text: str
+    source: Optional[str] = Field(None, description="Target the chunk was parsed from (ticker, URL or path).")
+    index: Optional[int] = Field(None, description="Position of the chunk among its target's chunks.")
+
+
+class QARow(QAPair):
+    """One row of a compact dataset's QA table, referencing its chunk by ID."""
+
+    chunk_id: str
 
 
 class Dataset(BaseModel):
@@ -1,14 +1,142 @@
-from langchain_text_splitters import TokenTextSplitter
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Iterable, Iterator, List, Optional
+
+import numpy as np
+import numpy.typing as npt
+import tiktoken
+
+from findodo.core.metrics import METRICS
+from findodo.models import Chunk
+
+
+@lru_cache(maxsize=None)
+def _token_byte_lengths(encoding_name: str) -> npt.NDArray[np.int64]:
+    """Byte length of every token in the vocabulary, so offsets can be computed without decoding."""
+    encoding = tiktoken.get_encoding(encoding_name)
+    lengths = np.zeros(encoding.n_vocab, dtype=np.int64)
+    for token in range(encoding.n_vocab):
+        try:
+            lengths[token] = len(encoding.decode_single_token_bytes(token))
+        except KeyError:
+            continue
+    return lengths
+
+
+def _char_offsets(text: str, byte_offsets: npt.NDArray[np.int64]) -> List[int]:
+    """
+    Maps UTF-8 byte offsets of `text` to character offsets.
+    An offset inside a multi-byte character is moved back to the start of that character.
+    """
+    if text.isascii():
+        return byte_offsets.tolist()  # type: ignore[no-any-return]
+    data = np.frombuffer(text.encode("utf-8"), dtype=np.uint8)
+    is_lead = np.append((data & 0xC0) != 0x80, True)
+    leads_before = np.zeros(len(data) + 1, dtype=np.int64)
+    np.cumsum(is_lead[:-1], out=leads_before[1:])
+    return (leads_before[byte_offsets] - ~is_lead[byte_offsets]).tolist()  # type: ignore[no-any-return]
 
 
 class Chunker:
     """
-    Standardized text splitter.
-    Refactored to accept configuration arguments instead of using global settings.
+    Standardized token splitter.
+
+    Text is encoded once with tiktoken, windows are sliced over the token array and mapped back to
+    character offsets in the original string, so chunks are cut from the input without decoding each window.
+    Windows are the same as those of langchain's TokenTextSplitter with the same encoding.
     """
 
-    def __init__(self, chunk_size: int, chunk_overlap: int) -> None:
-        self._splitter = TokenTextSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+    def __init__(self, chunk_size: int, chunk_overlap: int, encoding: str = "gpt2") -> None:
+        if chunk_overlap >= chunk_size:
+            raise ValueError("chunk_overlap must be smaller than chunk_size")
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.encoding_name = encoding
+        self._encoding: Optional[tiktoken.Encoding] = None
+
+    @classmethod
+    def from_config(cls, chunker_config: Any) -> "Chunker":
+        return cls(
+            chunk_size=chunker_config.chunk_size,
+            chunk_overlap=chunker_config.chunk_overlap,
+            encoding=getattr(chunker_config, "encoding", "gpt2"),
+        )
+
+    @property
+    def encoding(self) -> tiktoken.Encoding:
+        # Loaded lazily so the Chunker stays cheap to create and to send to worker processes
+        if self._encoding is None:
+            self._encoding = tiktoken.get_encoding(self.encoding_name)
+        return self._encoding
+
+    def __getstate__(self) -> dict[str, Any]:
+        return {**self.__dict__, "_encoding": None}
 
     def split(self, text: str) -> list[str]:
-        return self._splitter.split_text(text)
+        return [chunk.text for chunk in self.chunk(text)]
+
+    def chunk(self, text: str) -> List[Chunk]:
+        """Splits text into chunks with their token counts and character offsets."""
+        with METRICS.timer("stage.chunk_s"):
+            return self._windows(text, self._encode(text))
+
+    def chunk_batch(self, texts: List[str], num_threads: Optional[int] = None) -> List[List[Chunk]]:
+        """Chunks many documents at once; documents are encoded in parallel threads (tiktoken releases the GIL)."""
+        num_threads = num_threads or min(8, os.cpu_count() or 1)
+        if num_threads > 1 and len(texts) > 1:
+            with ThreadPoolExecutor(max_workers=num_threads) as pool:
+                token_arrays = list(pool.map(self._encode, texts))
+        else:
+            token_arrays = [self._encode(text) for text in texts]
+        return [self._windows(text, token_ids) for text, token_ids in zip(texts, token_arrays)]
+
+    def _encode(self, text: str) -> npt.NDArray[np.uint32]:
+        # Special-token strings are encoded as plain text rather than rejected
+        token_ids: npt.NDArray[np.uint32] = self.encoding.encode_to_numpy(text, disallowed_special=())
+        return token_ids
+
+    def _windows(self, text: str, token_ids: npt.NDArray[np.uint32]) -> List[Chunk]:
+        num_tokens = len(token_ids)
+        if num_tokens == 0:
+            return []
+
+        step = self.chunk_size - self.chunk_overlap
+        num_windows = 1 + max(0, -(-(num_tokens - self.chunk_size) // step))
+        starts = np.arange(num_windows, dtype=np.int64) * step
+        ends = np.minimum(starts + self.chunk_size, num_tokens)
+
+        # Byte offset of every token boundary, then the character offsets of the window boundaries
+        byte_bounds = np.zeros(num_tokens + 1, dtype=np.int64)
+        np.cumsum(_token_byte_lengths(self.encoding_name)[token_ids], out=byte_bounds[1:])
+        char_starts = _char_offsets(text, byte_bounds[starts])
+        char_ends = _char_offsets(text, byte_bounds[ends])
+
+        chunks = []
+        for start, end, char_start, char_end in zip(starts.tolist(), ends.tolist(), char_starts, char_ends):
+            if char_end > char_start:
+                chunks.append(
+                    Chunk(text=text[char_start:char_end], num_tokens=end - start, start=char_start, end=char_end)
+                )
+        return chunks
+
+    def split_stream(self, pieces: Iterable[str]) -> Iterator[str]:
+        """
+        Splits a stream of text pieces (e.g. pages) into the same token windows as split(),
+        holding at most one window of tokens at a time. Pieces are joined with a single space.
+        """
+        encoding = self.encoding
+        step = self.chunk_size - self.chunk_overlap
+        buffer: List[int] = []
+        emitted = False
+
+        for i, piece in enumerate(pieces):
+            buffer.extend(encoding.encode_ordinary(piece if i == 0 else " " + piece))
+            while len(buffer) >= self.chunk_size:
+                yield encoding.decode(buffer[: self.chunk_size])
+                emitted = True
+                buffer = buffer[step:]
+
+        # Flush the tail unless it is only the overlap of the last window
+        if buffer and (not emitted or len(buffer) > self.chunk_overlap):
+            yield encoding.decode(buffer)
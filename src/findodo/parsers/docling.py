@@ -1,17 +1,79 @@
-from typing import Any, List
+import hashlib
+import ipaddress
+import os
+import secrets
+from contextlib import ExitStack
+from multiprocessing.connection import Client
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from findodo.core.caching import DiskCache
 from findodo.core.parsing import BaseParser
 from findodo.parsers.chunker import Chunker
+from findodo.parsers.pdf import local_copy
 
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "findodo" / "docling"
+# The worker exchanges pickles, so only holders of this key may connect to it
+AUTHKEY_ENV = "FINDODO_DOCLING_AUTHKEY"
+DEFAULT_AUTHKEY_FILE = Path.home() / ".config" / "findodo" / "docling.key"
 
-class DoclingParser(BaseParser):
+# 1-based, inclusive (first, last) page numbers, as Docling expects them
+PageRange = Tuple[int, int]
+
+
+def file_digest(path: Path) -> str:
+    """SHA-256 of a file's contents, read in blocks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def parse_address(address: str) -> Tuple[str, int] | str:
+    """'host:port' becomes a TCP address; anything else is treated as a Unix socket path."""
+    host, _, port = address.rpartition(":")
+    return (host, int(port)) if host and port.isdigit() else address
+
+
+def is_loopback(address: Tuple[str, int] | str) -> bool:
+    """Unix sockets and TCP addresses on the loopback interface are only reachable from this machine."""
+    if isinstance(address, str):
+        return True
+    host = address[0]
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def load_authkey(key_file: Path = DEFAULT_AUTHKEY_FILE) -> bytes:
     """
-    Advanced PDF parser using IBM's Docling for table structure recognition.
-    Converts documents to Markdown to preserve table layouts for LLMs.
+    The worker's authentication key: $FINDODO_DOCLING_AUTHKEY when set, otherwise a random per-user key
+    kept in `key_file` (created with mode 0600 on first use), so the worker and the parser agree on it.
     """
+    if os.environ.get(AUTHKEY_ENV):
+        return os.environ[AUTHKEY_ENV].encode()
+    key_file.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        fd = os.open(key_file, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        return key_file.read_bytes().strip()
+    key = secrets.token_hex(32).encode()
+    with os.fdopen(fd, "wb") as f:
+        f.write(key)
+    return key
 
-    def __init__(self, config: Any, chunker_config: Any) -> None:
-        super().__init__(config)
-        self.chunker = Chunker(chunk_size=chunker_config.chunk_size, chunk_overlap=chunker_config.chunk_overlap)
+
+class DoclingConverter:
+    """
+    In-process Docling backend. Models are loaded on first use and reused for every later batch.
+    """
+
+    def __init__(self, enable_ocr: bool = True) -> None:
+        self.enable_ocr = enable_ocr
         self._converter: Any = None
 
     @property
@@ -23,24 +85,149 @@ class DoclingParser(BaseParser):
         if self._converter is None:
             print("Loading Docling AI models (Lazy Load)...")
             # Import here to prevent top-level crashes
-            from docling.document_converter import DocumentConverter
+            from docling.datamodel.base_models import InputFormat
+            from docling.datamodel.pipeline_options import PdfPipelineOptions
+            from docling.document_converter import DocumentConverter, PdfFormatOption
 
             # Instantiate the DocumentConverter to load the underlying vision models into memory.
-            self._converter = DocumentConverter()
+            pipeline_options = PdfPipelineOptions(do_ocr=self.enable_ocr, do_table_structure=True)
+            self._converter = DocumentConverter(
+                format_options={InputFormat.PDF: PdfFormatOption(pipeline_options=pipeline_options)}
+            )
         return self._converter
 
+    def convert(self, paths: List[str], page_range: Optional[PageRange] = None) -> List[Optional[str]]:
+        """
+        Converts all documents in one multi-document pass. Returns Markdown per path, None where conversion failed.
+        page_range: Optional 1-based, inclusive (first, last) pages to convert.
+        """
+        from docling.datamodel.base_models import ConversionStatus
+
+        options: Dict[str, Any] = {"raises_on_error": False}
+        if page_range is not None:
+            options["page_range"] = page_range
+
+        markdown: List[Optional[str]] = []
+        for path, result in zip(paths, self.converter.convert_all(paths, **options)):
+            if result.status in (ConversionStatus.SUCCESS, ConversionStatus.PARTIAL_SUCCESS):
+                markdown.append(result.document.export_to_markdown())
+            else:
+                print(f"Warning: Docling could not convert {path} ({result.status}).")
+                markdown.append(None)
+        return markdown
+
+
+class DoclingClient:
+    """
+    Backend that forwards batches to a long-lived worker (`findodo-docling-worker`) that keeps the models warm.
+    """
+
+    def __init__(self, address: str, authkey: bytes) -> None:
+        self.address = parse_address(address)
+        self.authkey = authkey
+
+    def convert(self, paths: List[str], page_range: Optional[PageRange] = None) -> List[Optional[str]]:
+        with Client(self.address, authkey=self.authkey) as connection:
+            paths = [str(Path(p).resolve()) for p in paths]
+            connection.send({"op": "convert", "paths": paths, "page_range": page_range})
+            reply: Dict[str, Any] = connection.recv()
+        if "error" in reply:
+            raise RuntimeError(f"Docling worker failed: {reply['error']}")
+        markdown: List[Optional[str]] = reply["markdown"]
+        return markdown
+
+
+class DoclingParser(BaseParser):
+    """
+    Advanced PDF parser using IBM's Docling for table structure recognition.
+    Converts documents to Markdown to preserve table layouts for LLMs.
+
+    Exported Markdown is cached by document content hash, so re-chunking a document
+    (new chunk size, new prompt) never runs layout analysis again.
+    """
+
+    def __init__(self, config: Any, chunker_config: Any) -> None:
+        super().__init__(config)
+        self.chunker = Chunker.from_config(chunker_config)
+        self.enable_ocr = getattr(config, "enable_ocr", True)
+
+        # A configured worker keeps the models loaded across runs; otherwise they are loaded in-process
+        worker_address = getattr(config, "worker_address", None)
+        self.backend: DoclingConverter | DoclingClient = (
+            DoclingClient(worker_address, load_authkey()) if worker_address else DoclingConverter(self.enable_ocr)
+        )
+
+        self.cache: Optional[DiskCache] = None
+        if getattr(config, "cache_enabled", True):
+            self.cache = DiskCache(
+                getattr(config, "cache_dir", None) or DEFAULT_CACHE_DIR,
+                max_size_mb=getattr(config, "cache_max_mb", 4096),
+            )
+
+    @property
+    def converter(self) -> Any:
+        """The in-process DocumentConverter (loads the models)."""
+        if not isinstance(self.backend, DoclingConverter):
+            raise AttributeError("Docling runs in a worker process; there is no local converter")
+        return self.backend.converter
+
+    def cache_key(self, digest: str, page_range: Optional[PageRange] = None) -> str:
+        # Only options that change the Markdown belong in the key
+        if page_range is None:
+            return DiskCache.make_key("docling", digest, self.enable_ocr)
+        return DiskCache.make_key("docling", digest, self.enable_ocr, list(page_range))
+
     def parse(self, target: str, **kwargs: Any) -> List[str]:
         """
         Parses a PDF from a local path or URL using Docling.
         target: File path or URL.
         """
-        print(f"Docling is analyzing layout for: {target} ...")
+        return self.parse_many([target])[0]
+
+    def parse_many(self, targets: List[str]) -> List[List[str]]:
+        """
+        Converts many documents in one Docling batch and chunks each of them.
+        Raises RuntimeError if Docling failed on any of them; the ones it converted are cached all the same.
+        """
+        documents = self.to_markdown(targets)
+        return [[chunk.text for chunk in chunks] for chunks in self.chunker.chunk_batch(documents)]
+
+    def to_markdown(self, targets: List[str]) -> List[str]:
+        """
+        Returns the Markdown of every target. Cached documents are read from the cache;
+        all others are converted together in a single batch. Raises RuntimeError naming the targets that failed.
+        """
+        with ExitStack() as stack:
+            paths = [stack.enter_context(local_copy(target)) for target in targets]
+            keys = [self.cache_key(file_digest(path)) for path in paths]
+            markdown = self._convert_cached(keys, paths, targets)
+        failed = [target for target, text in zip(targets, markdown) if text is None]
+        if failed:
+            raise RuntimeError(f"Docling could not convert {failed}")
+        return [text for text in markdown if text is not None]
 
-        # Docling handles both URLs and local paths automatically
-        result = self.converter.convert(target)
+    def page_markdown(self, path: Path, digest: str, page_range: PageRange) -> Optional[str]:
+        """Markdown of one page range of a local document (None if Docling failed on it)."""
+        key = self.cache_key(digest, page_range)
+        return self._convert_cached([key], [path], [f"{path} pages {page_range[0]}-{page_range[1]}"], page_range)[0]
 
-        # Export the parsed document structure to Markdown format
-        full_text = result.document.export_to_markdown()
+    def _convert_cached(
+        self, keys: List[str], paths: List[Path], labels: List[str], page_range: Optional[PageRange] = None
+    ) -> List[Optional[str]]:
+        """Reads what is cached and converts all the rest in a single Docling batch."""
+        markdown: List[Optional[str]] = [None] * len(keys)
+        if self.cache is not None:
+            for i, key in enumerate(keys):
+                entry = self.cache.get(key)
+                if entry is not None:
+                    markdown[i] = entry["markdown"]
 
-        # Split into chunks using our standard chunker
-        return self.chunker.split(full_text)
+        misses = [i for i, text in enumerate(markdown) if text is None]
+        if misses:
+            print(f"Docling is analyzing layout for {len(misses)} document(s): {[labels[i] for i in misses]} ...")
+            converted = self.backend.convert([str(paths[i]) for i in misses], page_range)
+            for i, text in zip(misses, converted):
+                markdown[i] = text
+                if text is not None and self.cache is not None:
+                    self.cache.put(keys[i], {"markdown": text, "source": labels[i]})
+        return markdown
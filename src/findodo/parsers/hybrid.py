@@ -0,0 +1,97 @@
+import re
+from pathlib import Path
+from typing import Any, Iterator, List
+
+from findodo.core.parsing import BaseParser
+from findodo.parsers.docling import DoclingParser, PageRange, file_digest
+from findodo.parsers.pdf import PDFParser, clean_page, local_copy
+
+# Amounts as they appear in financial statements: 1,234.5  (12.3)  $4,567  -8  12%
+NUMBER_PATTERN = re.compile(r"(?<![\w.])\(?[-$]?\d[\d,]*(?:\.\d+)?\)?%?(?![\w.])")
+
+
+def table_score(text: str) -> float:
+    """Share of non-empty lines that carry at least two numeric cells."""
+    lines = [line for line in text.splitlines() if line.strip()]
+    if not lines:
+        return 0.0
+    numeric_rows = sum(1 for line in lines if len(NUMBER_PATTERN.findall(line)) >= 2)
+    return numeric_rows / len(lines)
+
+
+def page_ranges(pages: List[int]) -> List[PageRange]:
+    """Groups sorted 0-based page indices into 1-based, inclusive runs of consecutive pages."""
+    ranges: List[PageRange] = []
+    for page in pages:
+        if ranges and ranges[-1][1] == page:
+            ranges[-1] = (ranges[-1][0], page + 1)
+        else:
+            ranges.append((page + 1, page + 1))
+    return ranges
+
+
+class HybridParser(BaseParser):
+    """
+    Page-routing PDF parser.
+    Every page is scanned with pypdf first; only pages that look like tables (or have no text layer)
+    are sent to Docling, and the results are merged back in page order.
+    """
+
+    def __init__(self, config: Any, chunker_config: Any) -> None:
+        super().__init__(config)
+        self.pdf_parser = PDFParser(config, chunker_config)
+        self.docling_parser = DoclingParser(config, chunker_config)
+        self.chunker = self.pdf_parser.chunker
+
+        # Without include_tables, every page stays on the fast pypdf path
+        self.include_tables = getattr(config, "include_tables", False)
+        self.table_min_score = getattr(config, "table_min_score", 0.4)
+        self.table_min_rows = getattr(config, "table_min_rows", 4)
+        self.docling_empty_pages = getattr(config, "docling_empty_pages", True)
+
+    def is_table_page(self, text: str) -> bool:
+        if not text.strip():
+            return bool(self.docling_empty_pages)
+        rows = sum(1 for line in text.splitlines() if len(NUMBER_PATTERN.findall(line)) >= 2)
+        return rows >= self.table_min_rows and table_score(text) >= self.table_min_score
+
+    def route(self, pages: List[str]) -> List[int]:
+        """Indices of the pages that should go to Docling."""
+        if not self.include_tables:
+            return []
+        return [i for i, text in enumerate(pages) if self.is_table_page(text)]
+
+    def parse(self, target: str, **kwargs: Any) -> List[str]:
+        """
+        Parses a PDF from a URL or a local path, with Docling only on table-heavy pages.
+        """
+        with local_copy(target) as path:
+            pages = list(self.pdf_parser.page_texts(path))
+            table_pages = self.route(pages)
+            print(f"Routing {len(table_pages)}/{len(pages)} pages to Docling...")
+            return list(self.chunker.split_stream(self.merge(path, pages, table_pages)))
+
+    def merge(self, path: Path, pages: List[str], table_pages: List[int]) -> Iterator[str]:
+        """
+        Yields page text in page order, replacing each run of table pages with its Docling Markdown.
+        A run Docling fails on falls back to its pypdf text.
+        """
+        runs = {first - 1: (first, last) for first, last in page_ranges(table_pages)}
+        digest = file_digest(path) if runs else ""
+
+        index = 0
+        while index < len(pages):
+            if index not in runs:
+                text = clean_page(pages[index])
+                if text:
+                    yield text
+                index += 1
+                continue
+
+            first, last = runs[index]
+            markdown = self.docling_parser.page_markdown(path, digest, (first, last))
+            if markdown and markdown.strip():
+                yield markdown.strip()
+            else:
+                yield from (text for text in map(clean_page, pages[first - 1 : last]) if text)
+            index = last
@@ -1,31 +1,109 @@
-from io import BytesIO
-from typing import Any, List
+import mmap
+import os
+import tempfile
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Deque, Iterator, List
 import requests
 from pypdf import PdfReader
 from findodo.core.parsing import BaseParser
 from findodo.parsers.chunker import Chunker
 
 
+def is_url(target: str) -> bool:
+    return target.startswith(("http://", "https://"))
+
+
+@contextmanager
+def local_copy(target: str, chunk_size: int = 1 << 20) -> Iterator[Path]:
+    """
+    Yields a local path for `target`. URLs are streamed to a temporary file (never held in memory)
+    that is deleted afterwards; local paths are used as they are.
+    """
+    if not is_url(target):
+        yield Path(target)
+        return
+
+    fd, tmp_name = tempfile.mkstemp(suffix=".pdf")
+    try:
+        with os.fdopen(fd, "wb") as f, requests.get(target, timeout=30, stream=True) as response:
+            response.raise_for_status()
+            for block in response.iter_content(chunk_size=chunk_size):
+                f.write(block)
+        yield Path(tmp_name)
+    finally:
+        os.unlink(tmp_name)
+
+
+@contextmanager
+def open_pdf(path: Path) -> Iterator[PdfReader]:
+    """Opens a PDF through a read-only memory map, so parallel workers share the OS page cache."""
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        yield PdfReader(mapped)  # type: ignore[arg-type]
+
+
+def extract_pages(path: str, start: int, stop: int) -> List[str]:
+    """Process-pool task: extracts the raw text (line breaks kept) of pages [start, stop)."""
+    with open_pdf(Path(path)) as reader:
+        return [reader.pages[i].extract_text() or "" for i in range(start, stop)]
+
+
+def clean_page(text: str) -> str:
+    return text.replace("\n", " ").strip()
+
+
 class PDFParser(BaseParser):
     def __init__(self, config: Any, chunker_config: Any) -> None:
         super().__init__(config)
         # Pass the chunk settings explicitly
-        self.chunker = Chunker(chunk_size=chunker_config.chunk_size, chunk_overlap=chunker_config.chunk_overlap)
+        self.chunker = Chunker.from_config(chunker_config)
+        # 0 extracts pages in-process; otherwise pages are spread over a process pool
+        self.page_workers = getattr(config, "page_workers", os.cpu_count() or 1)
+        self.pages_per_task = getattr(config, "pages_per_task", 16)
 
     def parse(self, target: str, **kwargs: Any) -> List[str]:
-        return self.from_url(target)
+        """
+        Parses a PDF from a URL or a local path.
+        Page text is fed to the chunker as a stream, so the document never exists as one string.
+        """
+        with local_copy(target) as path:
+            return list(self.chunker.split_stream(self.iter_pages(path)))
 
     def from_url(self, url: str) -> List[str]:
-        response = requests.get(url, timeout=30)
-        response.raise_for_status()
-
-        with BytesIO(response.content) as f:
-            reader = PdfReader(f)
-            text = ""
-            for page in reader.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + " "
-
-        clean_text = text.replace("\n", " ").strip()
-        return self.chunker.split(clean_text)
+        return self.parse(url)
+
+    def iter_pages(self, path: Path) -> Iterator[str]:
+        """Yields the cleaned text of every non-empty page, in page order."""
+        return (text for text in map(clean_page, self.page_texts(path)) if text)
+
+    def page_texts(self, path: Path) -> Iterator[str]:
+        """
+        Yields the raw text of every page (empty pages included), in page order.
+        With page_workers > 0, page ranges are extracted in parallel while only a bounded window is in flight.
+        """
+        with open_pdf(path) as reader:
+            num_pages = len(reader.pages)
+        ranges = [
+            (start, min(start + self.pages_per_task, num_pages)) for start in range(0, num_pages, self.pages_per_task)
+        ]
+
+        if self.page_workers <= 0 or len(ranges) <= 1:
+            for start, stop in ranges:
+                yield from extract_pages(str(path), start, stop)
+            return
+
+        with ProcessPoolExecutor(max_workers=self.page_workers) as pool:
+            pending: Deque[Future[List[str]]] = deque()
+            upcoming = iter(ranges)
+            for start, stop in upcoming:
+                pending.append(pool.submit(extract_pages, str(path), start, stop))
+                if len(pending) >= 2 * self.page_workers:
+                    break
+            while pending:
+                texts = pending.popleft().result()
+                next_range = next(upcoming, None)
+                if next_range is not None:
+                    pending.append(pool.submit(extract_pages, str(path), *next_range))
+                yield from texts
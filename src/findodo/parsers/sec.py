@@ -1,17 +1,57 @@
 import re
-from typing import List, Any
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Any, Optional
 from edgar import Company, set_identity
 
 from findodo.models import FilingItem
+from findodo.core.caching import DiskCache
+from findodo.core.metrics import METRICS
 from findodo.core.parsing import BaseParser
 from findodo.parsers.chunker import Chunker
 
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "findodo" / "sec"
+
+
+class RequestThrottle:
+    """
+    Spaces calls at least 1 / `per_second` seconds apart, across all threads sharing the throttle.
+    There is no burst allowance, so concurrent fetch workers never exceed the rate either.
+    """
+
+    def __init__(self, per_second: float):
+        self.interval = 1.0 / per_second
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
 
 class SECParser(BaseParser):
     def __init__(self, config: Any, chunker_config: Any) -> None:
         super().__init__(config)
         # Initialize Chunker by passing values from the config
-        self.chunker = Chunker(chunk_size=chunker_config.chunk_size, chunk_overlap=chunker_config.chunk_overlap)
+        self.chunker = Chunker.from_config(chunker_config)
+
+        # Local filing cache keyed by (ticker, form, year, quarter): warm runs make no EDGAR calls at all
+        self.cache: Optional[DiskCache] = None
+        if getattr(config, "cache_enabled", True):
+            self.cache = DiskCache(
+                getattr(config, "cache_dir", None) or DEFAULT_CACHE_DIR,
+                ttl_days=getattr(config, "cache_ttl_days", 30),
+                max_size_mb=getattr(config, "cache_max_mb", 2048),
+            )
+
+        # SEC asks for at most 10 requests/s per client; every EDGAR call of this parser (and of all
+        # bulk fetch workers sharing it) waits its turn here
+        self.throttle = RequestThrottle(getattr(config, "edgar_requests_per_second", 5.0))
 
         # For Phase 1, we set a default identity or assume EDGAR_IDENTITY env var is set.
         # In Phase 2, we will move this explicitly into the ParserConfig.
@@ -40,28 +80,76 @@ class SECParser(BaseParser):
             return self.get_10k_chunks(target, year, items)
 
     def get_10k_chunks(self, ticker: str, year: int, items: List[FilingItem] | None = None) -> List[str]:
-        company = Company(ticker)
-        filings = company.get_filings(form="10-K")
-        filing = next((f for f in filings if f.filing_date.year == year), None)
-        if not filing:
-            raise ValueError(f"No 10-K found for {ticker} in {year}")
-        return self._process_filing(filing.obj(), items)
+        return self.chunk_items(self.fetch_items(ticker, year), items)
 
     def get_10q_chunks(self, ticker: str, year: int, quarter: int, items: List[FilingItem] | None = None) -> List[str]:
-        company = Company(ticker)
-        filings = company.get_filings(form="10-Q")
-        filing = next((f for f in filings if f.filing_date.year == year and f.quarter == quarter), None)
-        if not filing:
-            raise ValueError(f"No 10-Q found for {ticker} in {year} Q{quarter}")
-        return self._process_filing(filing.obj(), items)
-
-    def _process_filing(self, filing_obj: Any, items_to_filter: List[FilingItem] | None) -> List[str]:
-        if not items_to_filter:
-            selected_items = filing_obj.items
-        else:
-            selected_items = [i for i in items_to_filter if i in filing_obj.items]
+        return self.chunk_items(self.fetch_items(ticker, year, quarter), items)
+
+    @staticmethod
+    def cache_key(ticker: str, year: int, quarter: int | None = None) -> str:
+        form = "10-Q" if quarter else "10-K"
+        return DiskCache.make_key(ticker.upper(), form, year, quarter or 0)
+
+    def is_cached(self, ticker: str, year: int, quarter: int | None = None) -> bool:
+        return self.cache is not None and self.cache_key(ticker, year, quarter) in self.cache
+
+    def fetch_items(self, ticker: str, year: int, quarter: int | None = None) -> Dict[str, str]:
+        """
+        Returns the cleaned text of every item of the 10-K (or the 10-Q when `quarter` is set),
+        served from the local filing cache when possible.
+        A cache miss makes three throttled EDGAR calls: the company lookup, its filing list and the filing document.
+        """
+        form = "10-Q" if quarter else "10-K"
+        key = self.cache_key(ticker, year, quarter)
+        if self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                METRICS.incr("sec.filing_cache_hits")
+                return dict(cached["items"])
+
+        with METRICS.timer("stage.fetch_s"):
+            self.throttle.wait()
+            company = Company(ticker)
+            self.throttle.wait()
+            filings = company.get_filings(form=form)
+            if quarter:
+                filing = next((f for f in filings if f.filing_date.year == year and f.quarter == quarter), None)
+                if not filing:
+                    raise ValueError(f"No 10-Q found for {ticker} in {year} Q{quarter}")
+            else:
+                filing = next((f for f in filings if f.filing_date.year == year), None)
+                if not filing:
+                    raise ValueError(f"No 10-K found for {ticker} in {year}")
+
+            self.throttle.wait()
+            filing_obj = filing.obj()
+            items = {str(item): self._clean_text(filing_obj[item] or "") for item in filing_obj.items}
+
+        if self.cache is not None:
+            index = {
+                "ticker": ticker.upper(),
+                "form": form,
+                "year": year,
+                "quarter": quarter,
+                "accession_no": getattr(filing, "accession_no", None),
+                "filing_date": str(getattr(filing, "filing_date", "")),
+                "items": list(items),
+            }
+            self.cache.put(key, {"index": index, "items": items})
+        return items
+
+    def chunk_items(self, item_texts: Dict[str, str], items_to_filter: List[FilingItem] | None) -> List[str]:
+        return self.chunker.split(select_items(item_texts, items_to_filter))
+
 
-        raw_texts = [filing_obj[item] for item in selected_items]
-        cleaned_text = " ".join([self._clean_text(t) for t in raw_texts])
+def select_items(item_texts: Dict[str, str], items_to_filter: List[FilingItem] | None) -> str:
+    """
+    Joins the cleaned text of the requested items (all items when no filter is given) in filter order.
+    """
+    if not items_to_filter:
+        selected_items = list(item_texts)
+    else:
+        wanted = [FilingItem(i).value for i in items_to_filter]
+        selected_items = [i for i in wanted if i in item_texts]
 
-        return self.chunker.split(cleaned_text)
+    return " ".join([item_texts[item] for item in selected_items])
@@ -0,0 +1,43 @@
+import argparse
+from typing import List, Optional
+
+from findodo.config import ChunkerConfig, ParserConfig
+from findodo.parsers.sec import SECParser
+
+
+def prefetch(
+    tickers: List[str], years: List[int], quarters: Optional[List[int]] = None, cache_dir: Optional[str] = None
+) -> int:
+    """
+    Populates the SEC filing cache for every (ticker, year[, quarter]) combination.
+    Returns the number of filings that could not be fetched.
+    """
+    parser = SECParser(ParserConfig(name="sec", cache_dir=cache_dir), ChunkerConfig())
+    failures = 0
+    for ticker in tickers:
+        for year in years:
+            for quarter in quarters or [0]:
+                label = f"{ticker} {year}" + (f" Q{quarter}" if quarter else " 10-K")
+                try:
+                    items = parser.fetch_items(ticker, year, quarter or None)
+                    print(f"Cached {label}: {len(items)} items")
+                except Exception as e:
+                    failures += 1
+                    print(f"Failed {label}: {e}")
+    return failures
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Prefetch SEC filings into the local FinDodo filing cache.")
+    parser.add_argument("tickers", nargs="+", help="Ticker symbols, e.g. AAPL MSFT")
+    parser.add_argument("--years", nargs="+", type=int, required=True, help="Filing years")
+    parser.add_argument("--quarters", nargs="*", type=int, help="Fetch these 10-Q quarters instead of the 10-K")
+    parser.add_argument("--cache-dir", default=None, help="Cache directory (defaults to ~/.cache/findodo/sec)")
+    args = parser.parse_args()
+
+    failures = prefetch(args.tickers, args.years, args.quarters, args.cache_dir)
+    raise SystemExit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
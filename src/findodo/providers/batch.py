@@ -0,0 +1,257 @@
+import hashlib
+import json
+import shutil
+import time
+import uuid
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from openai import OpenAI
+from openai.types.chat import ChatCompletion
+
+from findodo.models import DatasetItem
+from findodo.core.providing import BaseProvider
+from findodo.providers.openai import OpenAIProvider
+
+# Batch statuses after which polling stops
+TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+# How long a cancelled batch may take to stop before its partial output is read anyway
+CANCEL_GRACE_S = 600.0
+
+
+class BatchTransport(ABC):
+    """
+    The contract for moving a batch JSONL file to a batch backend and fetching its results.
+    """
+
+    @abstractmethod
+    def submit(self, input_path: Path) -> str:
+        """Uploads the request file and starts a batch. Returns the batch ID."""
+        pass
+
+    @abstractmethod
+    def poll(self, batch_id: str) -> str:
+        """Returns the current status of the batch (e.g. 'in_progress', 'completed')."""
+        pass
+
+    @abstractmethod
+    def download(self, batch_id: str, output_path: Path) -> Optional[Path]:
+        """Writes the result JSONL to output_path. Returns None if the batch produced no output file."""
+        pass
+
+    @abstractmethod
+    def cancel(self, batch_id: str) -> None:
+        """Stops a running batch. Requests it already finished keep their results."""
+        pass
+
+
+class OpenAIBatchTransport(BatchTransport):
+    """
+    Submits through the OpenAI Batch API (files + batches endpoints).
+    """
+
+    def __init__(self, client: OpenAI, completion_window: str = "24h"):
+        self.client = client
+        self.completion_window = completion_window
+
+    def submit(self, input_path: Path) -> str:
+        with open(input_path, "rb") as f:
+            uploaded = self.client.files.create(file=f, purpose="batch")
+        batch = self.client.batches.create(
+            input_file_id=uploaded.id,
+            endpoint="/v1/chat/completions",
+            completion_window=self.completion_window,  # type: ignore[arg-type]
+        )
+        return batch.id
+
+    def poll(self, batch_id: str) -> str:
+        return self.client.batches.retrieve(batch_id).status
+
+    def download(self, batch_id: str, output_path: Path) -> Optional[Path]:
+        batch = self.client.batches.retrieve(batch_id)
+        if not batch.output_file_id:
+            return None
+        output_path.write_text(self.client.files.content(batch.output_file_id).text, encoding="utf-8")
+        return output_path
+
+    def cancel(self, batch_id: str) -> None:
+        self.client.batches.cancel(batch_id)
+
+
+class LocalBatchTransport(BatchTransport):
+    """
+    File-based stand-in for a batch backend, for offline tests and dry runs.
+    Each request body is answered by `responder`, which returns a chat completion dict
+    (or raises to simulate a failed request).
+    """
+
+    def __init__(self, root: str | Path, responder: Callable[[Dict[str, Any]], Dict[str, Any]]):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.responder = responder
+
+    def submit(self, input_path: Path) -> str:
+        batch_id = f"batch_{uuid.uuid4().hex[:12]}"
+        batch_dir = self.root / batch_id
+        batch_dir.mkdir()
+        shutil.copy(input_path, batch_dir / "input.jsonl")
+        return batch_id
+
+    def poll(self, batch_id: str) -> str:
+        batch_dir = self.root / batch_id
+        if not (batch_dir / "output.jsonl").exists():
+            self._process(batch_dir)
+        return "completed"
+
+    def download(self, batch_id: str, output_path: Path) -> Optional[Path]:
+        result_path = self.root / batch_id / "output.jsonl"
+        if not result_path.exists():
+            return None
+        shutil.copy(result_path, output_path)
+        return output_path
+
+    def cancel(self, batch_id: str) -> None:
+        # Batches are processed on the first poll, so there is never one left to stop
+        pass
+
+    def _process(self, batch_dir: Path) -> None:
+        lines = []
+        with open(batch_dir / "input.jsonl", encoding="utf-8") as f:
+            for raw in f:
+                request = json.loads(raw)
+                try:
+                    body = self.responder(request["body"])
+                    result = {"status_code": 200, "body": body}
+                    error = None
+                except Exception as e:
+                    result = {"status_code": 500, "body": {}}
+                    error = {"message": str(e)}
+                lines.append(json.dumps({"custom_id": request["custom_id"], "response": result, "error": error}))
+        (batch_dir / "output.jsonl").write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+class BatchProvider(BaseProvider):
+    """
+    Offline provider for bulk dataset builds.
+    All requests of a run are written to one batch JSONL file, submitted through a BatchTransport,
+    polled until done and ingested back in chunk order. Requests that failed are resubmitted alone.
+    A batch that outlives the timeout is cancelled, and whatever it finished is kept.
+    """
+
+    is_batch = True
+
+    def __init__(
+        self,
+        config: Any,
+        prompt_config: Any,
+        output_dir: str = "data/processed",
+        transport: Optional[BatchTransport] = None,
+    ):
+        super().__init__(config, prompt_config)
+        # Request bodies and response parsing are exactly those of the interactive OpenAI path
+        self.openai = OpenAIProvider(config, prompt_config)
+        self.model = config.model
+
+        batch_config = config.batch
+        self.batch_dir = Path(batch_config.dir or Path(output_dir) / "batches")
+        self.poll_interval = batch_config.poll_interval_s
+        self.timeout = batch_config.timeout_h * 3600
+        self.max_rounds = batch_config.max_rounds
+        self.transport = transport or OpenAIBatchTransport(self.openai.client, batch_config.completion_window)
+
+    @staticmethod
+    def custom_id(index: int, text: str, num_questions: int) -> str:
+        """
+        Stable ID: the position keeps ordering, the hash guards against ingesting results for different inputs.
+        """
+        digest = hashlib.sha256(f"{num_questions}\x00{text}".encode("utf-8")).hexdigest()[:16]
+        return f"chunk-{index:06d}-{digest}"
+
+    def generate_qa(self, text: str, num_questions: int) -> List[DatasetItem]:
+        return self.generate_batch([(text, num_questions)])[0]
+
+    def generate_batch(self, requests: List[Tuple[str, int]]) -> List[List[DatasetItem]]:
+        ids = [self.custom_id(i, text, n) for i, (text, n) in enumerate(requests)]
+        bodies = {cid: self.openai._request_kwargs(text, n) for cid, (text, n) in zip(ids, requests)}
+        texts = {cid: text for cid, (text, _) in zip(ids, requests)}
+        results: Dict[str, List[DatasetItem]] = {}
+
+        run_dir = self.batch_dir / f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+        run_dir.mkdir(parents=True, exist_ok=True)
+
+        for round_num in range(1, self.max_rounds + 1):
+            pending = [cid for cid in ids if cid not in results]
+            if not pending:
+                break
+
+            print(f"Submitting batch round {round_num} with {len(pending)} requests...")
+            input_path = run_dir / f"round-{round_num}-input.jsonl"
+            self._write_requests(input_path, pending, bodies)
+
+            batch_id = self.transport.submit(input_path)
+            status = self._wait(batch_id)
+            if status != "completed":
+                print(f"Warning: Batch {batch_id} ended with status '{status}'.")
+
+            # Expired, cancelled and partly failed batches still have results for the requests they finished
+            output_path = self.transport.download(batch_id, run_dir / f"round-{round_num}-output.jsonl")
+            if output_path is not None:
+                results.update(self._read_results(output_path, {cid: texts[cid] for cid in pending}))
+
+        missing = len(ids) - len(results)
+        if missing:
+            print(f"Warning: {missing} batch requests still failed after {self.max_rounds} rounds.")
+
+        return [results.get(cid, []) for cid in ids]
+
+    def _write_requests(self, path: Path, pending: List[str], bodies: Dict[str, Dict[str, Any]]) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            for cid in pending:
+                line = {"custom_id": cid, "method": "POST", "url": "/v1/chat/completions", "body": bodies[cid]}
+                f.write(json.dumps(line) + "\n")
+
+    def _wait(self, batch_id: str) -> str:
+        """
+        Polls until the batch ends. A batch past the timeout is cancelled, so it does not keep running
+        (and billing) while its pending requests are resubmitted.
+        """
+        deadline = time.monotonic() + self.timeout
+        cancelled = False
+        status = self.transport.poll(batch_id)
+        while status not in TERMINAL_STATUSES:
+            if time.monotonic() > deadline:
+                if cancelled:
+                    return status
+                print(f"Warning: Batch {batch_id} timed out, cancelling it.")
+                self.transport.cancel(batch_id)
+                cancelled = True
+                deadline = time.monotonic() + CANCEL_GRACE_S
+            time.sleep(self.poll_interval)
+            status = self.transport.poll(batch_id)
+        return status
+
+    def _read_results(self, path: Path, expected: Dict[str, str]) -> Dict[str, List[DatasetItem]]:
+        """Items per custom ID, for the expected IDs (mapped to their chunk text) that succeeded."""
+        results: Dict[str, List[DatasetItem]] = {}
+        with open(path, encoding="utf-8") as f:
+            for raw in f:
+                if not raw.strip():
+                    continue
+                line = json.loads(raw)
+                cid = line.get("custom_id")
+                response = line.get("response") or {}
+                if cid not in expected or line.get("error") or response.get("status_code") != 200:
+                    continue
+
+                try:
+                    completion = ChatCompletion.model_validate(response["body"])
+                except Exception as e:
+                    print(f"Warning: Could not read batch result {cid}: {e}")
+                    continue
+
+                items = self.openai._parse_response(completion, expected[cid])
+                # An empty parse is treated like a failure so the request is retried
+                if items:
+                    results[cid] = items
+        return results
@@ -0,0 +1,283 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+from findodo.models import DatasetItem, QAPair, make_chunk_id
+from findodo.core.providing import BaseProvider
+
+# Bump when the stored payload format changes so stale entries are never returned.
+# 2: entries hold question/answer pairs only; the context is the chunk text of the key.
+CACHE_FORMAT_VERSION = 2
+
+CACHE_MODES = ("read_write", "read_only", "bypass")
+
+
+class ResponseCache:
+    """
+    Persistent, content-addressed store for LLM responses backed by a single SQLite file.
+    Entries are evicted by age (max_age_days) and by total payload size (max_size_mb, least recently used first).
+    """
+
+    def __init__(self, path: str | Path, max_size_mb: Optional[float] = None, max_age_days: Optional[float] = None):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_size_bytes = int(max_size_mb * 1024 * 1024) if max_size_mb else None
+        self.max_age_seconds = max_age_days * 86400 if max_age_days else None
+
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+
+        # The async Generator may touch the cache from worker threads, so guard the connection.
+        self._lock = threading.Lock()
+        # Parallel sweep jobs share one cache file: wait for other writers and let readers run alongside them
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, "
+            "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+        self.evict()
+
+    @classmethod
+    def from_config(cls, cache_config: Any, output_dir: str) -> "ResponseCache":
+        path = cache_config.path or Path(output_dir) / "cache" / "llm_responses.sqlite"
+        return cls(path, max_size_mb=cache_config.max_size_mb, max_age_days=cache_config.max_age_days)
+
+    @staticmethod
+    def make_key(model: str, temperature: float, system_prompt: str, text: str, num_questions: int) -> str:
+        """
+        Hashes exactly the inputs that determine a response.
+        Anything downstream of the LLM call (chunk allocation, output paths) must not leak into the key.
+        """
+        payload = json.dumps(
+            [CACHE_FORMAT_VERSION, model, temperature, system_prompt, text, num_questions],
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str, text: str) -> Optional[List[DatasetItem]]:
+        """Returns the cached items for `key`, attached to `text` (the chunk the key was made from)."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT value, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is not None and self.max_age_seconds is not None and now - row[1] > self.max_age_seconds:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.commit()
+                self.evictions += 1
+                row = None
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            self._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+
+        chunk_id = make_chunk_id(text)
+        return [DatasetItem.from_chunk(QAPair(**pair), text, chunk_id) for pair in json.loads(row[0])]
+
+    def __contains__(self, key: object) -> bool:
+        """Whether `key` has a live entry. Unlike get(), this counts no hit or miss and does not touch the entry."""
+        with self._lock:
+            row = self._conn.execute("SELECT created_at FROM responses WHERE key = ?", (key,)).fetchone()
+        return row is not None and (self.max_age_seconds is None or time.time() - row[0] <= self.max_age_seconds)
+
+    def put(self, key: str, items: List[DatasetItem]) -> None:
+        # The chunk text is already part of the key, so only the generated pairs are stored
+        value = json.dumps([item.model_dump(include={"question", "answer"}) for item in items], ensure_ascii=False)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, size, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key, value, len(value.encode("utf-8")), now, now),
+            )
+            self._conn.commit()
+            self.writes += 1
+
+        # Checking the size budget on every write would be wasteful, so do it periodically.
+        if self.writes % 100 == 0:
+            self.evict()
+
+    def evict(self) -> int:
+        """
+        Applies the age and size policies. Returns the number of removed entries.
+        """
+        removed = 0
+        with self._lock:
+            if self.max_age_seconds is not None:
+                cursor = self._conn.execute(
+                    "DELETE FROM responses WHERE created_at < ?", (time.time() - self.max_age_seconds,)
+                )
+                removed += cursor.rowcount
+
+            if self.max_size_bytes is not None:
+                total = 0
+                stale: List[str] = []
+                rows = self._conn.execute("SELECT key, size FROM responses ORDER BY accessed_at DESC")
+                for key, size in rows:
+                    total += size
+                    if total > self.max_size_bytes:
+                        stale.append(key)
+                self._conn.executemany("DELETE FROM responses WHERE key = ?", [(key,) for key in stale])
+                removed += len(stale)
+
+            self._conn.commit()
+            self.evictions += removed
+        return removed
+
+    def __len__(self) -> int:
+        with self._lock:
+            row = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()
+        return int(row[0])
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "writes": self.writes, "evictions": self.evictions}
+
+    def close(self) -> None:
+        self.evict()
+        with self._lock:
+            self._conn.close()
+
+
+class CachedProvider(BaseProvider):
+    """
+    Wraps any BaseProvider with a ResponseCache.
+
+    Modes:
+        read_write: Serve hits from the cache and store every new complete response.
+        read_only: Serve hits from the cache but never write (useful for shared caches).
+        bypass: Always call the wrapped provider.
+    """
+
+    def __init__(self, provider: BaseProvider, cache: ResponseCache, mode: str = "read_write"):
+        super().__init__(provider.config, provider.prompt_config)
+        if mode not in CACHE_MODES:
+            raise ValueError(f"Unknown cache mode '{mode}'. Expected one of {CACHE_MODES}")
+        self.provider = provider
+        self.cache = cache
+        self.mode = mode
+        self.is_batch = provider.is_batch
+
+    def __getattr__(self, name: str) -> Any:
+        # Expose the wrapped provider's attributes (model, client, ...) transparently
+        if name == "provider":
+            raise AttributeError(name)
+        return getattr(self.provider, name)
+
+    def _key(self, text: str, num_questions: int) -> str:
+        return ResponseCache.make_key(
+            model=self.config.model,
+            temperature=self.config.temperature,
+            system_prompt=self.prompt_config.system_prompt,
+            text=text,
+            num_questions=num_questions,
+        )
+
+    def is_cached(self, text: str, num_questions: int) -> bool:
+        """Whether the request would be answered from the cache."""
+        return self.mode != "bypass" and self._key(text, num_questions) in self.cache
+
+    def _lookup(self, key: str, text: str) -> Optional[List[DatasetItem]]:
+        if self.mode == "bypass":
+            return None
+        return self.cache.get(key, text)
+
+    def _store(self, key: str, items: List[DatasetItem], num_questions: int) -> None:
+        # Failures (empty lists), aborted streams and short answers would be replayed forever, so only
+        # responses with every requested item are cached
+        if self.mode == "read_write" and items and len(items) >= num_questions:
+            self.cache.put(key, items)
+
+    def generate_qa(self, text: str, num_questions: int) -> List[DatasetItem]:
+        key = self._key(text, num_questions)
+        cached = self._lookup(key, text)
+        if cached is not None:
+            return cached
+
+        items = self.provider.generate_qa(text, num_questions)
+        self._store(key, items, num_questions)
+        return items
+
+    async def agenerate_qa(self, text: str, num_questions: int) -> List[DatasetItem]:
+        key = self._key(text, num_questions)
+        cached = self._lookup(key, text)
+        if cached is not None:
+            return cached
+
+        items = await self.provider.agenerate_qa(text, num_questions)
+        self._store(key, items, num_questions)
+        return items
+
+    def stream_qa(self, text: str, num_questions: int) -> Iterator[DatasetItem]:
+        key = self._key(text, num_questions)
+        cached = self._lookup(key, text)
+        if cached is not None:
+            yield from cached
+            return
+
+        # Stored only once the stream was read to the end and delivered every item
+        items = []
+        for item in self.provider.stream_qa(text, num_questions):
+            items.append(item)
+            yield item
+        self._store(key, items, num_questions)
+
+    async def astream_qa(self, text: str, num_questions: int) -> AsyncIterator[DatasetItem]:
+        key = self._key(text, num_questions)
+        cached = self._lookup(key, text)
+        if cached is not None:
+            for item in cached:
+                yield item
+            return
+
+        items = []
+        async for item in self.provider.astream_qa(text, num_questions):
+            items.append(item)
+            yield item
+        self._store(key, items, num_questions)
+
+    def _lookup_many(self, requests: List[Tuple[str, int]]) -> Tuple[List[str], List[Optional[List[DatasetItem]]]]:
+        keys = [self._key(text, n) for text, n in requests]
+        return keys, [self._lookup(key, text) for key, (text, _) in zip(keys, requests)]
+
+    def _store_many(
+        self,
+        requests: List[Tuple[str, int]],
+        keys: List[str],
+        results: List[Optional[List[DatasetItem]]],
+        missing: List[int],
+        fresh: List[List[DatasetItem]],
+    ) -> List[List[DatasetItem]]:
+        for i, items in zip(missing, fresh):
+            results[i] = items
+            self._store(keys[i], items, requests[i][1])
+        return [items or [] for items in results]
+
+    def generate_packed(self, requests: List[Tuple[str, int]]) -> List[List[DatasetItem]]:
+        # Packed chunks are cached one by one, so later runs can hit them packed or not
+        keys, results = self._lookup_many(requests)
+        missing = [i for i, items in enumerate(results) if items is None]
+        fresh = self.provider.generate_packed([requests[i] for i in missing]) if missing else []
+        return self._store_many(requests, keys, results, missing, fresh)
+
+    async def agenerate_packed(self, requests: List[Tuple[str, int]]) -> List[List[DatasetItem]]:
+        keys, results = self._lookup_many(requests)
+        missing = [i for i, items in enumerate(results) if items is None]
+        fresh = await self.provider.agenerate_packed([requests[i] for i in missing]) if missing else []
+        return self._store_many(requests, keys, results, missing, fresh)
+
+    def generate_batch(self, requests: List[Tuple[str, int]]) -> List[List[DatasetItem]]:
+        # Only the cache misses are forwarded, so a rerun submits an (often empty) remainder
+        keys, results = self._lookup_many(requests)
+        missing = [i for i, items in enumerate(results) if items is None]
+        fresh = self.provider.generate_batch([requests[i] for i in missing]) if missing else []
+        return self._store_many(requests, keys, results, missing, fresh)
@@ -1,94 +1,495 @@
+import asyncio
 import json
-from typing import List, Any
-from openai import OpenAI, OpenAIError
-from openai.types.chat import ChatCompletionToolParam
-from pydantic import ValidationError
-from tenacity import retry, wait_random_exponential, stop_after_attempt, retry_if_exception_type
+import threading
+import time
+from typing import AsyncIterator, Dict, Iterator, List, Any, Optional, Tuple
+import tiktoken
+from openai import AsyncOpenAI, OpenAI, OpenAIError, RateLimitError
+from openai import AsyncStream, Stream
+from openai.types import CompletionUsage
+from openai.types.chat import ChatCompletion, ChatCompletionChunk, ChatCompletionMessageParam, ChatCompletionToolParam
+from tenacity import RetryCallState, retry, wait_random_exponential, stop_after_attempt, retry_if_exception_type
 
-from findodo.models import DatasetItem
+from findodo.models import DatasetItem, QAPair, make_chunk_id
+from findodo.core.metrics import METRICS
 from findodo.core.providing import BaseProvider
+from findodo.providers.ratelimit import RateLimiter, estimate_prompt_tokens, get_encoding, retry_after_seconds
+from findodo.providers.toolcall import ItemStream, PackedItem, ParseReport, parse_tool_items
+
+_exponential_wait = wait_random_exponential(multiplier=1, max=60)
+
+# Streamed requests also ask for the usage chunk that closes the stream
+STREAM_KWARGS: Dict[str, Any] = {"stream": True, "stream_options": {"include_usage": True}}
+
+
+def _wait_retry_after(retry_state: RetryCallState) -> float:
+    """
+    Honors the server's Retry-After header, falling back to jittered exponential backoff.
+    """
+    outcome = retry_state.outcome
+    error = outcome.exception() if outcome is not None else None
+    delay = retry_after_seconds(error) if error is not None else None
+    return delay if delay is not None else _exponential_wait(retry_state)
+
+
+def _give_up(retry_state: RetryCallState) -> None:
+    error = retry_state.outcome.exception() if retry_state.outcome is not None else None
+    print(f"Error calling OpenAI API after {retry_state.attempt_number} attempts: {error}")
+    METRICS.incr("llm.failed_requests")
+    return None
+
+
+def _count_retry(retry_state: RetryCallState) -> None:
+    METRICS.incr("llm.retries")
+
+
+def item_schema(packed: bool = False) -> Dict[str, Any]:
+    properties: Dict[str, Any] = {
+        "question": {"type": "string"},
+        "answer": {"type": "string"},
+    }
+    # The context is the chunk itself and is attached locally, so the model never echoes it back
+    required = ["question", "answer"]
+    if packed:
+        properties["chunk_id"] = {"type": "integer", "description": "ID of the text section the pair is from."}
+        required.append("chunk_id")
+    return {"type": "object", "properties": properties, "required": required}
+
+
+def tool_schema(packed: bool = False) -> List[ChatCompletionToolParam]:
+    """The `generate_dataset` tool the model is forced to call."""
+    return [
+        {
+            "type": "function",
+            "function": {
+                "name": "generate_dataset",
+                "description": "Generates a list of financial QA pairs.",
+                "parameters": {
+                    "type": "object",
+                    "properties": {"items": {"type": "array", "items": item_schema(packed)}},
+                    "required": ["items"],
+                },
+            },
+        }
+    ]
+
+
+def build_messages(system_prompt: str, text: str, num_questions: int) -> List[ChatCompletionMessageParam]:
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": f"Generate {num_questions} questions for this text: {text}"},
+    ]
+
+
+def build_packed_messages(system_prompt: str, requests: List[Tuple[str, int]]) -> List[ChatCompletionMessageParam]:
+    sections = "\n\n".join(
+        f'<chunk id="{chunk_id}" questions="{n}">\n{text}\n</chunk>' for chunk_id, (text, n) in enumerate(requests)
+    )
+    instruction = (
+        f"The following {len(requests)} text sections are independent. For each section, generate exactly "
+        "the number of questions in its `questions` attribute, using only that section, "
+        "and set chunk_id to the section's id."
+    )
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": f"{instruction}\n\n{sections}"},
+    ]
+
+
+def _argument_delta(chunk: ChatCompletionChunk) -> str:
+    """The generation tool's argument text carried by one streamed chunk."""
+    if not chunk.choices:
+        return ""
+    calls = chunk.choices[0].delta.tool_calls or []
+    return "".join(call.function.arguments or "" for call in calls if call.index == 0 and call.function is not None)
 
 
 class OpenAIProvider(BaseProvider):
     def __init__(self, config: Any, prompt_config: Any):
         super().__init__(config, prompt_config)
         # Logic: Use API key from config if present, otherwise rely on env var (handled by OpenAI client)
-        api_key = config.api_key.get_secret_value() if config.api_key else None
+        self._api_key = config.api_key.get_secret_value() if config.api_key else None
+        self._base_url = getattr(config, "base_url", None)
+
+        # When our own controller handles 429s, the client's built-in retries would hide them from it
+        rate_limit = getattr(config, "rate_limit", None)
+        self.rate_limiter = RateLimiter.from_config(config) if rate_limit and rate_limit.enabled else None
+        self._max_retries = 0 if self.rate_limiter else 2
+        self._completion_tokens_per_question = rate_limit.completion_tokens_per_question if rate_limit else 0
 
-        self.client = OpenAI(api_key=api_key)
+        self.client = OpenAI(api_key=self._api_key, base_url=self._base_url, max_retries=self._max_retries)
         self.model = config.model
         self.temperature = config.temperature
+        # Stream completions and hand out each item as soon as its JSON object is complete
+        self.stream = getattr(config, "stream", False)
+
+        # The async client is bound to the event loop it was created in, so it is built lazily per loop.
+        self._async_client: Optional[AsyncOpenAI] = None
+        self._async_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._encoding: Optional[tiktoken.Encoding] = None
+
+        # Running totals of parsed, dropped and repaired output over every response of this provider
+        self.parse_report = ParseReport()
+        self._report_lock = threading.Lock()
+
+    @property
+    def async_client(self) -> AsyncOpenAI:
+        """
+        Returns an AsyncOpenAI client for the running event loop.
+        The Generator calls asyncio.run() once per batch, so a client from a closed loop must not be reused.
+        """
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or self._async_loop is not loop:
+            self._async_client = AsyncOpenAI(
+                api_key=self._api_key, base_url=self._base_url, max_retries=self._max_retries
+            )
+            self._async_loop = loop
+        return self._async_client
+
+    def _tools(self, packed: bool = False) -> List[ChatCompletionToolParam]:
+        return tool_schema(packed)
 
     @property
     def _tool_schema(self) -> List[ChatCompletionToolParam]:
-        return [
-            {
-                "type": "function",
-                "function": {
-                    "name": "generate_dataset",
-                    "description": "Generates a list of financial QA pairs.",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "items": {
-                                "type": "array",
-                                "items": {
-                                    "type": "object",
-                                    "properties": {
-                                        "question": {"type": "string"},
-                                        "answer": {"type": "string"},
-                                        "context": {"type": "string"},
-                                    },
-                                    "required": ["question", "answer", "context"],
-                                },
-                            }
-                        },
-                        "required": ["items"],
-                    },
-                },
-            }
-        ]
+        return self._tools()
+
+    def _build_messages(self, text: str, num_questions: int) -> List[ChatCompletionMessageParam]:
+        return build_messages(self.prompt_config.system_prompt, text, num_questions)
+
+    def _build_packed_messages(self, requests: List[Tuple[str, int]]) -> List[ChatCompletionMessageParam]:
+        return build_packed_messages(self.prompt_config.system_prompt, requests)
+
+    def _request_kwargs(self, text: str, num_questions: int) -> Dict[str, Any]:
+        return self._completion_kwargs(self._build_messages(text, num_questions), self._tools())
+
+    def _packed_request_kwargs(self, requests: List[Tuple[str, int]]) -> Dict[str, Any]:
+        return self._completion_kwargs(self._build_packed_messages(requests), self._tools(packed=True))
+
+    def _completion_kwargs(
+        self, messages: List[ChatCompletionMessageParam], tools: List[ChatCompletionToolParam]
+    ) -> Dict[str, Any]:
+        return {
+            "model": self.model,
+            "messages": messages,
+            "tools": tools,
+            "tool_choice": {"type": "function", "function": {"name": "generate_dataset"}},
+            "temperature": self.temperature,
+        }
+
+    def _estimate_tokens(self, request: Dict[str, Any], num_questions: int) -> int:
+        """
+        Prompt tokens (counted with tiktoken) plus the completion budget reserved for the answers.
+        """
+        if self._encoding is None:
+            self._encoding = get_encoding(self.model)
+        prompt_tokens = estimate_prompt_tokens(self._encoding, request["messages"], json.dumps(request["tools"]))
+        return prompt_tokens + num_questions * self._completion_tokens_per_question
+
+    def _on_response(self, response: ChatCompletion, estimated_tokens: int, latency: float) -> None:
+        self._on_usage(response.usage, estimated_tokens, latency)
+
+    def _on_usage(self, usage: Optional[CompletionUsage], estimated_tokens: int, latency: float) -> None:
+        METRICS.incr("llm.requests")
+        METRICS.observe("llm.latency_s", latency)
+        if usage is None:
+            return
+        METRICS.incr("llm.prompt_tokens", usage.prompt_tokens)
+        METRICS.incr("llm.completion_tokens", usage.completion_tokens)
+        details = usage.prompt_tokens_details
+        if details is not None and details.cached_tokens:
+            METRICS.incr("llm.cached_prompt_tokens", details.cached_tokens)
+        if self.rate_limiter is not None:
+            self.rate_limiter.reconcile(estimated_tokens, usage.total_tokens)
+
+    def _on_rate_limited(self, error: RateLimitError) -> None:
+        METRICS.incr("llm.rate_limited")
+        # Pause every worker, not just this one, so they do not stampede the API when the window reopens
+        if self.rate_limiter is not None:
+            self.rate_limiter.pause(retry_after_seconds(error) or 1.0)
+
+    def _tool_arguments(self, response: ChatCompletion) -> Optional[str]:
+        # Content-filtered or truncated responses can come back without any choice
+        if not response.choices:
+            return None
+        message = response.choices[0].message
+        tool_call = message.tool_calls[0] if message.tool_calls else None
+        # MyPy Guard: Ensure it's a function tool
+        if tool_call is None or tool_call.type != "function":
+            return None
+        return tool_call.function.arguments
+
+    def _account(self, report: ParseReport) -> None:
+        with self._report_lock:
+            self.parse_report.merge(report)
+        for name, value in report.metrics().items():
+            if value:
+                METRICS.incr(name, value)
+
+    def _parse_response(self, response: ChatCompletion, text: str) -> List[DatasetItem]:
+        arguments = self._tool_arguments(response)
+        if arguments is None:
+            self._account(ParseReport(responses=1, invalid=1, errors=["no generation tool call"]))
+            return []
+
+        pairs, report = parse_tool_items(arguments, QAPair)
+        self._account(report)
+        chunk_id = make_chunk_id(text)
+        return [DatasetItem.from_chunk(pair, text, chunk_id) for pair in pairs]
+
+    def _parse_packed_response(
+        self, response: ChatCompletion, requests: List[Tuple[str, int]]
+    ) -> List[List[DatasetItem]]:
+        """
+        Demultiplexes a packed answer into one item list per chunk, by the chunk_id of each item.
+        Items with an unknown chunk ID are dropped; no chunk gets more items than it asked for.
+        """
+        results: List[List[DatasetItem]] = [[] for _ in requests]
+        arguments = self._tool_arguments(response)
+        if arguments is None:
+            self._account(ParseReport(responses=1, invalid=1, errors=["no generation tool call"]))
+            return results
+
+        items, report = parse_tool_items(arguments, PackedItem)
+        chunk_ids = [make_chunk_id(text) for text, _ in requests]
+        for item in items:
+            if not 0 <= item.chunk_id < len(requests):
+                report.unknown_chunk += 1
+                report.items -= 1
+                report.add_error(f"unknown chunk_id {item.chunk_id}")
+            elif len(results[item.chunk_id]) < requests[item.chunk_id][1]:
+                text = requests[item.chunk_id][0]
+                results[item.chunk_id].append(DatasetItem.from_chunk(item, text, chunk_ids[item.chunk_id]))
+        self._account(report)
+        return results
 
     @retry(
-        wait=wait_random_exponential(multiplier=1, max=60),
+        wait=_wait_retry_after,
         stop=stop_after_attempt(5),
         retry=retry_if_exception_type(OpenAIError),
+        retry_error_callback=_give_up,
+        before_sleep=_count_retry,
     )
-    def generate_qa(self, text: str, num_questions: int) -> List[DatasetItem]:
+    def _complete(self, request: Dict[str, Any], num_questions: int) -> Optional[ChatCompletion]:
+        estimated_tokens = 0
+        if self.rate_limiter is not None:
+            estimated_tokens = self._estimate_tokens(request, num_questions)
+            self.rate_limiter.acquire_blocking(estimated_tokens)
+
+        start = time.monotonic()
+        rate_limited = False
+        response: ChatCompletion
+        try:
+            response = self.client.chat.completions.create(**request)
+        except RateLimitError as e:
+            rate_limited = True
+            self._on_rate_limited(e)
+            raise
+        finally:
+            # Every attempt, failed or not, feeds the AIMD controller, as on the async path
+            latency = time.monotonic() - start
+            if self.rate_limiter is not None:
+                self.rate_limiter.record(latency, rate_limited=rate_limited)
+
+        self._on_response(response, estimated_tokens, latency)
+        return response
+
+    @retry(
+        wait=_wait_retry_after,
+        stop=stop_after_attempt(5),
+        retry=retry_if_exception_type(OpenAIError),
+        retry_error_callback=_give_up,
+        before_sleep=_count_retry,
+    )
+    async def _acomplete(self, request: Dict[str, Any], num_questions: int) -> Optional[ChatCompletion]:
+        response: ChatCompletion
+        if self.rate_limiter is None:
+            start = time.monotonic()
+            response = await self.async_client.chat.completions.create(**request)
+            self._on_response(response, 0, time.monotonic() - start)
+            return response
+
+        estimated_tokens = self._estimate_tokens(request, num_questions)
+        await self.rate_limiter.acquire(estimated_tokens)
+
+        start = time.monotonic()
+        rate_limited = False
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": self.prompt_config.system_prompt},
-                    {"role": "user", "content": f"Generate {num_questions} questions for this text: {text}"},
-                ],
-                tools=self._tool_schema,
-                tool_choice={"type": "function", "function": {"name": "generate_dataset"}},
-                temperature=self.temperature,
+            response = await self.async_client.chat.completions.create(**request)
+        except RateLimitError as e:
+            rate_limited = True
+            self._on_rate_limited(e)
+            raise
+        finally:
+            latency = time.monotonic() - start
+            await self.rate_limiter.release(latency, rate_limited=rate_limited)
+
+        self._on_response(response, estimated_tokens, latency)
+        return response
+
+    @retry(
+        wait=_wait_retry_after,
+        stop=stop_after_attempt(5),
+        retry=retry_if_exception_type(OpenAIError),
+        retry_error_callback=_give_up,
+        before_sleep=_count_retry,
+    )
+    def _open_stream(self, request: Dict[str, Any], estimated_tokens: int) -> Optional[Stream[ChatCompletionChunk]]:
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire_blocking(estimated_tokens)
+
+        start = time.monotonic()
+        try:
+            stream: Stream[ChatCompletionChunk] = self.client.chat.completions.create(**request, **STREAM_KWARGS)
+        except RateLimitError as e:
+            self._on_rate_limited(e)
+            if self.rate_limiter is not None:
+                self.rate_limiter.record(time.monotonic() - start, rate_limited=True)
+            raise
+        except BaseException:
+            if self.rate_limiter is not None:
+                self.rate_limiter.record(time.monotonic() - start)
+            raise
+        return stream
+
+    @retry(
+        wait=_wait_retry_after,
+        stop=stop_after_attempt(5),
+        retry=retry_if_exception_type(OpenAIError),
+        retry_error_callback=_give_up,
+        before_sleep=_count_retry,
+    )
+    async def _aopen_stream(
+        self, request: Dict[str, Any], estimated_tokens: int
+    ) -> Optional[AsyncStream[ChatCompletionChunk]]:
+        """Opens a streamed completion. With a rate limiter, the acquired slot is held until the caller releases it."""
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire(estimated_tokens)
+
+        start = time.monotonic()
+        try:
+            stream: AsyncStream[ChatCompletionChunk] = await self.async_client.chat.completions.create(
+                **request, **STREAM_KWARGS
             )
+        except RateLimitError as e:
+            self._on_rate_limited(e)
+            if self.rate_limiter is not None:
+                await self.rate_limiter.release(time.monotonic() - start, rate_limited=True)
+            raise
+        except BaseException:
+            if self.rate_limiter is not None:
+                await self.rate_limiter.release(time.monotonic() - start)
+            raise
+        return stream
 
-            message = response.choices[0].message
+    def _stream_items(self, request: Dict[str, Any], text: str, num_questions: int) -> Iterator[DatasetItem]:
+        """
+        Yields items from a streamed completion as each one is complete, and stops reading
+        (closing the stream) once `num_questions` items were produced.
+        """
+        estimated_tokens = self._estimate_tokens(request, num_questions) if self.rate_limiter is not None else 0
+        start = time.monotonic()
+        stream = self._open_stream(request, estimated_tokens)
+        if stream is None:
+            return
 
-            if not message.tool_calls:
-                print("Warning: Model did not call the generation tool.")
-                return []
+        parser = ItemStream(QAPair)
+        chunk_id = make_chunk_id(text)
+        usage: Optional[CompletionUsage] = None
+        emitted = 0
+        exhausted = False
+        try:
+            for chunk in stream:
+                usage = chunk.usage or usage
+                for pair in parser.feed(_argument_delta(chunk)):
+                    if emitted == 0:
+                        METRICS.observe("llm.time_to_first_item_s", time.monotonic() - start)
+                    yield DatasetItem.from_chunk(pair, text, chunk_id)
+                    emitted += 1
+                    if emitted >= num_questions:
+                        return
+            exhausted = True
+        except OpenAIError as e:
+            print(f"Error reading OpenAI stream: {e}")
+            METRICS.incr("llm.stream_errors")
+            exhausted = True
+        finally:
+            stream.close()
+            latency = time.monotonic() - start
+            if self.rate_limiter is not None:
+                self.rate_limiter.record(latency)
+            self._on_usage(usage, estimated_tokens, latency)
+            self._account(parser.finish(complete=exhausted))
 
-            tool_call = message.tool_calls[0]
-            # MyPy Guard: Ensure it's a function tool
-            if tool_call.type != "function":
-                return []
-            arguments = json.loads(tool_call.function.arguments)
+    async def _astream_items(
+        self, request: Dict[str, Any], text: str, num_questions: int
+    ) -> AsyncIterator[DatasetItem]:
+        """Async variant of _stream_items."""
+        estimated_tokens = self._estimate_tokens(request, num_questions) if self.rate_limiter is not None else 0
+        start = time.monotonic()
+        stream = await self._aopen_stream(request, estimated_tokens)
+        if stream is None:
+            return
 
-            valid_items = []
-            for item in arguments.get("items", []):
-                try:
-                    valid_items.append(DatasetItem(**item))
-                except ValidationError:
-                    print("Warning: Dropped one malformed QA pair (missing fields).")
-                    continue
+        parser = ItemStream(QAPair)
+        chunk_id = make_chunk_id(text)
+        usage: Optional[CompletionUsage] = None
+        emitted = 0
+        exhausted = False
+        try:
+            async for chunk in stream:
+                usage = chunk.usage or usage
+                for pair in parser.feed(_argument_delta(chunk)):
+                    if emitted == 0:
+                        METRICS.observe("llm.time_to_first_item_s", time.monotonic() - start)
+                    yield DatasetItem.from_chunk(pair, text, chunk_id)
+                    emitted += 1
+                    if emitted >= num_questions:
+                        return
+            exhausted = True
+        except OpenAIError as e:
+            print(f"Error reading OpenAI stream: {e}")
+            METRICS.incr("llm.stream_errors")
+            exhausted = True
+        finally:
+            await stream.close()
+            latency = time.monotonic() - start
+            if self.rate_limiter is not None:
+                await self.rate_limiter.release(latency)
+            self._on_usage(usage, estimated_tokens, latency)
+            self._account(parser.finish(complete=exhausted))
 
-            return valid_items
+    def stream_qa(self, text: str, num_questions: int) -> Iterator[DatasetItem]:
+        if not self.stream:
+            yield from self.generate_qa(text, num_questions)
+            return
+        yield from self._stream_items(self._request_kwargs(text, num_questions), text, num_questions)
 
-        except Exception as e:
-            print(f"Error parsing OpenAI response: {e}")
-            return []
+    async def astream_qa(self, text: str, num_questions: int) -> AsyncIterator[DatasetItem]:
+        if not self.stream:
+            for item in await self.agenerate_qa(text, num_questions):
+                yield item
+            return
+        async for item in self._astream_items(self._request_kwargs(text, num_questions), text, num_questions):
+            yield item
+
+    def generate_qa(self, text: str, num_questions: int) -> List[DatasetItem]:
+        if self.stream:
+            return list(self.stream_qa(text, num_questions))
+        response = self._complete(self._request_kwargs(text, num_questions), num_questions)
+        return self._parse_response(response, text) if response is not None else []
+
+    async def agenerate_qa(self, text: str, num_questions: int) -> List[DatasetItem]:
+        if self.stream:
+            return [item async for item in self.astream_qa(text, num_questions)]
+        response = await self._acomplete(self._request_kwargs(text, num_questions), num_questions)
+        return self._parse_response(response, text) if response is not None else []
+
+    def generate_packed(self, requests: List[Tuple[str, int]]) -> List[List[DatasetItem]]:
+        num_questions = sum(n for _, n in requests)
+        response = self._complete(self._packed_request_kwargs(requests), num_questions)
+        return self._parse_packed_response(response, requests) if response is not None else [[] for _ in requests]
+
+    async def agenerate_packed(self, requests: List[Tuple[str, int]]) -> List[List[DatasetItem]]:
+        num_questions = sum(n for _, n in requests)
+        response = await self._acomplete(self._packed_request_kwargs(requests), num_questions)
+        return self._parse_packed_response(response, requests) if response is not None else [[] for _ in requests]
@@ -0,0 +1,210 @@
+import asyncio
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import tiktoken
+
+
+class TokenBucket:
+    """
+    Reservation-based token bucket.
+    Callers reserve capacity up front and are told how long to wait, so concurrent workers queue
+    behind each other instead of all retrying at once.
+    """
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.available = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.available = min(self.capacity, self.available + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, amount: float, now: float) -> float:
+        """
+        Consumes `amount` (capped at the bucket size) and returns the seconds to wait before using it.
+        """
+        self._refill(now)
+        self.available -= min(amount, self.capacity)
+        return 0.0 if self.available >= 0 else -self.available / self.rate
+
+    def adjust(self, delta: float) -> None:
+        """Gives back (positive) or charges (negative) capacity once the real usage is known."""
+        self.available = min(self.capacity, self.available + delta)
+
+
+class RateLimiter:
+    """
+    Shared rate-limit controller for one provider.
+
+    - Token buckets for requests/min and tokens/min.
+    - A global pause honoring `Retry-After` so all workers back off together.
+    - AIMD in-flight concurrency: multiplicative decrease on 429s (or slow responses), additive increase on success.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        max_concurrency: int = 1,
+        min_concurrency: int = 1,
+        target_latency: Optional[float] = None,
+        decrease_factor: float = 0.5,
+    ):
+        self.request_bucket = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.token_bucket = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min(min_concurrency, max_concurrency)
+        self.target_latency = target_latency
+        self.decrease_factor = decrease_factor
+
+        self.limit = float(max_concurrency)
+        self.in_flight = 0
+        self.rate_limited = 0
+        self._paused_until = 0.0
+        self._last_decrease = 0.0
+
+        self._lock = threading.Lock()
+        # asyncio primitives are bound to one event loop, so the condition is rebuilt per loop
+        self._condition: Optional[asyncio.Condition] = None
+        self._condition_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @classmethod
+    def from_config(cls, config: Any) -> "RateLimiter":
+        rate_limit = config.rate_limit
+        return cls(
+            requests_per_minute=rate_limit.requests_per_minute,
+            tokens_per_minute=rate_limit.tokens_per_minute,
+            max_concurrency=config.max_concurrency,
+            min_concurrency=rate_limit.min_concurrency,
+            target_latency=rate_limit.target_latency_s,
+        )
+
+    @property
+    def concurrency(self) -> int:
+        return max(self.min_concurrency, int(self.limit))
+
+    def _reserve(self, tokens: int) -> float:
+        """Books one request and `tokens` tokens. Returns the delay before the request may be sent."""
+        with self._lock:
+            now = time.monotonic()
+            delay = max(0.0, self._paused_until - now)
+            if self.request_bucket is not None:
+                delay = max(delay, self.request_bucket.reserve(1, now))
+            if self.token_bucket is not None:
+                delay = max(delay, self.token_bucket.reserve(tokens, now))
+            return delay
+
+    def _get_condition(self) -> asyncio.Condition:
+        loop = asyncio.get_running_loop()
+        if self._condition is None or self._condition_loop is not loop:
+            self._condition = asyncio.Condition()
+            self._condition_loop = loop
+        return self._condition
+
+    async def acquire(self, tokens: int) -> None:
+        """Waits for a concurrency slot and for enough request/token budget."""
+        condition = self._get_condition()
+        async with condition:
+            await condition.wait_for(lambda: self.in_flight < self.concurrency)
+            self.in_flight += 1
+
+        delay = self._reserve(tokens)
+        if delay > 0:
+            try:
+                await asyncio.sleep(delay)
+            except BaseException:
+                # A caller cancelled while waiting never reaches its release(), so the slot is given back here
+                self.in_flight -= 1
+                async with condition:
+                    condition.notify_all()
+                raise
+
+    async def release(self, latency: Optional[float] = None, rate_limited: bool = False) -> None:
+        self.record(latency, rate_limited)
+        condition = self._get_condition()
+        async with condition:
+            self.in_flight -= 1
+            condition.notify_all()
+
+    def acquire_blocking(self, tokens: int) -> None:
+        """Synchronous variant for the sequential path (no concurrency slot needed)."""
+        delay = self._reserve(tokens)
+        if delay > 0:
+            time.sleep(delay)
+
+    def record(self, latency: Optional[float] = None, rate_limited: bool = False) -> None:
+        """Feeds the outcome of one request into the AIMD controller."""
+        with self._lock:
+            now = time.monotonic()
+            too_slow = self.target_latency is not None and latency is not None and latency > self.target_latency
+
+            if rate_limited or too_slow:
+                if rate_limited:
+                    self.rate_limited += 1
+                # A burst of failures from one window only counts once
+                if now - self._last_decrease > 1.0:
+                    factor = self.decrease_factor if rate_limited else 0.9
+                    self.limit = max(float(self.min_concurrency), self.limit * factor)
+                    self._last_decrease = now
+            else:
+                self.limit = min(float(self.max_concurrency), self.limit + 1.0 / max(self.limit, 1.0))
+
+    def pause(self, seconds: float) -> None:
+        """Blocks every worker until `seconds` from now (from a Retry-After header)."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def reconcile(self, estimated_tokens: int, actual_tokens: int) -> None:
+        """Corrects the token bucket with the usage reported by the API."""
+        if self.token_bucket is not None:
+            with self._lock:
+                self.token_bucket.adjust(estimated_tokens - actual_tokens)
+
+    def stats(self) -> Dict[str, float]:
+        return {"concurrency_limit": self.limit, "rate_limited": self.rate_limited}
+
+
+def get_encoding(model: str) -> tiktoken.Encoding:
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("cl100k_base")
+
+
+def estimate_prompt_tokens(encoding: tiktoken.Encoding, messages: List[Dict[str, Any]], tools_json: str = "") -> int:
+    """
+    Counts prompt tokens the way the chat API bills them (content plus a few tokens of framing per message).
+    """
+    tokens = 3  # every reply is primed with <|start|>assistant<|message|>
+    for message in messages:
+        tokens += 4 + len(encoding.encode(str(message.get("content", ""))))
+    if tools_json:
+        tokens += len(encoding.encode(tools_json))
+    return tokens
+
+
+def retry_after_seconds(error: BaseException) -> Optional[float]:
+    """Extracts the Retry-After delay from an OpenAI APIStatusError, if the server sent one."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms:
+        try:
+            return float(retry_after_ms) / 1000.0
+        except ValueError:
+            pass
+
+    retry_after = headers.get("retry-after")
+    if retry_after:
+        try:
+            return float(retry_after)
+        except ValueError:
+            return None
+    return None
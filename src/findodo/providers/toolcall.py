@@ -0,0 +1,214 @@
+import re
+from functools import lru_cache
+from typing import Any, Generic, List, Optional, Tuple, Type, TypeVar
+
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError
+from pydantic_core import from_json
+
+from findodo.models import QAPair
+
+ItemT = TypeVar("ItemT", bound=BaseModel)
+
+# Characters that change the JSON nesting or string state
+STRUCTURAL_PATTERN = re.compile(r'[{}\[\]"\\]')
+# Container nesting just inside the items array of {"items": [...]}
+ITEMS_LEVEL = ["{", "["]
+
+# Validation errors kept per report, so a response full of bad items cannot grow it unboundedly
+MAX_ERRORS = 10
+
+
+class ToolPayload(BaseModel, Generic[ItemT]):
+    """Arguments of the generation tool call."""
+
+    items: List[ItemT]
+
+
+class PackedItem(QAPair):
+    """An item of a packed answer, tagged with the ID of the prompt section it belongs to."""
+
+    chunk_id: int
+
+
+class ParseReport(BaseModel):
+    """
+    What happened while reading tool-call output.
+
+    malformed: items that failed validation (missing or mistyped fields).
+    truncated: the arguments were cut off and repaired; `incomplete` counts the partial trailing items dropped.
+    invalid:   responses from which nothing could be read (no tool call, unparseable JSON, no items array).
+    """
+
+    responses: int = 0
+    items: int = 0
+    malformed: int = 0
+    incomplete: int = 0
+    unknown_chunk: int = 0
+    truncated: int = 0
+    invalid: int = 0
+    errors: List[str] = Field(default_factory=list)
+
+    def add_error(self, message: str) -> None:
+        if len(self.errors) < MAX_ERRORS:
+            self.errors.append(message)
+
+    def merge(self, other: "ParseReport") -> None:
+        for name in ("responses", "items", "malformed", "incomplete", "unknown_chunk", "truncated", "invalid"):
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+        for message in other.errors:
+            self.add_error(message)
+
+    def metrics(self) -> dict[str, int]:
+        return {
+            "items.parsed": self.items,
+            "items.dropped_malformed": self.malformed,
+            "items.dropped_incomplete": self.incomplete,
+            "items.dropped_unknown_chunk": self.unknown_chunk,
+            "llm.truncated_responses": self.truncated,
+            "llm.unparseable_responses": self.invalid,
+        }
+
+
+@lru_cache(maxsize=None)
+def _adapters(item_type: Type[ItemT]) -> Tuple[TypeAdapter[ToolPayload[ItemT]], TypeAdapter[ItemT]]:
+    return TypeAdapter(ToolPayload[item_type]), TypeAdapter(item_type)  # type: ignore[valid-type]
+
+
+def _describe(error: ValidationError, index: int) -> str:
+    first = error.errors()[0]
+    location = ".".join(str(part) for part in first["loc"])
+    return f"items[{index}].{location}: {first['msg']}" if location else f"items[{index}]: {first['msg']}"
+
+
+def parse_tool_items(arguments: str | bytes, item_type: Type[ItemT]) -> Tuple[List[ItemT], ParseReport]:
+    """
+    Validates the tool-call arguments `{"items": [...]}` into `item_type` instances.
+
+    The whole payload is validated in one validate_json call. Only if that fails is the JSON parsed
+    again, item by item, keeping the valid items; truncated JSON (e.g. a response cut off at max_tokens)
+    is repaired by closing it after the last complete value, and the partial trailing item is dropped.
+    """
+    payload_adapter, item_adapter = _adapters(item_type)
+    report = ParseReport(responses=1)
+    try:
+        items = payload_adapter.validate_json(arguments).items
+        report.items = len(items)
+        return items, report
+    except ValidationError:
+        pass
+
+    truncated = False
+    try:
+        data: Any = from_json(arguments)
+    except ValueError:
+        try:
+            data = from_json(arguments, allow_partial=True)
+            truncated = True
+        except ValueError as e:
+            report.invalid = 1
+            report.add_error(f"invalid JSON: {e}")
+            return [], report
+
+    raw_items = data.get("items") if isinstance(data, dict) else None
+    if not isinstance(raw_items, list):
+        report.invalid = 1
+        report.add_error("arguments have no items array")
+        return [], report
+
+    report.truncated = int(truncated)
+    valid: List[ItemT] = []
+    for index, raw in enumerate(raw_items):
+        try:
+            valid.append(item_adapter.validate_python(raw))
+        except ValidationError as e:
+            if truncated and index == len(raw_items) - 1:
+                report.incomplete += 1
+            else:
+                report.malformed += 1
+                report.add_error(_describe(e, index))
+    report.items = len(valid)
+    return valid, report
+
+
+class ItemStream(Generic[ItemT]):
+    """
+    Incremental parser over streamed tool-call arguments `{"items": [...]}`.
+
+    `feed` takes the next argument delta and returns the items whose objects closed in it, validated one by one,
+    so each item is available as soon as the model finishes writing it. Only the text of the item in progress
+    is kept; the scan visits structural characters only (braces, brackets, quotes, backslashes).
+    """
+
+    def __init__(self, item_type: Type[ItemT]):
+        self._adapter: TypeAdapter[ItemT] = _adapters(item_type)[1]
+        self._stack: List[str] = []
+        self._in_string = False
+        # Position (in the pending text) of a character escaped by a backslash
+        self._escaped = -1
+        # Text of the item in progress, from its opening brace
+        self._pending = ""
+        self._in_item = False
+        self._saw_items = False
+        self.index = 0
+        self.report = ParseReport(responses=1)
+
+    def feed(self, delta: str) -> List[ItemT]:
+        text = self._pending + delta
+        start: Optional[int] = 0 if self._in_item else None
+        ready: List[ItemT] = []
+
+        for match in STRUCTURAL_PATTERN.finditer(text, len(self._pending)):
+            pos = match.start()
+            if pos == self._escaped:
+                continue
+            char = match.group()
+            if self._in_string:
+                if char == "\\":
+                    self._escaped = pos + 1
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                if char == "{" and self._stack == ITEMS_LEVEL:
+                    start = pos
+                self._stack.append(char)
+                self._saw_items = self._saw_items or self._stack == ITEMS_LEVEL
+            elif self._stack:
+                self._stack.pop()
+                if char == "}" and start is not None and self._stack == ITEMS_LEVEL:
+                    item = self._validate(text[start : pos + 1])
+                    if item is not None:
+                        ready.append(item)
+                    start = None
+
+        cut = len(text) if start is None else start
+        self._pending = text[cut:]
+        self._escaped -= cut
+        self._in_item = start is not None
+        return ready
+
+    def _validate(self, raw: str) -> Optional[ItemT]:
+        index = self.index
+        self.index += 1
+        try:
+            item = self._adapter.validate_json(raw)
+        except ValidationError as e:
+            self.report.malformed += 1
+            self.report.add_error(_describe(e, index))
+            return None
+        self.report.items += 1
+        return item
+
+    def finish(self, complete: bool = True) -> ParseReport:
+        """
+        Closes the stream and returns its report. With `complete`, an item still open means the
+        response was cut off; pass complete=False when the consumer stopped reading on purpose.
+        """
+        if complete and self._in_item:
+            self.report.truncated = 1
+            self.report.incomplete += 1
+        elif complete and not self._saw_items:
+            self.report.invalid = 1
+            self.report.add_error("arguments have no items array")
+        return self.report
@@ -0,0 +1,90 @@
+import importlib
+import importlib.util
+import sys
+from importlib.metadata import entry_points
+from types import ModuleType
+from typing import TYPE_CHECKING, Any, Dict, List, Type
+
+if TYPE_CHECKING:
+    from findodo.config import Config
+    from findodo.core.parsing import BaseParser
+    from findodo.core.providing import BaseProvider
+
+# Built-in components as "module:attribute". Nothing is imported until a name is first used.
+PARSERS: Dict[str, str] = {
+    "sec": "findodo.parsers.sec:SECParser",
+    "pdf": "findodo.parsers.pdf:PDFParser",
+    "docling": "findodo.parsers.docling:DoclingParser",
+    "hybrid": "findodo.parsers.hybrid:HybridParser",
+}
+PROVIDERS: Dict[str, str] = {
+    "openai": "findodo.providers.openai:OpenAIProvider",
+    "openai_batch": "findodo.providers.batch:BatchProvider",
+}
+
+# Third-party packages can add components through these entry point groups, e.g. in pyproject.toml:
+#   [tool.poetry.plugins."findodo.parsers"]
+#   xbrl = "my_package.parsers:XBRLParser"
+PARSER_ENTRY_POINTS = "findodo.parsers"
+PROVIDER_ENTRY_POINTS = "findodo.providers"
+
+
+def _load(kind: str, name: str, builtins: Dict[str, str], group: str) -> Any:
+    target = builtins.get(name)
+    if target is None:
+        matches = entry_points(group=group, name=name)
+        if not matches:
+            available = sorted(set(builtins) | {ep.name for ep in entry_points(group=group)})
+            raise ValueError(f"Unknown {kind} '{name}'. Available: {available}")
+        return next(iter(matches)).load()
+
+    module_name, _, attribute = target.partition(":")
+    return getattr(importlib.import_module(module_name), attribute)
+
+
+def lazy_import(name: str) -> ModuleType:
+    """
+    Returns module `name` without executing it yet; the real import runs on first attribute access.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None or spec.loader is None:
+        raise ModuleNotFoundError(f"No module named '{name}'", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+def available_parsers() -> List[str]:
+    return sorted(set(PARSERS) | {ep.name for ep in entry_points(group=PARSER_ENTRY_POINTS)})
+
+
+def available_providers() -> List[str]:
+    return sorted(set(PROVIDERS) | {ep.name for ep in entry_points(group=PROVIDER_ENTRY_POINTS)})
+
+
+def load_parser(name: str) -> "Type[BaseParser]":
+    parser_class: Type[BaseParser] = _load("parser", name, PARSERS, PARSER_ENTRY_POINTS)
+    return parser_class
+
+
+def load_provider(name: str) -> "Type[BaseProvider]":
+    provider_class: Type[BaseProvider] = _load("provider", name, PROVIDERS, PROVIDER_ENTRY_POINTS)
+    return provider_class
+
+
+def build_parser(name: str, config: "Config") -> "BaseParser":
+    """Imports and builds the parser `name` with the run's parser and chunker config."""
+    return load_parser(name)(config.parser, config.chunker)  # type: ignore[call-arg]
+
+
+def build_provider(config: "Config") -> "BaseProvider":
+    """Imports and builds the configured provider. Batch providers also get the output directory for their files."""
+    provider_class = load_provider(config.provider.name)
+    if provider_class.is_batch:
+        return provider_class(config.provider, config.prompt, output_dir=config.output_dir)  # type: ignore[call-arg]
+    return provider_class(config.provider, config.prompt)
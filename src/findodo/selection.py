@@ -0,0 +1,73 @@
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+from findodo.core.hashing import NGRAM_BASE, mix64
+
+
+def chunk_vectors(token_lists: Sequence[Sequence[int]], num_features: int = 256, seed: int = 0) -> np.ndarray:
+    """
+    L2-normalized TF-IDF vectors of the chunks' token unigrams and bigrams, hashed into `num_features` buckets.
+
+    Works on the tokenizer's token IDs, so no text is re-tokenized: all n-grams of all chunks are hashed and
+    counted in a handful of NumPy passes. Returns a (len(token_lists), num_features) float32 array.
+    """
+    n = len(token_lists)
+    lengths = np.fromiter((len(tokens) for tokens in token_lists), dtype=np.int64, count=n)
+    if not lengths.sum():
+        return np.zeros((n, num_features), dtype=np.float32)
+    flat = np.concatenate([np.asarray(tokens, dtype=np.uint64) for tokens in token_lists if len(tokens)])
+    owners = np.repeat(np.arange(n), lengths)
+
+    salt = mix64(np.array([seed], dtype=np.uint64))
+    same_chunk = owners[:-1] == owners[1:]
+    with np.errstate(over="ignore"):
+        unigrams = mix64(flat ^ salt)
+        bigrams = mix64((flat[:-1][same_chunk] * NGRAM_BASE + flat[1:][same_chunk]) ^ ~salt)
+    hashes = np.concatenate([unigrams, bigrams])
+    owners = np.concatenate([owners, owners[:-1][same_chunk]])
+
+    buckets = (hashes % np.uint64(num_features)).astype(np.int64)
+    counts = np.bincount(owners * num_features + buckets, minlength=n * num_features).reshape(n, num_features)
+    document_frequency = (counts > 0).sum(axis=0)
+    idf = np.log((1 + n) / (1 + document_frequency)) + 1
+    vectors = (np.log1p(counts) * idf).astype(np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    normalized: np.ndarray = vectors / np.where(norms > 0, norms, 1)
+    return normalized
+
+
+def farthest_point_sample(vectors: np.ndarray, k: int, seed: int = 0) -> Tuple[List[int], np.ndarray]:
+    """
+    Picks `k` rows of `vectors` (unit vectors) that cover them as evenly as possible.
+
+    Starts from the row closest to the centroid (the most typical chunk), then repeatedly adds the row
+    farthest (cosine distance) from everything picked so far. Each step is one matrix-vector product.
+    The seed shuffles the scan order, which only decides between rows at equal distance.
+
+    Returns the picked row indices in pick order, and for every row the position (in that list) of the
+    picked row closest to it.
+    """
+    n = len(vectors)
+    k = min(k, n)
+    order = np.random.default_rng(seed).permutation(n)
+    shuffled = vectors[order]
+
+    current = int(np.argmax(shuffled @ shuffled.mean(axis=0)))
+    picked = [current]
+    distance = 1.0 - shuffled @ shuffled[current]
+    assignment = np.zeros(n, dtype=np.int64)
+    distance[current] = -1.0
+    for position in range(1, k):
+        current = int(np.argmax(distance))
+        picked.append(current)
+        candidate = 1.0 - shuffled @ shuffled[current]
+        closer = candidate < distance
+        assignment[closer] = position
+        distance[closer] = candidate[closer]
+        distance[current] = -1.0
+        assignment[current] = position
+
+    unshuffled = np.empty(n, dtype=np.int64)
+    unshuffled[order] = assignment
+    return [int(order[i]) for i in picked], unshuffled
@@ -0,0 +1,27 @@
+from findodo.storage.chunks import ChunkArtifact, ChunkStore
+from findodo.storage.compact import CompactDataset, CompactJsonlWriter, CompactParquetWriter, load_compact
+from findodo.storage.partitioned import (
+    PartitionedParquetWriter,
+    iter_partitioned,
+    open_partitioned,
+    read_partitioned,
+)
+from findodo.storage.writers import DatasetWriter, JsonlWriter, ParquetWriter, open_writer, read_jsonl
+
+__all__ = [
+    "ChunkArtifact",
+    "ChunkStore",
+    "CompactDataset",
+    "CompactJsonlWriter",
+    "CompactParquetWriter",
+    "DatasetWriter",
+    "JsonlWriter",
+    "ParquetWriter",
+    "PartitionedParquetWriter",
+    "iter_partitioned",
+    "load_compact",
+    "open_partitioned",
+    "open_writer",
+    "read_jsonl",
+    "read_partitioned",
+]
@@ -0,0 +1,199 @@
+import json
+import mmap
+import os
+import shutil
+import time
+import uuid
+from pathlib import Path
+from types import TracebackType
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Type, overload
+
+import numpy as np
+
+from findodo.core.caching import DiskCache
+
+# Parser settings that change how fast chunks are produced, never which chunks
+RUNTIME_PARSER_KEYS = {
+    "page_workers",
+    "pages_per_task",
+    "cache_enabled",
+    "cache_dir",
+    "cache_ttl_days",
+    "cache_max_mb",
+    "worker_address",
+    "fetch_workers",
+    "parse_workers",
+    "edgar_requests_per_second",
+}
+
+
+class ChunkArtifact(Sequence[str]):
+    """
+    Read-only, memory-mapped view of a stored chunk list. Chunks are decoded only when accessed.
+    Holds a file handle and a mapping until closed; use it as a context manager.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.meta: Dict[str, Any] = json.loads((path / ChunkStore.META_FILE).read_text(encoding="utf-8"))
+        self._offsets = np.load(path / ChunkStore.OFFSETS_FILE, mmap_mode="r")
+        self._file = open(path / ChunkStore.DATA_FILE, "rb")
+        # mmap cannot map an empty file
+        size = os.fstat(self._file.fileno()).st_size
+        self._data: bytes | mmap.mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    @overload
+    def __getitem__(self, index: int) -> str: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[str]: ...
+
+    def __getitem__(self, index: int | slice) -> str | List[str]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        start, end = int(self._offsets[index]), int(self._offsets[index + 1])
+        return self._data[start:end].decode("utf-8")
+
+    def __iter__(self) -> Iterator[str]:
+        return (self[i] for i in range(len(self)))
+
+    @property
+    def closed(self) -> bool:
+        return self._file.closed
+
+    def close(self) -> None:
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        self._file.close()
+        # Drops the offsets mapping too; a closed artifact is empty
+        self._offsets = np.zeros(1, dtype=np.int64)
+
+    def __enter__(self) -> "ChunkArtifact":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+
+class ChunkStore:
+    """
+    Shared store of parsed chunk lists, keyed by everything that determines them
+    (parser config, chunker config and the parsed target).
+
+    Each entry is a directory:
+
+        chunks.bin    All chunks as concatenated UTF-8.
+        offsets.npy   int64 byte offsets (n + 1), so chunks are sliced out of the memory-mapped data.
+        meta.json     Key inputs and chunk count.
+
+    Entries are written to a temporary directory and renamed into place. A lock file makes concurrent
+    sweep jobs wait for the first one to finish parsing instead of parsing the same target again.
+    """
+
+    DATA_FILE = "chunks.bin"
+    OFFSETS_FILE = "offsets.npy"
+    META_FILE = "meta.json"
+
+    def __init__(self, root: str | Path, lock_timeout_s: float = 3600.0, poll_interval_s: float = 0.5):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.lock_timeout_s = lock_timeout_s
+        self.poll_interval_s = poll_interval_s
+
+    @staticmethod
+    def make_key(parser_config: Any, chunker_config: Any, **target: Any) -> Dict[str, Any]:
+        """The inputs that identify a chunk list; hash them with DiskCache.make_key."""
+        parser = {k: v for k, v in parser_config.model_dump(mode="json").items() if k not in RUNTIME_PARSER_KEYS}
+        return {"parser": parser, "chunker": chunker_config.model_dump(mode="json"), "target": target}
+
+    def _path(self, key: str) -> Path:
+        return self.root / key
+
+    def __contains__(self, key: str) -> bool:
+        return (self._path(key) / self.META_FILE).exists()
+
+    def load(self, key: str) -> Optional[ChunkArtifact]:
+        return ChunkArtifact(self._path(key)) if key in self else None
+
+    def save(self, key: str, chunks: Sequence[str], inputs: Optional[Dict[str, Any]] = None) -> ChunkArtifact:
+        tmp_dir = self.root / f".{key}.{uuid.uuid4().hex}.tmp"
+        tmp_dir.mkdir()
+        offsets = np.zeros(len(chunks) + 1, dtype=np.int64)
+        with open(tmp_dir / self.DATA_FILE, "wb") as f:
+            for i, chunk in enumerate(chunks):
+                offsets[i + 1] = offsets[i] + f.write(chunk.encode("utf-8"))
+        np.save(tmp_dir / self.OFFSETS_FILE, offsets)
+        meta = {"key": key, "num_chunks": len(chunks), "inputs": inputs or {}, "created_at": time.time()}
+        (tmp_dir / self.META_FILE).write_text(json.dumps(meta, indent=2), encoding="utf-8")
+
+        try:
+            os.replace(tmp_dir, self._path(key))
+        except OSError:
+            # Another process stored the same entry first; keep theirs
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+        return ChunkArtifact(self._path(key))
+
+    def get_or_create(self, inputs: Dict[str, Any], parse: Callable[[], Sequence[str]]) -> ChunkArtifact:
+        """
+        Returns the stored chunks for `inputs`, running `parse` only if no process has stored them yet.
+        """
+        key = DiskCache.make_key(inputs)
+        artifact = self.load(key)
+        if artifact is not None:
+            print(f"Loaded {len(artifact)} chunks from the chunk store ({key[:12]})")
+            return artifact
+
+        with self._lock(key):
+            # Someone may have finished parsing while we waited for the lock
+            artifact = self.load(key)
+            if artifact is None:
+                artifact = self.save(key, parse(), inputs)
+                print(f"Stored {len(artifact)} chunks in the chunk store ({key[:12]})")
+        return artifact
+
+    def _lock(self, key: str) -> "_LockFile":
+        return _LockFile(self.root / f"{key}.lock", self.lock_timeout_s, self.poll_interval_s)
+
+
+class _LockFile:
+    """
+    Cross-process lock based on exclusive file creation. A lock older than the timeout is treated as stale
+    (its owner crashed) and taken over.
+    """
+
+    def __init__(self, path: Path, timeout_s: float, poll_interval_s: float):
+        self.path = path
+        self.timeout_s = timeout_s
+        self.poll_interval_s = poll_interval_s
+
+    def __enter__(self) -> "_LockFile":
+        while True:
+            try:
+                fd = os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                try:
+                    if time.time() - self.path.stat().st_mtime > self.timeout_s:
+                        self.path.unlink(missing_ok=True)
+                        continue
+                except FileNotFoundError:
+                    continue
+                time.sleep(self.poll_interval_s)
+                continue
+            os.write(fd, str(os.getpid()).encode())
+            os.close(fd)
+            return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.path.unlink(missing_ok=True)
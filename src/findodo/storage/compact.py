@@ -0,0 +1,210 @@
+import json
+from abc import abstractmethod
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Type
+
+from pydantic import ValidationError
+
+from findodo.models import ChunkRecord, Dataset, DatasetItem, DatasetPartition, QARow, make_chunk_id
+from findodo.storage.writers import DatasetWriter
+
+CHUNKS_TABLE = "chunks"
+QA_TABLE = "qa"
+
+
+class CompactWriter(DatasetWriter):
+    """
+    Normalized dataset layout: `path` is a directory holding two tables,
+
+        chunks.<ext>  chunk_id, source, index, text   one row per chunk that produced items
+        qa.<ext>      question, answer, chunk_id      one row per item, referencing its chunk
+
+    so a chunk's text is stored once instead of once per question.
+    """
+
+    extension = ""
+
+    def __init__(self, path: str | Path):
+        super().__init__(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._written: set[str] = set()
+        self._positions: Dict[str, int] = {}
+        self.num_chunks = 0
+
+    def table_path(self, table: str) -> Path:
+        return self.path / f"{table}.{self.extension}"
+
+    def begin_target(
+        self, source: Optional[str], texts: Sequence[str] = (), partition: Optional[DatasetPartition] = None
+    ) -> None:
+        super().begin_target(source, texts, partition)
+        self._positions = {}
+        for index, text in enumerate(texts):
+            self._positions.setdefault(make_chunk_id(text), index)
+
+    def write(self, item: DatasetItem) -> None:
+        chunk_id = item.chunk_id or make_chunk_id(item.context)
+        if chunk_id not in self._written:
+            self._written.add(chunk_id)
+            index = self._positions.get(chunk_id)
+            chunk = ChunkRecord(chunk_id=chunk_id, text=item.context, source=self.source, index=index)
+            self._write_row(CHUNKS_TABLE, chunk.model_dump())
+            self.num_chunks += 1
+        self._write_row(QA_TABLE, {"question": item.question, "answer": item.answer, "chunk_id": chunk_id})
+        self.count += 1
+
+    @abstractmethod
+    def _write_row(self, table: str, row: Dict[str, Any]) -> None:
+        pass
+
+
+class CompactJsonlWriter(CompactWriter):
+    """Both tables as JSON lines, flushed after every item."""
+
+    extension = "jsonl"
+
+    def __init__(self, path: str | Path):
+        super().__init__(path)
+        self._files = {table: open(self.table_path(table), "w", encoding="utf-8") for table in (CHUNKS_TABLE, QA_TABLE)}
+
+    def _write_row(self, table: str, row: Dict[str, Any]) -> None:
+        f = self._files[table]
+        f.write(json.dumps(row, ensure_ascii=False) + "\n")
+        # A QA row is only flushed after its chunk row, so a crash never leaves a dangling reference
+        if table == QA_TABLE:
+            self._files[CHUNKS_TABLE].flush()
+            f.flush()
+
+    def close(self) -> None:
+        for f in self._files.values():
+            if not f.closed:
+                f.close()
+
+
+class CompactParquetWriter(CompactWriter):
+    """
+    Both tables as Parquet files, buffered into row groups of `row_group_size`.
+    Requires the optional `pyarrow` dependency.
+    """
+
+    extension = "parquet"
+
+    def __init__(self, path: str | Path, row_group_size: int = 1000):
+        super().__init__(path)
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("Parquet output requires pyarrow: pip install 'findodo[parquet]'") from e
+
+        self._pa = pa
+        self._schemas = {
+            CHUNKS_TABLE: pa.schema(
+                [("chunk_id", pa.string()), ("text", pa.string()), ("source", pa.string()), ("index", pa.int64())]
+            ),
+            QA_TABLE: pa.schema([("question", pa.string()), ("answer", pa.string()), ("chunk_id", pa.string())]),
+        }
+        self._writers: Dict[str, Any] = {
+            table: pq.ParquetWriter(str(self.table_path(table)), schema, compression="zstd")
+            for table, schema in self._schemas.items()
+        }
+        self.row_group_size = row_group_size
+        self._buffers: Dict[str, List[Dict[str, Any]]] = {table: [] for table in self._schemas}
+
+    def _write_row(self, table: str, row: Dict[str, Any]) -> None:
+        self._buffers[table].append(row)
+        if len(self._buffers[table]) >= self.row_group_size:
+            self.flush()
+
+    def flush(self) -> None:
+        for table, rows in self._buffers.items():
+            if rows:
+                self._writers[table].write_table(self._pa.Table.from_pylist(rows, schema=self._schemas[table]))
+                self._buffers[table] = []
+
+    def close(self) -> None:
+        if self._writers:
+            self.flush()
+            for writer in self._writers.values():
+                writer.close()
+            self._writers = {}
+
+
+COMPACT_WRITERS: Dict[str, Type[CompactWriter]] = {"jsonl": CompactJsonlWriter, "parquet": CompactParquetWriter}
+
+
+class CompactDataset:
+    """
+    A compact dataset loaded from disk: the chunk table keyed by ID and the QA rows.
+    DatasetItems are rehydrated on access, each sharing its chunk's text instead of holding a copy.
+    """
+
+    def __init__(self, chunks: Dict[str, ChunkRecord], rows: List[QARow]):
+        self.chunks = chunks
+        self.rows = rows
+
+    @classmethod
+    def load(cls, path: str | Path) -> "CompactDataset":
+        path = Path(path)
+        if (path / f"{QA_TABLE}.parquet").exists():
+            chunk_rows, qa_rows = (
+                _read_parquet(path / f"{CHUNKS_TABLE}.parquet"),
+                _read_parquet(path / f"{QA_TABLE}.parquet"),
+            )
+        else:
+            chunk_rows, qa_rows = _read_jsonl(path / f"{CHUNKS_TABLE}.jsonl"), _read_jsonl(path / f"{QA_TABLE}.jsonl")
+
+        chunks = {}
+        for row in chunk_rows:
+            chunk = _validate(ChunkRecord, row)
+            if chunk is not None:
+                chunks[chunk.chunk_id] = chunk
+        # Rows whose chunk is missing (e.g. after a crash) cannot be rehydrated and are skipped
+        rows = [qa for qa in (_validate(QARow, row) for row in qa_rows) if qa is not None and qa.chunk_id in chunks]
+        return cls(chunks, rows)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __getitem__(self, index: int) -> DatasetItem:
+        row = self.rows[index]
+        return DatasetItem.from_chunk(row, self.chunks[row.chunk_id].text, row.chunk_id)
+
+    def __iter__(self) -> Iterator[DatasetItem]:
+        for row in self.rows:
+            yield DatasetItem.from_chunk(row, self.chunks[row.chunk_id].text, row.chunk_id)
+
+    def to_dataset(self) -> Dataset:
+        return Dataset(items=list(self))
+
+
+def load_compact(path: str | Path) -> CompactDataset:
+    """Loads a dataset directory written by a CompactWriter (JSONL or Parquet tables)."""
+    return CompactDataset.load(path)
+
+
+def _validate(model: Any, row: Dict[str, Any]) -> Any:
+    try:
+        return model(**row)
+    except ValidationError:
+        return None
+
+
+def _read_jsonl(path: Path) -> List[Dict[str, Any]]:
+    rows = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                rows.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return rows
+
+
+def _read_parquet(path: Path) -> List[Dict[str, Any]]:
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("Reading Parquet datasets requires pyarrow: pip install 'findodo[parquet]'") from e
+    rows: List[Dict[str, Any]] = pq.read_table(str(path)).to_pylist()
+    return rows
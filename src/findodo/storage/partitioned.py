@@ -0,0 +1,149 @@
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+from urllib.parse import quote
+
+from findodo.models import DatasetItem, DatasetPartition
+from findodo.storage.writers import DatasetWriter
+
+PARTITION_COLUMNS = ["ticker", "year", "form", "run_id"]
+# Directory value of an unset partition column; pyarrow's hive partitioning reads it back as null
+NULL_PARTITION = "__HIVE_DEFAULT_PARTITION__"
+
+# DNF filters as accepted by pyarrow, e.g. [("ticker", "=", "AAPL"), ("year", ">=", 2022)]
+Filters = List[Tuple[str, str, Any]]
+
+
+def _import_pyarrow() -> Tuple[Any, Any, Any]:
+    try:
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("Partitioned datasets require pyarrow: pip install 'findodo[parquet]'") from e
+    return pa, ds, pq
+
+
+def _encode(value: Any) -> str:
+    return NULL_PARTITION if value is None else quote(str(value), safe="")
+
+
+def _in_progress(path: Path) -> Path:
+    # Hidden names are skipped by pyarrow datasets, so readers never see a file without its footer
+    return path.with_name(f".{path.name}.inprogress")
+
+
+class PartitionedParquetWriter(DatasetWriter):
+    """
+    Adds one run to a Hive-partitioned Parquet dataset rooted at `path`:
+
+        ticker=AAPL/year=2023/form=10-K/run_id=<run>/part-0.parquet
+
+    Each target's items go to one part file in the partition set by begin_target; targets without one
+    (PDFs, URLs) land in the null partition, and a partition seen again gets the next part number.
+    Only the current target's file is open: it is finished when the next target begins, so memory and open
+    files stay bounded however many partitions a bulk run touches. Files are written under a hidden name and
+    renamed once finished, so readers never see a half-written file and a run never touches another run's
+    files: the root can be tracked with `dvc add` and only grows by new directories.
+    """
+
+    def __init__(self, path: str | Path, run_id: str, row_group_size: int = 10_000):
+        super().__init__(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        pa, _, pq = _import_pyarrow()
+        self._pa = pa
+        self._pq = pq
+        self._schema = pa.schema([(name, pa.string()) for name in DatasetItem.model_fields])
+        self.run_id = run_id
+        self.row_group_size = row_group_size
+        self._target: Optional[Path] = None
+        self._writer: Optional[Any] = None
+        self._buffer: List[Dict[str, Any]] = []
+        # Part files written to each partition directory by this run
+        self._parts: Dict[Path, int] = {}
+
+    def partition_dir(self, partition: DatasetPartition) -> Path:
+        values = {**partition.model_dump(), "run_id": self.run_id}
+        return self.path.joinpath(*(f"{name}={_encode(values[name])}" for name in PARTITION_COLUMNS))
+
+    def begin_target(
+        self, source: Optional[str], texts: Sequence[str] = (), partition: Optional[DatasetPartition] = None
+    ) -> None:
+        self._finish()
+        super().begin_target(source, texts, partition)
+
+    def write(self, item: DatasetItem) -> None:
+        if self._target is None:
+            directory = self.partition_dir(self.partition)
+            part = self._parts.get(directory, 0)
+            self._parts[directory] = part + 1
+            self._target = directory / f"part-{part}.parquet"
+        self._buffer.append(item.model_dump())
+        self.count += 1
+        if len(self._buffer) >= self.row_group_size:
+            self._flush()
+
+    def _flush(self) -> None:
+        if not self._buffer or self._target is None:
+            return
+        if self._writer is None:
+            self._target.parent.mkdir(parents=True, exist_ok=True)
+            self._writer = self._pq.ParquetWriter(str(_in_progress(self._target)), self._schema, compression="zstd")
+        self._writer.write_table(self._pa.Table.from_pylist(self._buffer, schema=self._schema))
+        self._buffer = []
+
+    def _finish(self) -> None:
+        """Flushes the current target's rows, closes its file and moves it into place."""
+        self._flush()
+        if self._writer is not None and self._target is not None:
+            self._writer.close()
+            os.replace(_in_progress(self._target), self._target)
+        self._writer = None
+        self._target = None
+
+    def close(self) -> None:
+        self._finish()
+
+
+def open_partitioned(path: str | Path) -> Any:
+    """
+    Opens the dataset at `path` as a memory-mapped `pyarrow.dataset.Dataset` with typed partition columns
+    (ticker, year, form, run_id). Nothing is read until it is scanned.
+
+    `context` is read dictionary-encoded: the questions of a chunk share one copy of its text in memory,
+    as they do on disk.
+    """
+    pa, ds, _ = _import_pyarrow()
+    from pyarrow.fs import LocalFileSystem
+
+    partitioning = ds.partitioning(
+        pa.schema([("ticker", pa.string()), ("year", pa.int32()), ("form", pa.string()), ("run_id", pa.string())]),
+        flavor="hive",
+    )
+    file_format = ds.ParquetFileFormat(read_options=ds.ParquetReadOptions(dictionary_columns={"context"}))
+    return ds.dataset(
+        str(path), format=file_format, partitioning=partitioning, filesystem=LocalFileSystem(use_mmap=True)
+    )
+
+
+def read_partitioned(path: str | Path, columns: Optional[List[str]] = None, filters: Optional[Filters] = None) -> Any:
+    """
+    Loads the dataset at `path` into a `pyarrow.Table`, reading only `columns` (default: all).
+    Filters on partition columns skip whole directories without opening their files;
+    filters on other columns are checked against row group statistics first.
+    """
+    _, _, pq = _import_pyarrow()
+    expression = pq.filters_to_expression(filters) if filters else None
+    return open_partitioned(path).to_table(columns=columns, filter=expression)
+
+
+def iter_partitioned(
+    path: str | Path, filters: Optional[Filters] = None, batch_size: int = 10_000
+) -> Iterator[DatasetItem]:
+    """Streams the matching rows as DatasetItems, one record batch in memory at a time."""
+    _, _, pq = _import_pyarrow()
+    expression = pq.filters_to_expression(filters) if filters else None
+    columns = list(DatasetItem.model_fields)
+    for batch in open_partitioned(path).to_batches(columns=columns, filter=expression, batch_size=batch_size):
+        for row in batch.to_pylist():
+            yield DatasetItem(**row)
@@ -0,0 +1,151 @@
+import json
+from abc import ABC, abstractmethod
+from pathlib import Path
+from types import TracebackType
+from typing import Any, Dict, List, Optional, Sequence, Type
+
+from pydantic import ValidationError
+
+from findodo.models import DatasetItem, DatasetPartition
+
+
+class DatasetWriter(ABC):
+    """
+    The contract for sinks that persist DatasetItems incrementally.
+    Writers are context managers, so a crash still flushes everything written so far.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.count = 0
+        self.source: Optional[str] = None
+        self.partition = DatasetPartition()
+
+    def begin_target(
+        self, source: Optional[str], texts: Sequence[str] = (), partition: Optional[DatasetPartition] = None
+    ) -> None:
+        """
+        Called before the items of one target (ticker, URL or path) are written, with its chunks in order.
+        Writers that keep a chunk table use it to record where each chunk came from;
+        partitioned writers route the target's items by `partition`.
+        """
+        self.source = source
+        self.partition = partition or DatasetPartition()
+
+    @abstractmethod
+    def write(self, item: DatasetItem) -> None:
+        pass
+
+    @abstractmethod
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> "DatasetWriter":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+
+class JsonlWriter(DatasetWriter):
+    """
+    One JSON object per line, flushed after every item.
+    """
+
+    def __init__(self, path: str | Path):
+        super().__init__(path)
+        self._file = open(self.path, "w", encoding="utf-8")
+
+    def write(self, item: DatasetItem) -> None:
+        self._file.write(item.model_dump_json() + "\n")
+        self._file.flush()
+        self.count += 1
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self._file.close()
+
+
+class ParquetWriter(DatasetWriter):
+    """
+    Buffers up to `row_group_size` items and flushes them as one Parquet row group.
+    Requires the optional `pyarrow` dependency.
+    """
+
+    def __init__(self, path: str | Path, row_group_size: int = 1000):
+        super().__init__(path)
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("Parquet output requires pyarrow: pip install 'findodo[parquet]'") from e
+
+        self._pa = pa
+        self._schema = pa.schema([(name, pa.string()) for name in DatasetItem.model_fields])
+        self._writer = pq.ParquetWriter(str(self.path), self._schema, compression="zstd")
+        self.row_group_size = row_group_size
+        self._buffer: List[Dict[str, Any]] = []
+
+    def write(self, item: DatasetItem) -> None:
+        self._buffer.append(item.model_dump())
+        self.count += 1
+        if len(self._buffer) >= self.row_group_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._buffer:
+            self._writer.write_table(self._pa.Table.from_pylist(self._buffer, schema=self._schema))
+            self._buffer = []
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self.flush()
+            self._writer.close()
+            self._writer = None
+
+
+WRITERS: Dict[str, Type[DatasetWriter]] = {"jsonl": JsonlWriter, "parquet": ParquetWriter}
+
+
+def open_writer(path: str | Path, output_format: str = "jsonl", layout: str = "flat", **kwargs: Any) -> DatasetWriter:
+    """
+    Builds the writer for `output_format` ("jsonl" or "parquet").
+    The "flat" layout writes one file with a context per item; "compact" writes a directory with a chunk table
+    and QA rows that reference it (see findodo.storage.compact); "partitioned" adds the run to a Parquet dataset
+    partitioned by ticker/year/form/run_id (see findodo.storage.partitioned, requires `run_id`).
+    """
+    if output_format not in WRITERS:
+        raise ValueError(f"Unknown output format '{output_format}'. Expected one of {sorted(WRITERS)}")
+    if layout == "compact":
+        from findodo.storage.compact import COMPACT_WRITERS
+
+        return COMPACT_WRITERS[output_format](path, **kwargs)
+    if layout == "partitioned":
+        if output_format != "parquet":
+            raise ValueError("The partitioned layout is Parquet only: set output_format=parquet")
+        from findodo.storage.partitioned import PartitionedParquetWriter
+
+        return PartitionedParquetWriter(path, **kwargs)
+    if layout != "flat":
+        raise ValueError(f"Unknown dataset layout '{layout}'. Expected 'flat', 'compact' or 'partitioned'")
+    return WRITERS[output_format](path, **kwargs)
+
+
+def read_jsonl(path: str | Path) -> List[DatasetItem]:
+    """
+    Loads a JSONL file written by JsonlWriter. A truncated last line (from a crash) is skipped.
+    """
+    items = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                items.append(DatasetItem(**json.loads(line)))
+            except (json.JSONDecodeError, ValidationError):
+                continue
+    return items
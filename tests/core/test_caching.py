@@ -0,0 +1,77 @@
+import os
+import time
+
+from findodo.core.caching import DiskCache
+
+
+def test_round_trip_and_counters(tmp_path):
+    cache = DiskCache(tmp_path)
+    key = DiskCache.make_key("AAPL", "10-K", 2023, 0)
+
+    assert cache.get(key) is None
+    cache.put(key, {"items": {"Item 1": "text"}})
+
+    assert cache.get(key) == {"items": {"Item 1": "text"}}
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_ttl_expires_entries(tmp_path):
+    cache = DiskCache(tmp_path, ttl_days=1)
+    key = DiskCache.make_key("old")
+    cache.put(key, {"v": 1})
+
+    stale = time.time() - 2 * 86400
+    os.utime(cache._path(key), (stale, stale))
+
+    assert key not in cache
+    assert cache.get(key) is None
+
+
+def test_reads_do_not_extend_the_ttl(tmp_path):
+    cache = DiskCache(tmp_path, ttl_days=1)
+    key = DiskCache.make_key("hot")
+    cache.put(key, {"v": 1})
+    written = time.time() - 2 * 86400
+    os.utime(cache._path(key), (time.time(), written))
+
+    # A frequently read entry still expires once it is older than the TTL
+    assert key not in cache
+    assert cache.get(key) is None
+
+
+def test_reads_refresh_the_access_time_only(tmp_path):
+    cache = DiskCache(tmp_path)
+    key = DiskCache.make_key("k")
+    cache.put(key, {"v": 1})
+    os.utime(cache._path(key), (1000, 2000))
+
+    cache.get(key)
+
+    stat = cache._path(key).stat()
+    assert stat.st_mtime == 2000
+    assert stat.st_atime > 2000
+
+
+def test_writes_evict_periodically(tmp_path, monkeypatch):
+    cache = DiskCache(tmp_path, max_size_mb=1)
+    calls = []
+    monkeypatch.setattr(cache, "evict", lambda: calls.append(1))
+
+    for i in range(2 * DiskCache.EVICT_EVERY):
+        cache.put(DiskCache.make_key(i), {"v": i})
+
+    assert len(calls) == 2
+
+
+def test_size_eviction_drops_least_recently_used(tmp_path):
+    cache = DiskCache(tmp_path, max_size_mb=250 / (1024 * 1024))
+    keys = [DiskCache.make_key(i) for i in range(3)]
+    for i, key in enumerate(keys):
+        cache.put(key, {"payload": "x" * 100})
+        # Distinct access times so the LRU order is well defined
+        os.utime(cache._path(key), (1000 + i, time.time()))
+
+    cache.evict()
+
+    assert keys[0] not in cache
+    assert keys[1] in cache and keys[2] in cache
@@ -1,5 +1,11 @@
+import asyncio
+from typing import List
+
 from findodo.generator import Generator
 from findodo.config import Config, ChunkerConfig, ParserConfig, ProviderConfig, PromptConfig
+from findodo.core.providing import BaseProvider
+from findodo.models import DatasetItem
+from findodo.storage import JsonlWriter, read_jsonl
 
 
 def test_generator_initialization():
@@ -35,3 +41,183 @@ def test_generator_initialization():
 
     # Check Provider
     assert gen.provider.model == "gpt-test"
+
+
+class SlowEchoProvider(BaseProvider):
+    """Fake provider whose first chunks finish last, to expose ordering bugs."""
+
+    def __init__(self) -> None:
+        super().__init__(config=None, prompt_config=None)
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    def generate_qa(self, text: str, num_questions: int) -> List[DatasetItem]:
+        return [DatasetItem(question=f"{text}-q{i}", answer="a", context=text) for i in range(num_questions)]
+
+    async def agenerate_qa(self, text: str, num_questions: int) -> List[DatasetItem]:
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        await asyncio.sleep(0.01 * (10 - int(text.split("-")[1])))
+        self.in_flight -= 1
+        return self.generate_qa(text, num_questions)
+
+
+def _config(max_concurrency: int) -> Config:
+    return Config(
+        chunker=ChunkerConfig(chunk_size=100, chunk_overlap=10),
+        parser=ParserConfig(name="sec"),
+        provider=ProviderConfig(name="openai", model="gpt-test", max_concurrency=max_concurrency),
+        prompt=PromptConfig(name="test", system_prompt="Test Prompt"),
+    )
+
+
+def test_generate_from_texts_sequential_allocation():
+    gen = Generator(_config(max_concurrency=1), provider=SlowEchoProvider())
+    texts = [f"chunk-{i}" for i in range(4)]
+
+    dataset = gen.generate_from_texts(texts, total_questions=6)
+
+    # 6 questions over 4 chunks: the first two chunks get the extras
+    assert [item.question for item in dataset.items] == [
+        "chunk-0-q0",
+        "chunk-0-q1",
+        "chunk-1-q0",
+        "chunk-1-q1",
+        "chunk-2-q0",
+        "chunk-3-q0",
+    ]
+
+
+def test_generate_from_texts_concurrent_keeps_chunk_order():
+    provider = SlowEchoProvider()
+    gen = Generator(_config(max_concurrency=3), provider=provider)
+    texts = [f"chunk-{i}" for i in range(8)]
+
+    dataset = gen.generate_from_texts(texts, total_questions=8)
+
+    assert [item.context for item in dataset.items] == texts
+    assert 1 < provider.peak_in_flight <= 3
+
+
+def test_stream_from_texts_yields_before_all_chunks_finish():
+    provider = SlowEchoProvider()
+    gen = Generator(_config(max_concurrency=1), provider=provider)
+    calls = []
+    provider.generate_qa = lambda text, n: calls.append(text) or [DatasetItem(question="q", answer="a", context=text)]
+
+    stream = gen.stream_from_texts([f"chunk-{i}" for i in range(5)], total_questions=5)
+    first = next(stream)
+
+    assert first.context == "chunk-0"
+    assert calls == ["chunk-0"]
+
+
+def test_stream_from_texts_yields_streamed_items_as_they_arrive():
+    provider = SlowEchoProvider()
+    gen = Generator(_config(max_concurrency=1), provider=provider)
+    produced = []
+
+    def stream_qa(text, n):
+        for i in range(n):
+            produced.append(i)
+            yield DatasetItem(question=f"{text}-q{i}", answer="a", context=text)
+
+    provider.stream_qa = stream_qa
+    stream = gen.stream_from_texts(["chunk-0"], total_questions=3)
+
+    assert next(stream).question == "chunk-0-q0"
+    assert produced == [0]
+    assert [item.question for item in stream] == ["chunk-0-q1", "chunk-0-q2"]
+
+
+def test_concurrent_stream_stops_at_quota():
+    provider = SlowEchoProvider()
+    gen = Generator(_config(max_concurrency=2), provider=provider)
+
+    # Every chunk over-delivers, so the quota is reached before the last chunk is consumed
+    provider.generate_qa = lambda text, n: [
+        DatasetItem(question=f"{text}-q{i}", answer="a", context=text) for i in range(3)
+    ]
+    items = list(gen.stream_from_texts([f"chunk-{i}" for i in range(4)], total_questions=4))
+
+    assert [item.question for item in items] == ["chunk-0-q0", "chunk-0-q1", "chunk-0-q2", "chunk-1-q0"]
+
+
+def test_write_from_texts_streams_into_writer(tmp_path):
+    gen = Generator(_config(max_concurrency=1), provider=SlowEchoProvider())
+
+    with JsonlWriter(tmp_path / "run.jsonl") as writer:
+        count = gen.write_from_texts(["chunk-0", "chunk-1"], writer, total_questions=3)
+
+    assert count == 3
+    assert len(read_jsonl(tmp_path / "run.jsonl")) == 3
+
+
+class PackingEchoProvider(SlowEchoProvider):
+    def __init__(self) -> None:
+        super().__init__()
+        self.packs: List[List[str]] = []
+
+    def generate_packed(self, requests):
+        self.packs.append([text for text, _ in requests])
+        return [self.generate_qa(text, n) for text, n in requests]
+
+
+def test_packing_sends_several_chunks_per_request_in_order():
+    config = _config(max_concurrency=1)
+    config.provider.packing.enabled = True
+    config.provider.packing.max_chunks = 3
+    provider = PackingEchoProvider()
+    gen = Generator(config, provider=provider)
+    texts = [f"chunk-{i}" for i in range(7)]
+
+    dataset = gen.generate_from_texts(texts, total_questions=7)
+
+    # 7 chunks in packs of at most 3; the single trailing chunk goes through generate_qa
+    assert provider.packs == [texts[0:3], texts[3:6]]
+    assert [item.context for item in dataset.items] == texts
+
+
+def test_weighted_allocation_skips_duplicates_and_records_plan():
+    config = _config(max_concurrency=1)
+    config.allocation.strategy = "weighted"
+    config.allocation.min_tokens = 1
+    calls = []
+    provider = SlowEchoProvider()
+    provider.generate_qa = lambda text, n: calls.append(text) or [
+        DatasetItem(question="q", answer="a", context=text) for _ in range(n)
+    ]
+    gen = Generator(config, provider=provider)
+
+    items = list(gen.stream_from_texts(["chunk-0 revenue", "chunk-0 revenue", "chunk-1 margin"], total_questions=4))
+
+    assert calls == ["chunk-0 revenue", "chunk-1 margin"]
+    assert len(items) == 4
+    assert gen.allocation_plans[0].summary()["chunks_skipped_duplicate"] == 1
+
+
+def test_chunk_store_parses_a_target_once_across_generators(tmp_path, monkeypatch):
+    parses = []
+
+    def fake_parse(self, task):
+        parses.append(task.target)
+        return ["chunk-0 text", "chunk-1 text"]
+
+    monkeypatch.setattr(Generator, "_parse_task", fake_parse)
+    config = _config(max_concurrency=1)
+    config.chunk_store.enabled = True
+    config.chunk_store.dir = str(tmp_path / "chunks")
+    config.task.target = "AAPL"
+    config.task.year = 2023
+
+    with Generator(config, provider=SlowEchoProvider()).chunks_for_task(config.task) as chunks:
+        first = list(chunks)
+    # A sweep job with another temperature reuses the stored chunks
+    config.provider.temperature = 0.7
+    with Generator(config, provider=SlowEchoProvider()).chunks_for_task(config.task) as chunks:
+        second = list(chunks)
+
+    assert parses == ["AAPL"]
+    assert first == second == ["chunk-0 text", "chunk-1 text"]
+    # The memory-mapped chunks were released when the block exited
+    assert chunks.closed
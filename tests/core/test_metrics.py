@@ -0,0 +1,130 @@
+import json
+from unittest.mock import MagicMock
+
+import pytest
+from openai.types.chat import ChatCompletion
+
+from findodo.config import CacheConfig, ChunkerConfig, Config, ParserConfig, PromptConfig, ProviderConfig
+from findodo.core.metrics import METRICS, Metrics
+from findodo.core.providing import BaseProvider
+from findodo.generator import Generator
+from findodo.models import DatasetItem
+from findodo.providers.openai import OpenAIProvider
+
+
+@pytest.fixture
+def metrics():
+    METRICS.enabled = True
+    METRICS.reset()
+    yield METRICS
+    METRICS.enabled = False
+    METRICS.reset()
+
+
+def test_disabled_metrics_record_nothing():
+    m = Metrics()
+    m.incr("a")
+    m.observe("b", 1.0)
+    with m.timer("c"):
+        pass
+    assert m.summary() == {}
+
+
+def test_summary_reports_counters_and_percentiles():
+    m = Metrics()
+    m.enabled = True
+    m.incr("tokens", 10)
+    m.incr("tokens", 5)
+    for value in range(1, 101):
+        m.observe("latency", float(value))
+    with m.timer("stage"):
+        pass
+
+    summary = m.summary()
+    assert summary["tokens"] == 15
+    assert summary["latency.count"] == 100
+    assert summary["latency.p50"] == pytest.approx(50.5)
+    assert summary["latency.max"] == 100
+    assert summary["stage.count"] == 1
+
+
+def _completion(payload, cached_tokens=0):
+    return ChatCompletion.model_validate(
+        {
+            "id": "c1",
+            "object": "chat.completion",
+            "created": 0,
+            "model": "gpt-test",
+            "choices": [
+                {
+                    "index": 0,
+                    "finish_reason": "tool_calls",
+                    "message": {
+                        "role": "assistant",
+                        "content": None,
+                        "tool_calls": [
+                            {
+                                "id": "t1",
+                                "type": "function",
+                                "function": {"name": "generate_dataset", "arguments": json.dumps(payload)},
+                            }
+                        ],
+                    },
+                }
+            ],
+            "usage": {
+                "prompt_tokens": 120,
+                "completion_tokens": 40,
+                "total_tokens": 160,
+                "prompt_tokens_details": {"cached_tokens": cached_tokens},
+            },
+        }
+    )
+
+
+def test_provider_records_usage_latency_and_dropped_items(metrics, monkeypatch):
+    config = ProviderConfig(name="openai", model="gpt-test", api_key="sk-fake")
+    provider = OpenAIProvider(config, PromptConfig(name="default", system_prompt="p"))
+    payload = {"items": [{"question": "q", "answer": "a"}, {"question": "q2"}]}
+    monkeypatch.setattr(
+        provider.client.chat.completions, "create", MagicMock(return_value=_completion(payload, cached_tokens=64))
+    )
+
+    assert len(provider.generate_qa("text", 2)) == 1
+
+    summary = metrics.summary()
+    assert summary["llm.requests"] == 1
+    assert summary["llm.prompt_tokens"] == 120
+    assert summary["llm.completion_tokens"] == 40
+    assert summary["llm.cached_prompt_tokens"] == 64
+    assert summary["items.dropped_malformed"] == 1
+    assert summary["llm.latency_s.count"] == 1
+
+
+class ShortProvider(BaseProvider):
+    """Answers one question fewer than requested, and nothing for empty chunks."""
+
+    def __init__(self) -> None:
+        super().__init__(config=None, prompt_config=None)
+
+    def generate_qa(self, text, num_questions):
+        if text == "empty":
+            return []
+        return [DatasetItem(question=f"{text}-{i}", answer="a", context=text) for i in range(num_questions - 1)]
+
+
+def test_generator_counts_requested_and_delivered_questions(metrics):
+    config = Config(
+        chunker=ChunkerConfig(chunk_size=100, chunk_overlap=10),
+        parser=ParserConfig(name="sec"),
+        provider=ProviderConfig(name="openai", model="gpt-test", cache=CacheConfig(mode="bypass")),
+        prompt=PromptConfig(name="test", system_prompt="p"),
+    )
+    gen = Generator(config, provider=ShortProvider())
+
+    gen.generate_from_texts(["a", "b", "empty"], total_questions=9)
+
+    summary = metrics.summary()
+    assert summary["questions.requested"] == 9
+    assert summary["questions.delivered"] == 4
+    assert summary["chunks.failed"] == 1
@@ -1,3 +1,5 @@
+from langchain_text_splitters import TokenTextSplitter
+
 from findodo.parsers.chunker import Chunker
 
 
@@ -16,3 +18,29 @@ def test_chunker_does_not_split_short_text():
     chunks = chunker.split(short_text)
 
     assert len(chunks) == 1
+
+
+def test_chunker_matches_token_text_splitter():
+    text = " ".join(f"Revenue for segment {i} rose {i * 3}% year over year." for i in range(200))
+    chunker = Chunker(chunk_size=64, chunk_overlap=16)
+
+    assert chunker.split(text) == TokenTextSplitter(chunk_size=64, chunk_overlap=16).split_text(text)
+
+
+def test_chunks_carry_token_counts_and_offsets():
+    text = "Net sales \u20ac391bn \u2014 Services \u00e9l\u00e8ve " * 40
+    chunker = Chunker(chunk_size=16, chunk_overlap=4, encoding="cl100k_base")
+    chunks = chunker.chunk(text)
+
+    assert len(chunks) > 1
+    assert chunks[0].start == 0 and chunks[-1].end == len(text)
+    for chunk in chunks:
+        assert chunk.text == text[chunk.start : chunk.end]
+        assert 0 < chunk.num_tokens <= 16
+
+
+def test_chunk_batch_matches_single_documents():
+    texts = ["alpha beta gamma " * 50, "", "delta epsilon " * 30]
+    chunker = Chunker(chunk_size=20, chunk_overlap=5)
+
+    assert chunker.chunk_batch(texts, num_threads=2) == [chunker.chunk(text) for text in texts]
@@ -0,0 +1,141 @@
+import os
+import stat
+import threading
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client
+
+import pytest
+
+from findodo.config import ChunkerConfig, ParserConfig
+from findodo.docling_worker import DoclingWorker, main
+from findodo.parsers.docling import AUTHKEY_ENV, DoclingClient, DoclingParser, is_loopback, load_authkey, parse_address
+
+
+class FakeBackend:
+    def __init__(self):
+        self.batches = []
+
+    def convert(self, paths, page_range=None):
+        self.batches.append(list(paths))
+        return [f"# Report\n\n| Metric | Value |\n| Revenue | {len(path)} |\n" * 20 for path in paths]
+
+
+@pytest.fixture
+def documents(tmp_path):
+    paths = []
+    for i in range(3):
+        path = tmp_path / f"report-{i}.pdf"
+        path.write_bytes(f"%PDF-1.4 document {i}".encode())
+        paths.append(str(path))
+    return paths
+
+
+def _parser(tmp_path, chunk_size=50, **extra):
+    config = ParserConfig(name="docling", cache_dir=str(tmp_path / "cache"), **extra)
+    parser = DoclingParser(config, ChunkerConfig(chunk_size=chunk_size, chunk_overlap=10))
+    parser.backend = FakeBackend()
+    return parser
+
+
+def test_parse_many_converts_all_documents_in_one_batch(tmp_path, documents):
+    parser = _parser(tmp_path)
+
+    chunks = parser.parse_many(documents)
+
+    assert parser.backend.batches == [documents]
+    assert len(chunks) == 3 and all(chunks)
+
+
+def test_markdown_cache_survives_chunker_changes(tmp_path, documents):
+    first = _parser(tmp_path)
+    first.parse_many(documents[:2])
+
+    rechunked = _parser(tmp_path, chunk_size=20)
+    chunks = rechunked.parse_many(documents)
+
+    # Only the document that was never converted reaches Docling again
+    assert rechunked.backend.batches == [documents[2:]]
+    assert max(len(rechunked.chunker.encoding.encode(c)) for c in chunks[0]) <= 20
+
+
+def test_failed_conversion_raises(tmp_path, documents):
+    parser = _parser(tmp_path)
+    parser.backend.convert = lambda paths, page_range=None: [None if p == documents[1] else "# Report" for p in paths]
+
+    with pytest.raises(RuntimeError, match="report-1.pdf"):
+        parser.parse(documents[1])
+    with pytest.raises(RuntimeError, match="report-1.pdf"):
+        parser.parse_many(documents)
+
+    # Documents Docling did convert are cached, so only the failed one is retried
+    retry = _parser(tmp_path)
+    retry.parse(documents[0])
+    assert retry.backend.batches == []
+
+
+def test_worker_serves_batches_over_a_local_connection(tmp_path, documents):
+    backend = FakeBackend()
+    worker = DoclingWorker(backend, authkey=b"secret")
+    thread = threading.Thread(target=worker.serve_forever, daemon=True)
+    thread.start()
+
+    host, port = worker.address
+    client = DoclingClient(f"{host}:{port}", authkey=b"secret")
+    markdown = client.convert(documents)
+
+    assert backend.batches == [documents]
+    assert all(text.startswith("# Report") for text in markdown)
+
+    with Client(worker.address, authkey=b"secret") as connection:
+        connection.send({"op": "shutdown"})
+        connection.recv()
+    thread.join(timeout=5)
+    assert not thread.is_alive()
+
+
+def test_worker_rejects_clients_with_the_wrong_key(tmp_path, documents):
+    backend = FakeBackend()
+    worker = DoclingWorker(backend, authkey=b"secret")
+    thread = threading.Thread(target=worker.serve_forever, daemon=True)
+    thread.start()
+    host, port = worker.address
+
+    with pytest.raises(AuthenticationError):
+        DoclingClient(f"{host}:{port}", authkey=b"guessed").convert(documents)
+    assert backend.batches == []
+
+    # The worker keeps serving clients that hold the key
+    assert DoclingClient(f"{host}:{port}", authkey=b"secret").convert(documents)
+    with Client(worker.address, authkey=b"secret") as connection:
+        connection.send({"op": "shutdown"})
+        connection.recv()
+    thread.join(timeout=5)
+
+
+def test_authkey_is_a_private_per_user_file_unless_set(tmp_path, monkeypatch):
+    monkeypatch.delenv(AUTHKEY_ENV, raising=False)
+    key_file = tmp_path / "config" / "docling.key"
+
+    key = load_authkey(key_file)
+
+    assert len(key) == 64 and load_authkey(key_file) == key
+    assert stat.S_IMODE(os.stat(key_file).st_mode) == 0o600
+
+    monkeypatch.setenv(AUTHKEY_ENV, "explicit")
+    assert load_authkey(key_file) == b"explicit"
+
+
+def test_only_local_addresses_count_as_loopback():
+    assert is_loopback(parse_address("localhost:6100"))
+    assert is_loopback(parse_address("127.0.0.1:6100"))
+    assert is_loopback(parse_address("/tmp/docling.sock"))
+    assert not is_loopback(parse_address("0.0.0.0:6100"))
+    assert not is_loopback(parse_address("docling.internal:6100"))
+
+
+def test_worker_refuses_a_public_address_without_an_explicit_key(monkeypatch):
+    monkeypatch.delenv(AUTHKEY_ENV, raising=False)
+    monkeypatch.setattr("sys.argv", ["findodo-docling-worker", "--address", "0.0.0.0:6100"])
+
+    with pytest.raises(SystemExit):
+        main()
@@ -0,0 +1,56 @@
+from findodo.config import ChunkerConfig, ParserConfig
+from findodo.parsers.hybrid import HybridParser, page_ranges, table_score
+
+PROSE = "Our business grew steadily.\nWe expanded into new markets.\nManagement remains optimistic."
+TABLE = "\n".join(
+    ["Consolidated Statements of Operations (in millions)"] + [f"Line {i} 1,{i}34.5 (2{i}.1) 3{i}%" for i in range(6)]
+)
+
+
+class FakeDocling:
+    def __init__(self):
+        self.calls = []
+
+    def convert(self, paths, page_range=None):
+        self.calls.append(page_range)
+        return [f"| Table pages {page_range[0]}-{page_range[1]} |"]
+
+
+def _parser(tmp_path, include_tables=True):
+    config = ParserConfig(
+        name="hybrid", include_tables=include_tables, page_workers=0, cache_dir=str(tmp_path / "cache")
+    )
+    parser = HybridParser(config, ChunkerConfig(chunk_size=200, chunk_overlap=20))
+    parser.docling_parser.backend = FakeDocling()
+    return parser
+
+
+def test_table_heuristics():
+    assert table_score(TABLE) > 0.8
+    assert table_score(PROSE) == 0.0
+    assert page_ranges([1, 2, 3, 7, 9, 10]) == [(2, 4), (8, 8), (10, 11)]
+
+
+def test_only_table_pages_reach_docling_and_merge_in_order(tmp_path, write_pdf):
+    path = write_pdf(tmp_path / "annual.pdf", [PROSE, TABLE, TABLE, PROSE, TABLE])
+    parser = _parser(tmp_path)
+
+    chunks = parser.parse(str(path))
+
+    assert parser.docling_parser.backend.calls == [(2, 3), (5, 5)]
+    text = " ".join(chunks)
+    assert text.index("Our business") < text.index("Table pages 2-3") < text.index("Table pages 5-5")
+
+    # The page-range Markdown is cached, so a second parse makes no Docling calls
+    parser.parse(str(path))
+    assert len(parser.docling_parser.backend.calls) == 2
+
+
+def test_include_tables_off_keeps_every_page_on_pypdf(tmp_path, write_pdf):
+    path = write_pdf(tmp_path / "annual.pdf", [PROSE, TABLE])
+    parser = _parser(tmp_path, include_tables=False)
+
+    chunks = parser.parse(str(path))
+
+    assert parser.docling_parser.backend.calls == []
+    assert "Consolidated Statements" in " ".join(chunks)
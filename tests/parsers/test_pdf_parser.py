@@ -0,0 +1,33 @@
+from findodo.config import ChunkerConfig, ParserConfig
+from findodo.parsers.chunker import Chunker
+from findodo.parsers.pdf import PDFParser
+
+
+def _parser(page_workers, pages_per_task=2):
+    config = ParserConfig(name="pdf", page_workers=page_workers, pages_per_task=pages_per_task)
+    return PDFParser(config, ChunkerConfig(chunk_size=20, chunk_overlap=5))
+
+
+def test_pdf_parser_reads_local_file_in_page_order(tmp_path, write_pdf):
+    pages = [f"Page {i} revenue grew by {i} percent" for i in range(7)]
+    path = write_pdf(tmp_path / "report.pdf", pages)
+
+    assert list(_parser(page_workers=0).iter_pages(path)) == pages
+    assert list(_parser(page_workers=2).iter_pages(path)) == pages
+
+
+def test_pdf_parser_chunks_match_whole_text_split(tmp_path, write_pdf):
+    pages = [f"Page {i} revenue grew by {i} percent" for i in range(7)]
+    path = write_pdf(tmp_path / "report.pdf", pages)
+
+    chunks = _parser(page_workers=2).parse(str(path))
+
+    assert chunks == Chunker(chunk_size=20, chunk_overlap=5).split(" ".join(pages))
+
+
+def test_split_stream_matches_split():
+    chunker = Chunker(chunk_size=10, chunk_overlap=3)
+    pieces = ["alpha beta gamma", "delta epsilon", "zeta eta theta iota kappa lambda mu", "nu"]
+
+    assert list(chunker.split_stream(pieces)) == chunker.split(" ".join(pieces))
+    assert list(chunker.split_stream(["Short text."])) == ["Short text."]
@@ -0,0 +1,88 @@
+import threading
+import time
+from datetime import date
+
+import pytest
+
+from findodo.config import ChunkerConfig, ParserConfig
+from findodo.models import FilingItem
+from findodo.parsers import sec
+
+
+class FakeFilingObject:
+    items = ["Item 1", "Item 7"]
+
+    def __getitem__(self, item):
+        return {"Item 1": "Business\nline......", "Item 7": "MD&A text"}[item]
+
+
+class FakeFiling:
+    filing_date = date(2023, 11, 3)
+    quarter = None
+    accession_no = "0000320193-23-000106"
+
+    def obj(self):
+        return FakeFilingObject()
+
+
+class FakeCompany:
+    calls = 0
+
+    def __init__(self, ticker):
+        FakeCompany.calls += 1
+
+    def get_filings(self, form):
+        return [FakeFiling()]
+
+
+@pytest.fixture
+def parser(tmp_path, monkeypatch):
+    FakeCompany.calls = 0
+    monkeypatch.setattr(sec, "Company", FakeCompany)
+    return sec.SECParser(
+        ParserConfig(name="sec", cache_dir=str(tmp_path)), ChunkerConfig(chunk_size=50, chunk_overlap=0)
+    )
+
+
+def test_warm_parse_makes_no_network_calls(parser):
+    cold = parser.parse("AAPL", year=2023)
+    warm = parser.parse("aapl", year=2023)
+
+    assert cold == warm
+    assert FakeCompany.calls == 1
+
+
+def test_every_edgar_call_is_throttled(parser, monkeypatch):
+    waits = []
+    monkeypatch.setattr(parser.throttle, "wait", lambda: waits.append(1))
+
+    parser.fetch_items("AAPL", 2023)
+    parser.fetch_items("AAPL", 2023)
+
+    # Company lookup, filing list and filing document; the cached second fetch makes none
+    assert len(waits) == 3
+
+
+def test_throttle_spaces_calls_across_threads():
+    throttle = sec.RequestThrottle(per_second=50)
+    start = time.monotonic()
+    threads = [threading.Thread(target=throttle.wait) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert time.monotonic() - start >= 5 / 50
+
+
+def test_cached_item_text_is_cleaned_and_filtered(parser):
+    items = parser.fetch_items("AAPL", 2023)
+    assert items["Item 1"] == "Business line"
+
+    chunks = parser.parse("AAPL", year=2023, items=[FilingItem.ITEM_7])
+    assert chunks == ["MD&A text"]
+
+
+def test_missing_filing_raises(parser):
+    with pytest.raises(ValueError, match="No 10-K found"):
+        parser.parse("AAPL", year=1999)
@@ -0,0 +1,144 @@
+import json
+
+import pytest
+
+from findodo.config import BatchConfig, ChunkerConfig, Config, ParserConfig, PromptConfig, ProviderConfig
+from findodo.generator import Generator
+from findodo.providers.batch import BatchProvider, LocalBatchTransport
+
+
+def completion_for(body):
+    """Builds a chat completion whose QA pairs echo the chunk text of the request."""
+    text = body["messages"][1]["content"].split("for this text: ", 1)[1]
+    num_questions = int(body["messages"][1]["content"].split()[1])
+    items = [{"question": f"{text}-q{i}", "answer": "a", "context": text} for i in range(num_questions)]
+    return {
+        "id": "chatcmpl-batch",
+        "object": "chat.completion",
+        "created": 0,
+        "model": body["model"],
+        "choices": [
+            {
+                "index": 0,
+                "finish_reason": "tool_calls",
+                "message": {
+                    "role": "assistant",
+                    "content": None,
+                    "tool_calls": [
+                        {
+                            "id": "call_0",
+                            "type": "function",
+                            "function": {"name": "generate_dataset", "arguments": json.dumps({"items": items})},
+                        }
+                    ],
+                },
+            }
+        ],
+    }
+
+
+class FlakyResponder:
+    """Fails the given chunk texts on their first attempt only."""
+
+    def __init__(self, flaky_texts):
+        self.flaky = set(flaky_texts)
+        self.seen = []
+
+    def __call__(self, body):
+        text = body["messages"][1]["content"].split("for this text: ", 1)[1]
+        self.seen.append(text)
+        if text in self.flaky:
+            self.flaky.discard(text)
+            raise RuntimeError("server_error")
+        return completion_for(body)
+
+
+@pytest.fixture
+def provider_config(tmp_path):
+    return ProviderConfig(
+        name="openai_batch",
+        model="gpt-test",
+        api_key="sk-fake",
+        batch=BatchConfig(dir=str(tmp_path / "batches"), poll_interval_s=0.01, max_rounds=3),
+    )
+
+
+def test_batch_results_come_back_in_chunk_order(tmp_path, provider_config):
+    responder = FlakyResponder(flaky_texts=["chunk-1"])
+    provider = BatchProvider(
+        provider_config,
+        PromptConfig(name="default", system_prompt="Sys"),
+        transport=LocalBatchTransport(tmp_path / "backend", responder),
+    )
+
+    results = provider.generate_batch([("chunk-0", 1), ("chunk-1", 2), ("chunk-2", 1)])
+
+    assert [[item.question for item in items] for items in results] == [
+        ["chunk-0-q0"],
+        ["chunk-1-q0", "chunk-1-q1"],
+        ["chunk-2-q0"],
+    ]
+    # The second round only resubmitted the failed request
+    assert responder.seen == ["chunk-0", "chunk-1", "chunk-2", "chunk-1"]
+
+
+def test_custom_ids_are_stable():
+    first = BatchProvider.custom_id(3, "text", 2)
+    assert first == BatchProvider.custom_id(3, "text", 2)
+    assert first.startswith("chunk-000003-")
+    assert first != BatchProvider.custom_id(3, "text", 3)
+
+
+def test_generator_uses_batch_mode(tmp_path, provider_config):
+    config = Config(
+        chunker=ChunkerConfig(),
+        parser=ParserConfig(name="sec"),
+        provider=provider_config,
+        prompt=PromptConfig(name="default", system_prompt="Sys"),
+    )
+    responder = FlakyResponder(flaky_texts=[])
+    provider = BatchProvider(
+        config.provider, config.prompt, transport=LocalBatchTransport(tmp_path / "backend", responder)
+    )
+
+    dataset = Generator(config, provider=provider).generate_from_texts(["a", "b", "c"], total_questions=2)
+
+    # One submission, chunks without questions are never sent
+    assert responder.seen == ["a", "b"]
+    assert [item.context for item in dataset.items] == ["a", "b"]
+
+
+class StalledTransport(LocalBatchTransport):
+    """The first batch stalls after answering its first request, until it is cancelled."""
+
+    def __init__(self, root, responder):
+        super().__init__(root, responder)
+        self.stalled = None
+        self.cancelled = []
+
+    def poll(self, batch_id):
+        if self.stalled is None:
+            self.stalled = batch_id
+            self._process(self.root / batch_id)
+            output = self.root / batch_id / "output.jsonl"
+            output.write_text(output.read_text(encoding="utf-8").splitlines()[0] + "\n", encoding="utf-8")
+        if batch_id == self.stalled:
+            return "cancelled" if batch_id in self.cancelled else "in_progress"
+        return super().poll(batch_id)
+
+    def cancel(self, batch_id):
+        self.cancelled.append(batch_id)
+
+
+def test_timed_out_batch_is_cancelled_and_its_finished_requests_kept(tmp_path, provider_config):
+    provider_config.batch.timeout_h = 1e-9
+    responder = FlakyResponder(flaky_texts=[])
+    transport = StalledTransport(tmp_path / "backend", responder)
+    provider = BatchProvider(provider_config, PromptConfig(name="default", system_prompt="Sys"), transport=transport)
+
+    results = provider.generate_batch([("chunk-0", 1), ("chunk-1", 1), ("chunk-2", 1)])
+
+    assert transport.cancelled == [transport.stalled]
+    assert [[item.question for item in items] for items in results] == [["chunk-0-q0"], ["chunk-1-q0"], ["chunk-2-q0"]]
+    # Only the requests the cancelled batch had not finished were submitted again
+    assert responder.seen == ["chunk-0", "chunk-1", "chunk-2", "chunk-1", "chunk-2"]
@@ -0,0 +1,155 @@
+import asyncio
+import time
+from typing import List
+from unittest.mock import MagicMock
+
+import pytest
+from openai import OpenAIError
+from openai.types.chat import ChatCompletionChunk
+
+from findodo.config import PromptConfig, ProviderConfig
+from findodo.core.providing import BaseProvider
+from findodo.models import DatasetItem, QAPair
+from findodo.providers.cache import CachedProvider, ResponseCache
+from findodo.providers.openai import OpenAIProvider
+
+
+class CountingProvider(BaseProvider):
+    """Fake provider that records how often it was really called."""
+
+    def __init__(self, temperature: float = 0.0) -> None:
+        super().__init__(
+            ProviderConfig(name="fake", model="gpt-test", temperature=temperature),
+            PromptConfig(name="default", system_prompt="Sys"),
+        )
+        self.calls = 0
+
+    def generate_qa(self, text: str, num_questions: int) -> List[DatasetItem]:
+        self.calls += 1
+        return [DatasetItem.from_chunk(QAPair(question=f"q{i}", answer="a"), text) for i in range(num_questions)]
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ResponseCache(tmp_path / "llm.sqlite")
+    yield cache
+    cache.close()
+
+
+def test_read_write_serves_second_call_from_cache(cache):
+    inner = CountingProvider()
+    provider = CachedProvider(inner, cache, mode="read_write")
+
+    first = provider.generate_qa("chunk", 2)
+    second = provider.generate_qa("chunk", 2)
+
+    assert inner.calls == 1
+    assert first == second
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_key_depends_on_generation_inputs(cache):
+    provider = CachedProvider(CountingProvider(), cache)
+    provider.generate_qa("chunk", 2)
+
+    # A different question count or temperature must not hit the same entry
+    provider.generate_qa("chunk", 3)
+    CachedProvider(CountingProvider(temperature=0.7), cache).generate_qa("chunk", 2)
+
+    assert len(cache) == 3
+
+
+def test_read_only_and_bypass_modes(cache):
+    inner = CountingProvider()
+    CachedProvider(inner, cache, mode="read_only").generate_qa("chunk", 1)
+    assert len(cache) == 0
+
+    CachedProvider(inner, cache, mode="read_write").generate_qa("chunk", 1)
+    CachedProvider(inner, cache, mode="bypass").generate_qa("chunk", 1)
+    assert inner.calls == 3
+
+
+def test_async_path_uses_cache(cache):
+    inner = CountingProvider()
+    provider = CachedProvider(inner, cache)
+
+    async def run():
+        await provider.agenerate_qa("chunk", 1)
+        return await provider.agenerate_qa("chunk", 1)
+
+    items = asyncio.run(run())
+    assert inner.calls == 1
+    assert items[0].context == "chunk"
+
+
+def test_eviction_by_size_and_age(tmp_path):
+    # Each entry stores only its QA pair (roughly 35 bytes), so an 80 byte budget keeps the two most recent ones
+    cache = ResponseCache(tmp_path / "llm.sqlite", max_size_mb=80 / (1024 * 1024))
+    provider = CachedProvider(CountingProvider(), cache)
+    for i in range(4):
+        provider.generate_qa(f"chunk-{i}" + "x" * 100, 1)
+        time.sleep(0.01)
+
+    assert cache.evict() == 2
+    assert len(cache) == 2
+
+    cache.max_age_seconds = 0.0
+    time.sleep(0.01)
+    cache.evict()
+    assert len(cache) == 0
+    cache.close()
+
+
+def test_stream_that_errors_midway_is_not_cached(cache, monkeypatch):
+    chunk = "The segment's revenue grew 12% in fiscal 2023."
+    inner = OpenAIProvider(
+        ProviderConfig(name="openai", model="gpt-test", api_key="sk-fake", stream=True),
+        PromptConfig(name="default", system_prompt="Sys"),
+    )
+    arguments = '{"items": [{"question": "q1", "answer": "a1"}, {"question": "q2"'
+
+    first = ChatCompletionChunk.model_validate(
+        {
+            "id": "s1",
+            "object": "chat.completion.chunk",
+            "created": 0,
+            "model": "gpt-test",
+            "choices": [{"index": 0, "delta": {"tool_calls": [{"index": 0, "function": {"arguments": arguments}}]}}],
+        }
+    )
+
+    def broken_stream(**kwargs):
+        def chunks():
+            yield first
+            raise OpenAIError("connection reset")
+
+        stream = MagicMock()
+        stream.__iter__.side_effect = chunks
+        return stream
+
+    create = MagicMock(side_effect=broken_stream)
+    monkeypatch.setattr(inner.client.chat.completions, "create", create)
+    provider = CachedProvider(inner, cache)
+
+    assert [item.question for item in provider.stream_qa(chunk, 2)] == ["q1"]
+    assert not provider.is_cached(chunk, 2)
+
+    # The rerun asks again instead of replaying the short answer
+    list(provider.stream_qa(chunk, 2))
+    assert create.call_count == 2
+
+
+def test_packed_chunks_that_got_too_few_items_are_not_cached(cache):
+    class ShortPackedProvider(CountingProvider):
+        def generate_packed(self, requests):
+            self.calls += 1
+            return [self.generate_qa(text, 1) for text, _ in requests]
+
+    inner = ShortPackedProvider()
+    provider = CachedProvider(inner, cache)
+
+    provider.generate_packed([("first", 1), ("second", 2)])
+
+    assert provider.is_cached("first", 1)
+    assert not provider.is_cached("second", 2)
@@ -1,20 +1,18 @@
+import asyncio
 import json
 import pytest
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock
+from openai.types.chat import ChatCompletionChunk
 from findodo.providers.openai import OpenAIProvider
 from findodo.config import ProviderConfig, PromptConfig
 
 # 1. Define mock payloads from the OpenAI API
 
 # This is what a "good" response looks like
-GOOD_PAYLOAD = {
-    "items": [{"question": "q1", "answer": "a1", "context": "c1"}, {"question": "q2", "answer": "a2", "context": "c2"}]
-}
+GOOD_PAYLOAD = {"items": [{"question": "q1", "answer": "a1"}, {"question": "q2", "answer": "a2"}]}
 
-# This is the "bad" response (The second item is missing the 'context' field)
-BAD_PAYLOAD_MISSING_FIELD = {
-    "items": [{"question": "q1", "answer": "a1", "context": "c1"}, {"question": "q_bad", "answer": "a_bad"}]
-}
+# This is the "bad" response (The second item is missing the 'answer' field)
+BAD_PAYLOAD_MISSING_FIELD = {"items": [{"question": "q1", "answer": "a1"}, {"question": "q_bad"}]}
 
 
 # Helper function to create the complex, nested mock object
@@ -63,11 +61,11 @@ def test_generate_qa_success(provider, monkeypatch):
     assert messages[0]["content"] == "You are a helpful assistant."
 
 
-def test_generate_qa_robustness_skips_bad_item(provider, monkeypatch, capsys):
+def test_generate_qa_robustness_skips_bad_item(provider, monkeypatch):
     """
     Tests our bug fix!
     Ensures that when the API returns a malformed item,
-    we log a warning and return *only* the valid items, NOT crash.
+    we record it in the parse report and return *only* the valid items, NOT crash.
     """
     mock_create = MagicMock(return_value=create_mock_api_response(BAD_PAYLOAD_MISSING_FIELD))
     monkeypatch.setattr(provider.client.chat.completions, "create", mock_create)
@@ -77,5 +75,148 @@ def test_generate_qa_robustness_skips_bad_item(provider, monkeypatch, capsys):
     assert len(result) == 1
     assert result[0].question == "q1"
 
-    captured = capsys.readouterr()
-    assert "Warning: Dropped one malformed QA pair" in captured.out
+    assert provider.parse_report.malformed == 1
+    assert provider.parse_report.errors == ["items[1].answer: Field required"]
+
+
+def test_response_without_choices_yields_no_items(provider, monkeypatch):
+    empty = create_mock_api_response(GOOD_PAYLOAD)
+    empty.choices = []
+    monkeypatch.setattr(provider.client.chat.completions, "create", MagicMock(return_value=empty))
+
+    assert provider.generate_qa("some text", 2) == []
+    assert provider.generate_packed([("a", 1), ("b", 1)]) == [[], []]
+    assert provider.parse_report.invalid == 2
+
+
+def test_agenerate_qa_uses_async_client(provider, monkeypatch):
+    """The async path must hit AsyncOpenAI and share the same response parsing."""
+
+    async def run():
+        mock_create = AsyncMock(return_value=create_mock_api_response(GOOD_PAYLOAD))
+        monkeypatch.setattr(provider.async_client.chat.completions, "create", mock_create)
+        return await provider.agenerate_qa("some text", 2), mock_create
+
+    result, mock_create = asyncio.run(run())
+
+    assert [item.question for item in result] == ["q1", "q2"]
+    assert mock_create.call_args.kwargs["messages"][1]["content"].startswith("Generate 2 questions")
+
+
+def test_generate_packed_demultiplexes_by_chunk_id(provider, monkeypatch):
+    payload = {
+        "items": [
+            {"question": "q-b", "answer": "a", "chunk_id": 1},
+            {"question": "q-a", "answer": "a", "chunk_id": 0},
+            {"question": "q-extra", "answer": "a", "chunk_id": 0},
+            {"question": "q-lost", "answer": "a", "chunk_id": 7},
+        ]
+    }
+    mock_create = MagicMock(return_value=create_mock_api_response(payload))
+    monkeypatch.setattr(provider.client.chat.completions, "create", mock_create)
+
+    results = provider.generate_packed([("first text", 1), ("second text", 1)])
+
+    # One request for both chunks, items routed by ID, capped at the requested count, unknown IDs dropped
+    assert mock_create.call_count == 1
+    assert [[item.question for item in items] for items in results] == [["q-a"], ["q-b"]]
+    kwargs = mock_create.call_args.kwargs
+    assert '<chunk id="1" questions="1">' in kwargs["messages"][1]["content"]
+    assert "chunk_id" in kwargs["tools"][0]["function"]["parameters"]["properties"]["items"]["items"]["required"]
+
+
+def create_mock_stream(payload, piece_size=7):
+    """A streamed completion whose tool-call arguments arrive in small deltas, closed by a usage chunk."""
+    arguments = json.dumps(payload)
+    chunks = [
+        ChatCompletionChunk.model_validate(
+            {
+                "id": "s1",
+                "object": "chat.completion.chunk",
+                "created": 0,
+                "model": "gpt-4-test",
+                "choices": [
+                    {
+                        "index": 0,
+                        "delta": {
+                            "tool_calls": [{"index": 0, "function": {"arguments": arguments[i : i + piece_size]}}]
+                        },
+                    }
+                ],
+            }
+        )
+        for i in range(0, len(arguments), piece_size)
+    ]
+    chunks.append(
+        ChatCompletionChunk.model_validate(
+            {
+                "id": "s1",
+                "object": "chat.completion.chunk",
+                "created": 0,
+                "model": "gpt-4-test",
+                "choices": [],
+                "usage": {"prompt_tokens": 10, "completion_tokens": 20, "total_tokens": 30},
+            }
+        )
+    )
+    stream = MagicMock()
+    stream.__iter__.return_value = iter(chunks)
+    return stream, chunks
+
+
+def test_stream_qa_emits_items_before_the_stream_ends(provider, monkeypatch):
+    provider.stream = True
+    stream, chunks = create_mock_stream(GOOD_PAYLOAD)
+    mock_create = MagicMock(return_value=stream)
+    monkeypatch.setattr(provider.client.chat.completions, "create", mock_create)
+
+    items = provider.stream_qa("some text", 2)
+    first = next(items)
+    remaining = stream.__iter__.return_value
+
+    # The first item is out while the second is still being streamed
+    assert first.question == "q1"
+    assert len(list(remaining)) > 0
+    assert mock_create.call_args.kwargs["stream"] is True
+
+
+def test_stream_qa_stops_reading_once_the_quota_is_met(provider, monkeypatch):
+    provider.stream = True
+    stream, _ = create_mock_stream(GOOD_PAYLOAD)
+    monkeypatch.setattr(provider.client.chat.completions, "create", MagicMock(return_value=stream))
+
+    result = provider.generate_qa("some text", 1)
+
+    assert [item.question for item in result] == ["q1"]
+    stream.close.assert_called_once()
+    assert provider.parse_report.truncated == 0
+
+
+def test_astream_qa_streams_from_the_async_client(provider, monkeypatch):
+    provider.stream = True
+
+    class AsyncStream:
+        def __init__(self, chunks):
+            self.chunks = chunks
+            self.closed = False
+
+        def __aiter__(self):
+            return self._iterate()
+
+        async def _iterate(self):
+            for chunk in self.chunks:
+                yield chunk
+
+        async def close(self):
+            self.closed = True
+
+    async def run():
+        stream = AsyncStream(create_mock_stream(BAD_PAYLOAD_MISSING_FIELD)[1])
+        monkeypatch.setattr(provider.async_client.chat.completions, "create", AsyncMock(return_value=stream))
+        return [item async for item in provider.astream_qa("some text", 2)], stream
+
+    result, stream = asyncio.run(run())
+
+    assert [item.question for item in result] == ["q1"]
+    assert stream.closed
+    assert provider.parse_report.malformed == 1
@@ -0,0 +1,182 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from findodo.config import PromptConfig, ProviderConfig, RateLimitConfig
+from findodo.providers.openai import OpenAIProvider
+from findodo.providers.ratelimit import RateLimiter, TokenBucket
+
+COMPLETION = {
+    "id": "chatcmpl-fake",
+    "object": "chat.completion",
+    "created": 0,
+    "model": "gpt-test",
+    "choices": [
+        {
+            "index": 0,
+            "finish_reason": "tool_calls",
+            "message": {
+                "role": "assistant",
+                "content": None,
+                "tool_calls": [
+                    {
+                        "id": "call_0",
+                        "type": "function",
+                        "function": {
+                            "name": "generate_dataset",
+                            "arguments": json.dumps({"items": [{"question": "q", "answer": "a", "context": "c"}]}),
+                        },
+                    }
+                ],
+            },
+        }
+    ],
+    "usage": {"prompt_tokens": 50, "completion_tokens": 20, "total_tokens": 70},
+}
+
+
+class FakeOpenAIServer:
+    """Local OpenAI-compatible endpoint that answers the first `rate_limited` requests with `status` (a 429)."""
+
+    def __init__(self, rate_limited: int = 0, retry_after: float = 0.2, status: int = 429):
+        self.remaining_429s = rate_limited
+        self.requests = 0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self) -> None:
+                self.rfile.read(int(self.headers["Content-Length"]))
+                server.requests += 1
+                if server.remaining_429s > 0:
+                    server.remaining_429s -= 1
+                    body = json.dumps({"error": {"message": "Rate limit reached", "type": "rate_limit"}})
+                    self.send_response(status)
+                    self.send_header("Retry-After", str(retry_after))
+                else:
+                    body = json.dumps(COMPLETION)
+                    self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.end_headers()
+                self.wfile.write(body.encode())
+
+            def log_message(self, *args: object) -> None:
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}/v1"
+
+    def __enter__(self) -> "FakeOpenAIServer":
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.httpd.shutdown()
+
+
+def _provider(url: str, max_concurrency: int = 4) -> OpenAIProvider:
+    config = ProviderConfig(
+        name="openai",
+        model="gpt-test",
+        api_key="sk-fake",
+        base_url=url,
+        max_concurrency=max_concurrency,
+        rate_limit=RateLimitConfig(enabled=True, requests_per_minute=6000, tokens_per_minute=1_000_000),
+    )
+    return OpenAIProvider(config, PromptConfig(name="default", system_prompt="Sys"))
+
+
+def test_token_bucket_reports_wait_once_empty():
+    bucket = TokenBucket(per_minute=60)  # one per second
+    now = time.monotonic()
+
+    assert bucket.reserve(60, now) == 0.0
+    assert bucket.reserve(1, now) == pytest.approx(1.0)
+    # Later reservations queue behind earlier ones
+    assert bucket.reserve(1, now) == pytest.approx(2.0)
+
+
+def test_aimd_shrinks_on_429_and_grows_on_success():
+    limiter = RateLimiter(max_concurrency=8, min_concurrency=1)
+
+    limiter.record(rate_limited=True)
+    assert limiter.concurrency == 4
+    # A second 429 from the same burst is ignored
+    limiter.record(rate_limited=True)
+    assert limiter.concurrency == 4
+
+    for _ in range(40):
+        limiter.record(latency=0.1)
+    assert limiter.concurrency == 8
+
+
+def test_slow_responses_shrink_concurrency():
+    limiter = RateLimiter(max_concurrency=10, target_latency=1.0)
+    limiter.record(latency=5.0)
+    assert limiter.limit == pytest.approx(9.0)
+
+
+def test_cancelled_acquire_gives_its_slot_back():
+    limiter = RateLimiter(requests_per_minute=1, max_concurrency=1)
+
+    async def run():
+        await limiter.acquire(0)  # the bucket's burst
+        await limiter.release()
+        waiting = asyncio.create_task(limiter.acquire(0))  # now waits ~60s for the bucket
+        await asyncio.sleep(0.05)
+        assert limiter.in_flight == 1
+        waiting.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+
+    asyncio.run(run())
+    assert limiter.in_flight == 0
+
+
+def test_provider_honors_retry_after_from_server():
+    with FakeOpenAIServer(rate_limited=1, retry_after=0.3) as server:
+        provider = _provider(server.url)
+        start = time.monotonic()
+        items = provider.generate_qa("some text", 1)
+        elapsed = time.monotonic() - start
+
+    assert [item.question for item in items] == ["q"]
+    assert server.requests == 2
+    assert elapsed >= 0.3
+    assert provider.rate_limiter.rate_limited == 1
+
+
+def test_sync_requests_record_failed_attempts_too():
+    with FakeOpenAIServer(rate_limited=1, retry_after=0.05, status=503) as server:
+        provider = _provider(server.url, max_concurrency=1)
+        recorded = []
+        record = provider.rate_limiter.record
+
+        def spy(latency=None, rate_limited=False):
+            recorded.append(rate_limited)
+            record(latency, rate_limited)
+
+        provider.rate_limiter.record = spy
+        items = provider.generate_qa("some text", 1)
+
+    assert len(items) == 1
+    # The 503 and the successful retry both reached the controller; only 429s count as rate limited
+    assert recorded == [False, False]
+    assert provider.rate_limiter.rate_limited == 0
+
+
+def test_async_workers_share_the_controller():
+    with FakeOpenAIServer(rate_limited=2, retry_after=0.1) as server:
+        provider = _provider(server.url, max_concurrency=4)
+
+        async def run():
+            return await asyncio.gather(*(provider.agenerate_qa(f"text {i}", 1) for i in range(6)))
+
+        results = asyncio.run(run())
+
+    assert all(len(items) == 1 for items in results)
+    assert provider.rate_limiter.rate_limited == 2
+    assert provider.rate_limiter.in_flight == 0
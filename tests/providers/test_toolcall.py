@@ -0,0 +1,48 @@
+import json
+
+from findodo.models import QAPair
+from findodo.providers.toolcall import PackedItem, parse_tool_items
+
+GOOD = {"items": [{"question": "q1", "answer": "a1"}, {"question": "q2", "answer": "a2"}]}
+
+
+def test_valid_payload_takes_the_fast_path():
+    items, report = parse_tool_items(json.dumps(GOOD), QAPair)
+
+    assert [item.question for item in items] == ["q1", "q2"]
+    assert (report.items, report.malformed, report.truncated, report.errors) == (2, 0, 0, [])
+
+
+def test_malformed_items_are_dropped_individually():
+    payload = {"items": [{"question": "q1"}, GOOD["items"][1], {"question": "q3", "answer": 3}]}
+
+    items, report = parse_tool_items(json.dumps(payload), QAPair)
+
+    assert [item.question for item in items] == ["q2"]
+    assert report.malformed == 2
+    assert report.errors[0] == "items[0].answer: Field required"
+    assert report.errors[1].startswith("items[2].answer:")
+
+
+def test_truncated_json_keeps_complete_items():
+    arguments = json.dumps(GOOD)
+    cut = arguments[: arguments.index('"a2"') - 3]
+
+    items, report = parse_tool_items(cut, QAPair)
+
+    assert [item.question for item in items] == ["q1"]
+    assert (report.truncated, report.incomplete, report.malformed) == (1, 1, 0)
+
+
+def test_unreadable_arguments_are_reported():
+    assert parse_tool_items("not json", QAPair)[1].invalid == 1
+    assert parse_tool_items('{"answers": []}', QAPair)[1].errors == ["arguments have no items array"]
+
+
+def test_packed_items_keep_their_chunk_id():
+    payload = {"items": [{**GOOD["items"][0], "chunk_id": 1}]}
+
+    items, _ = parse_tool_items(json.dumps(payload), PackedItem)
+
+    assert items[0].chunk_id == 1
+    assert items[0].model_dump(include={"question", "answer"}) == GOOD["items"][0]
@@ -0,0 +1,65 @@
+import multiprocessing
+import time
+
+from findodo.config import ChunkerConfig, ParserConfig
+from findodo.storage import ChunkStore
+
+CHUNKS = ["Revenue grew 8%.", "", "Résumé of the €391bn year — 営業利益", "Last chunk"]
+
+
+def _slow_parse(root, log_path):
+    def parse():
+        with open(log_path, "a") as f:
+            f.write("parsed\n")
+        time.sleep(0.3)
+        return CHUNKS
+
+    ChunkStore(root, poll_interval_s=0.05).get_or_create({"target": "AAPL"}, parse)
+
+
+def test_save_and_memory_mapped_load_roundtrip(tmp_path):
+    store = ChunkStore(tmp_path)
+    store.save("abc", CHUNKS)
+
+    artifact = store.load("abc")
+
+    assert len(artifact) == 4
+    assert list(artifact) == CHUNKS
+    assert artifact[-2] == CHUNKS[2]
+    assert artifact[1:3] == CHUNKS[1:3]
+    assert store.load("missing") is None
+    assert list(store.save("empty", [])) == []
+
+
+def test_artifact_releases_its_file_when_the_block_exits(tmp_path):
+    store = ChunkStore(tmp_path)
+    store.save("abc", CHUNKS).close()
+
+    with store.load("abc") as artifact:
+        assert artifact[0] == CHUNKS[0]
+
+    assert artifact.closed
+    assert len(artifact) == 0
+
+
+def test_key_ignores_runtime_only_parser_settings():
+    chunker = ChunkerConfig(chunk_size=100, chunk_overlap=10)
+    fast = ChunkStore.make_key(ParserConfig(name="pdf", page_workers=8), chunker, target="a.pdf")
+    slow = ChunkStore.make_key(ParserConfig(name="pdf", page_workers=0), chunker, target="a.pdf")
+    other = ChunkStore.make_key(ParserConfig(name="pdf"), ChunkerConfig(chunk_size=200), target="a.pdf")
+
+    assert fast == slow
+    assert fast != other
+
+
+def test_concurrent_jobs_parse_only_once(tmp_path):
+    log_path = tmp_path / "parses.log"
+    jobs = [multiprocessing.Process(target=_slow_parse, args=(tmp_path / "store", log_path)) for _ in range(3)]
+    for job in jobs:
+        job.start()
+    for job in jobs:
+        job.join(timeout=30)
+
+    assert log_path.read_text().splitlines() == ["parsed"]
+    artifacts = [path for path in (tmp_path / "store").iterdir() if not path.name.endswith(".lock")]
+    assert len(artifacts) == 1
@@ -0,0 +1,68 @@
+import json
+
+import pytest
+
+from findodo.models import DatasetItem, QAPair, make_chunk_id
+from findodo.storage import CompactJsonlWriter, CompactParquetWriter, load_compact, open_writer
+
+TEXTS = ["first chunk " * 50, "second chunk " * 50]
+
+
+def make_items():
+    # Three questions on the first chunk, one on the second
+    return [DatasetItem.from_chunk(QAPair(question=f"q{i}", answer=f"a{i}"), TEXTS[i // 3]) for i in range(4)]
+
+
+def write(writer):
+    with writer:
+        writer.begin_target("AAPL", TEXTS)
+        for item in make_items():
+            writer.write(item)
+
+
+def test_chunk_text_is_stored_once(tmp_path):
+    path = tmp_path / "run"
+    write(CompactJsonlWriter(path))
+
+    chunks = [json.loads(line) for line in (path / "chunks.jsonl").read_text(encoding="utf-8").splitlines()]
+    rows = [json.loads(line) for line in (path / "qa.jsonl").read_text(encoding="utf-8").splitlines()]
+
+    assert [(c["chunk_id"], c["source"], c["index"]) for c in chunks] == [
+        (make_chunk_id(TEXTS[0]), "AAPL", 0),
+        (make_chunk_id(TEXTS[1]), "AAPL", 1),
+    ]
+    assert [set(row) for row in rows] == [{"question", "answer", "chunk_id"}] * 4
+
+
+def test_loader_rehydrates_items(tmp_path):
+    path = tmp_path / "run"
+    write(open_writer(path, "jsonl", layout="compact"))
+
+    dataset = load_compact(path)
+
+    assert len(dataset) == 4
+    assert list(dataset) == make_items()
+    assert dataset[3].context == TEXTS[1]
+    # Items of the same chunk share its text instead of holding copies
+    assert dataset[0].context is dataset[1].context
+
+
+def test_rows_without_their_chunk_are_skipped(tmp_path):
+    path = tmp_path / "run"
+    write(CompactJsonlWriter(path))
+    with open(path / "qa.jsonl", "a", encoding="utf-8") as f:
+        f.write(json.dumps({"question": "q", "answer": "a", "chunk_id": "missing"}) + "\n")
+        f.write('{"question": "cut')
+
+    assert len(load_compact(path)) == 4
+
+
+def test_parquet_tables_round_trip(tmp_path):
+    pytest.importorskip("pyarrow")
+    path = tmp_path / "run"
+    write(CompactParquetWriter(path, row_group_size=2))
+
+    dataset = load_compact(path)
+
+    assert sorted(dataset.chunks) == sorted(make_chunk_id(text) for text in TEXTS)
+    assert dataset.to_dataset().items == make_items()
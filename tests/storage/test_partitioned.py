@@ -0,0 +1,91 @@
+import pytest
+
+from findodo.models import DatasetItem, DatasetPartition, SECJob
+from findodo.storage import iter_partitioned, open_writer, read_partitioned
+
+pytest.importorskip("pyarrow")
+
+FILINGS = [("AAPL", 2022, None), ("AAPL", 2023, None), ("MSFT", 2023, 2)]
+
+
+def write_run(root, run_id, with_pdf=False):
+    with open_writer(root, "parquet", "partitioned", run_id=run_id, row_group_size=2) as writer:
+        for ticker, year, quarter in FILINGS:
+            writer.begin_target(ticker, (), SECJob(ticker=ticker, year=year, quarter=quarter).partition)
+            for i in range(3):
+                writer.write(DatasetItem(question=f"{ticker}-{year}-q{i}", answer="a", context=f"{ticker} {year}"))
+        if with_pdf:
+            writer.begin_target("report.pdf", ())
+            writer.write(DatasetItem(question="pdf-q", answer="a", context="pdf"))
+    return writer
+
+
+def test_items_land_in_hive_partitions(tmp_path):
+    writer = write_run(tmp_path, "run1")
+
+    files = sorted(p.relative_to(tmp_path).as_posix() for p in tmp_path.rglob("*.parquet"))
+    assert files == [
+        "ticker=AAPL/year=2022/form=10-K/run_id=run1/part-0.parquet",
+        "ticker=AAPL/year=2023/form=10-K/run_id=run1/part-0.parquet",
+        "ticker=MSFT/year=2023/form=10-Q/run_id=run1/part-0.parquet",
+    ]
+    assert writer.count == 9
+    # No in-progress files are left behind
+    assert not list(tmp_path.rglob(".*"))
+
+
+def test_filtered_read_skips_partitions_and_projects_columns(tmp_path):
+    write_run(tmp_path, "run1")
+    write_run(tmp_path, "run2")
+
+    table = read_partitioned(
+        tmp_path, columns=["question", "year"], filters=[("ticker", "=", "AAPL"), ("year", ">=", 2023)]
+    )
+
+    assert table.column_names == ["question", "year"]
+    assert sorted(table.column("question").to_pylist()) == sorted(["AAPL-2023-q0", "AAPL-2023-q1", "AAPL-2023-q2"] * 2)
+    assert read_partitioned(tmp_path, filters=[("run_id", "=", "run2")]).num_rows == 9
+
+
+def test_targets_without_partition_are_readable_as_null(tmp_path):
+    write_run(tmp_path, "run1", with_pdf=True)
+
+    rows = [row for row in read_partitioned(tmp_path).to_pylist() if row["ticker"] is None]
+
+    assert [(row["question"], row["year"], row["form"]) for row in rows] == [("pdf-q", None, None)]
+
+
+def test_iter_partitioned_yields_dataset_items(tmp_path):
+    write_run(tmp_path, "run1")
+
+    items = list(iter_partitioned(tmp_path, filters=[("form", "=", "10-Q")], batch_size=2))
+
+    assert [item.question for item in items] == ["MSFT-2023-q0", "MSFT-2023-q1", "MSFT-2023-q2"]
+    assert items[0] == DatasetItem(question="MSFT-2023-q0", answer="a", context="MSFT 2023")
+
+
+def test_only_the_current_target_is_held_open(tmp_path):
+    with open_writer(tmp_path, "parquet", "partitioned", run_id="run1") as writer:
+        for year in range(2000, 2040):
+            writer.begin_target(f"AAPL {year}", (), DatasetPartition.for_filing("AAPL", year))
+            writer.write(DatasetItem(question=f"q{year}", answer="a", context="c"))
+            # Earlier targets are already finished and renamed into place
+            assert len(list(tmp_path.rglob(".*.inprogress"))) <= 1
+            assert len(list(tmp_path.rglob("*.parquet"))) == year - 2000
+        # A partition seen again gets its own part file instead of overwriting the first
+        writer.begin_target("AAPL 2000", (), DatasetPartition.for_filing("AAPL", 2000))
+        writer.write(DatasetItem(question="again", answer="a", context="c"))
+
+    assert len(list(tmp_path.rglob("*.parquet"))) == 41
+    assert (tmp_path / "ticker=AAPL/year=2000/form=10-K/run_id=run1/part-1.parquet").exists()
+    assert read_partitioned(tmp_path, filters=[("year", "=", 2000)]).num_rows == 2
+
+
+def test_partition_for_filing():
+    assert DatasetPartition.for_filing("aapl", 2023) == DatasetPartition(ticker="AAPL", year=2023, form="10-K")
+    assert SECJob(ticker="MSFT", year=2024, quarter=1).partition.form == "10-Q"
+
+
+def test_partitioned_layout_requires_parquet(tmp_path):
+    with pytest.raises(ValueError):
+        open_writer(tmp_path, "jsonl", "partitioned", run_id="run1")
@@ -0,0 +1,47 @@
+import pytest
+
+from findodo.models import DatasetItem
+from findodo.storage import JsonlWriter, ParquetWriter, open_writer, read_jsonl
+
+
+def make_items(n):
+    return [DatasetItem(question=f"q{i}", answer=f"a{i}", context=f"c{i}") for i in range(n)]
+
+
+def test_jsonl_writer_persists_each_item_immediately(tmp_path):
+    path = tmp_path / "out" / "run.jsonl"
+    writer = JsonlWriter(path)
+    writer.write(make_items(1)[0])
+
+    # Readable before close, i.e. a crash would not lose it
+    assert read_jsonl(path) == make_items(1)
+    writer.close()
+
+
+def test_read_jsonl_skips_truncated_last_line(tmp_path):
+    path = tmp_path / "run.jsonl"
+    with open_writer(path, "jsonl") as writer:
+        for item in make_items(3):
+            writer.write(item)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"question": "cut')
+
+    assert len(read_jsonl(path)) == 3
+
+
+def test_parquet_writer_flushes_row_groups(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = tmp_path / "run.parquet"
+
+    with ParquetWriter(path, row_group_size=2) as writer:
+        for item in make_items(5):
+            writer.write(item)
+
+    parquet_file = pq.ParquetFile(path)
+    assert parquet_file.metadata.num_row_groups == 3
+    assert parquet_file.read().column("question").to_pylist() == [f"q{i}" for i in range(5)]
+
+
+def test_open_writer_rejects_unknown_format(tmp_path):
+    with pytest.raises(ValueError):
+        open_writer(tmp_path / "run.csv", "csv")
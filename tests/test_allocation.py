@@ -0,0 +1,82 @@
+import tiktoken
+
+from findodo.allocation import allocate_proportionally, plan_allocation
+from findodo.config import AllocationConfig
+
+ENCODING = tiktoken.get_encoding("cl100k_base")
+
+TOC = "TABLE OF CONTENTS Part I Item 1. Business ........ 4 Item 1A. Risk Factors ........ 12 " * 3
+SIGNATURES = (
+    "Pursuant to the requirements of the Securities Exchange Act of 1934, the registrant has duly caused "
+    "this report to be signed on its behalf by the undersigned, thereunto duly authorized. /s/ Tim Cook "
+) * 2
+PROSE = "The company expanded its services business and invested in research across several markets. " * 6
+FINANCIALS = "Net sales rose 8% to $383,285 million while operating income reached $114,301 million in 2023. " * 6
+
+
+def test_allocate_proportionally_uses_largest_remainders():
+    assert allocate_proportionally([1, 1, 2], 4) == [1, 1, 2]
+    assert allocate_proportionally([1, 1, 1], 4) == [2, 1, 1]
+    assert allocate_proportionally([0, 3, 1], 2) == [0, 2, 0]
+    assert allocate_proportionally([0, 0], 5) == [0, 0]
+
+
+def test_plan_skips_boilerplate_duplicates_and_short_chunks():
+    texts = [TOC, PROSE, FINANCIALS, "Page 3", SIGNATURES, FINANCIALS.upper()]
+
+    plan = plan_allocation(texts, 10, ENCODING, AllocationConfig(strategy="weighted"))
+
+    assert [chunk.skipped for chunk in plan.chunks] == [
+        "boilerplate",
+        None,
+        None,
+        "short",
+        "boilerplate",
+        "duplicate",
+    ]
+    assert plan.chunks[5].duplicate_of == 2
+    assert sum(plan.allocation) == 10
+    # The number-heavy chunk outweighs plain prose
+    assert plan.allocation[2] > plan.allocation[1] > 0
+    assert plan.summary()["chunks_skipped"] == 4
+
+
+def test_plan_falls_back_to_even_split_when_everything_is_skipped():
+    plan = plan_allocation(["short", "tiny"], 3, ENCODING, AllocationConfig(strategy="weighted"))
+
+    assert plan.allocation == [2, 1]
+
+
+def topic_chunks(topic, count):
+    words = {
+        "cover": "registrant annual report fiscal year commission file number address telephone",
+        "risk": "competition supply chain cybersecurity regulation litigation currency volatility",
+        "mdna": "net sales gross margin operating expenses segment results liquidity outlook",
+        "financials": "balance sheet cash flows equity deferred revenue depreciation marketable securities",
+    }[topic].split()
+    return [" ".join(words[(i + j) % len(words)] for j in range(120)) + f" section {i}" for i in range(count)]
+
+
+def test_diverse_plan_spreads_a_small_budget_across_topics():
+    topics = ["cover", "risk", "mdna", "financials"]
+    texts = [text for topic in topics for text in topic_chunks(topic, 20)]
+    config = AllocationConfig(strategy="diverse", questions_per_chunk=2)
+
+    plan = plan_allocation(texts, 8, ENCODING, config, seed=7)
+
+    covered = {topics[chunk.index // 20] for chunk in plan.chunks if chunk.questions}
+    assert covered == set(topics)
+    assert sum(plan.allocation) == 8
+    assert plan.summary()["chunks_not_selected"] == 76
+    assert sum(chunk.represents or 0 for chunk in plan.chunks) == 80
+    # Deterministic under the seed
+    assert plan_allocation(texts, 8, ENCODING, config, seed=7).allocation == plan.allocation
+
+
+def test_diverse_plan_matches_weighted_when_the_budget_covers_every_chunk():
+    texts = [PROSE, FINANCIALS]
+
+    diverse = plan_allocation(texts, 10, ENCODING, AllocationConfig(strategy="diverse"))
+    weighted = plan_allocation(texts, 10, ENCODING, AllocationConfig(strategy="weighted"))
+
+    assert diverse.allocation == weighted.allocation
@@ -0,0 +1,131 @@
+import time
+from datetime import date
+from typing import List
+
+import pytest
+
+from findodo.bulk import BulkSECPipeline
+from findodo.config import ChunkerConfig, Config, ParserConfig, PromptConfig, ProviderConfig
+from findodo.core.providing import BaseProvider
+from findodo.generator import Generator
+from findodo.models import DatasetItem, SECJob
+from findodo.parsers import sec
+from findodo.storage import JsonlWriter, read_jsonl
+
+
+class EchoProvider(BaseProvider):
+    def __init__(self) -> None:
+        super().__init__(config=None, prompt_config=None)
+
+    def generate_qa(self, text: str, num_questions: int) -> List[DatasetItem]:
+        return [DatasetItem(question="q", answer="a", context=text) for _ in range(num_questions)]
+
+
+class FakeFilingObject:
+    def __init__(self, ticker):
+        self.texts = {"Item 1": f"{ticker} business", "Item 7": f"{ticker} results"}
+        self.items = list(self.texts)
+
+    def __getitem__(self, item):
+        return self.texts[item]
+
+
+class FakeFiling:
+    filing_date = date(2023, 11, 3)
+    quarter = None
+
+    def __init__(self, ticker):
+        self.ticker = ticker
+
+    def obj(self):
+        return FakeFilingObject(self.ticker)
+
+
+class FakeCompany:
+    def __init__(self, ticker):
+        if ticker == "BAD":
+            raise ValueError("unknown ticker")
+        self.ticker = ticker
+
+    def get_filings(self, form):
+        return [FakeFiling(self.ticker)]
+
+
+@pytest.fixture
+def generator(tmp_path, monkeypatch):
+    monkeypatch.setattr(sec, "Company", FakeCompany)
+    config = Config(
+        chunker=ChunkerConfig(chunk_size=100, chunk_overlap=0),
+        parser=ParserConfig(name="sec", cache_dir=str(tmp_path / "sec"), edgar_requests_per_second=1000),
+        provider=ProviderConfig(name="openai", model="gpt-test"),
+        prompt=PromptConfig(name="default", system_prompt="Sys"),
+    )
+    return Generator(config, provider=EchoProvider())
+
+
+def test_bad_ticker_does_not_abort_the_batch(tmp_path, generator):
+    jobs = [SECJob(ticker="AAPL", year=2023), SECJob(ticker="BAD", year=2023), SECJob(ticker="MSFT", year=2023)]
+    pipeline = BulkSECPipeline(generator, fetch_workers=3, parse_workers=0)
+
+    with JsonlWriter(tmp_path / "out.jsonl") as writer:
+        results = pipeline.run(jobs, questions_per_job=2, writer=writer)
+
+    assert [r.status for r in results] == ["succeeded", "failed", "succeeded"]
+    assert "unknown ticker" in results[1].error
+    assert {item.context for item in read_jsonl(tmp_path / "out.jsonl")} == {
+        "AAPL business AAPL results",
+        "MSFT business MSFT results",
+    }
+
+
+def test_fetching_runs_at_most_a_window_ahead_of_the_consumer(generator, monkeypatch):
+    fetched = []
+    fetch_items = generator.sec_parser.fetch_items
+    monkeypatch.setattr(generator.sec_parser, "fetch_items", lambda *args: fetched.append(args) or fetch_items(*args))
+    jobs = [SECJob(ticker=f"T{i}", year=2023) for i in range(20)]
+    pipeline = BulkSECPipeline(generator, fetch_workers=2, parse_workers=0)
+
+    chunks = pipeline.iter_chunks(jobs)
+    next(chunks)
+    time.sleep(0.2)
+    # The consumer holds the first job: 4 jobs in flight, plus the one refilled after the first was yielded
+    assert len(fetched) <= 5
+
+    assert len(list(chunks)) == 19
+    assert len(fetched) == 20
+
+
+def test_job_items_filter_and_process_pool(tmp_path, generator):
+    jobs = [SECJob(ticker="AAPL", year=2023, items=["Item 7"])]
+    pipeline = BulkSECPipeline(generator, fetch_workers=1, parse_workers=1)
+
+    with JsonlWriter(tmp_path / "out.jsonl") as writer:
+        results = pipeline.run(jobs, questions_per_job=1, writer=writer)
+
+    assert results[0].num_chunks == 1
+    assert read_jsonl(tmp_path / "out.jsonl")[0].context == "AAPL results"
+
+
+class FailingMidwayProvider(EchoProvider):
+    """Delivers one item of MSFT's chunk, then fails."""
+
+    def stream_qa(self, text, num_questions):
+        yield from self.generate_qa(text, num_questions)[: 1 if "MSFT" in text else None]
+        if "MSFT" in text:
+            raise RuntimeError("connection reset")
+
+    async def astream_qa(self, text, num_questions):
+        for item in self.stream_qa(text, num_questions):
+            yield item
+
+
+def test_failed_job_reports_the_items_it_already_wrote(tmp_path, generator):
+    generator.provider = FailingMidwayProvider()
+    jobs = [SECJob(ticker="AAPL", year=2023), SECJob(ticker="MSFT", year=2023)]
+    pipeline = BulkSECPipeline(generator, fetch_workers=1, parse_workers=0)
+
+    with JsonlWriter(tmp_path / "out.jsonl") as writer:
+        results = pipeline.run(jobs, questions_per_job=2, writer=writer)
+
+    assert [(r.status, r.num_chunks, r.num_items) for r in results] == [("succeeded", 1, 2), ("failed", 1, 1)]
+    assert sum(r.num_items for r in results) == len(read_jsonl(tmp_path / "out.jsonl"))
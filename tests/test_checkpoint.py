@@ -0,0 +1,77 @@
+from typing import List
+
+from findodo.checkpoint import RunManifest
+from findodo.config import ChunkerConfig, Config, ParserConfig, PromptConfig, ProviderConfig
+from findodo.core.providing import BaseProvider
+from findodo.generator import Generator
+from findodo.models import DatasetItem
+
+
+class RecordingProvider(BaseProvider):
+    def __init__(self, fail_on: str = "") -> None:
+        super().__init__(config=None, prompt_config=None)
+        self.calls: List[str] = []
+        self.fail_on = fail_on
+
+    def generate_qa(self, text: str, num_questions: int) -> List[DatasetItem]:
+        self.calls.append(text)
+        if text == self.fail_on:
+            raise KeyboardInterrupt
+        return [DatasetItem(question=f"{text}-q{i}", answer="a", context=text) for i in range(num_questions)]
+
+
+def _config(run_dir=None) -> Config:
+    return Config(
+        chunker=ChunkerConfig(),
+        parser=ParserConfig(name="sec"),
+        provider=ProviderConfig(name="openai", model="gpt-test"),
+        prompt=PromptConfig(name="default", system_prompt="Sys"),
+        resume=str(run_dir) if run_dir else None,
+    )
+
+
+def test_manifest_round_trip_ignores_torn_line(tmp_path):
+    manifest = RunManifest(tmp_path)
+    manifest.update_meta(mlflow_run_id="abc")
+    manifest.record("chunk", 2, [DatasetItem(question="q", answer="a", context="chunk")] * 2)
+    manifest.close()
+    with open(tmp_path / RunManifest.CHUNKS_FILE, "a", encoding="utf-8") as f:
+        f.write('{"chunk": "dead')
+
+    reloaded = RunManifest(tmp_path)
+    assert reloaded.meta["mlflow_run_id"] == "abc"
+    assert len(reloaded.completed("chunk", 2)) == 2
+    # More questions than were requested means the chunk must be regenerated
+    assert reloaded.completed("chunk", 3) is None
+    assert not (tmp_path / "manifest.json.tmp").exists()
+
+
+def test_resume_skips_finished_chunks(tmp_path):
+    texts = [f"chunk-{i}" for i in range(4)]
+
+    # First run dies on the third chunk
+    crashed = RecordingProvider(fail_on="chunk-2")
+    try:
+        Generator(_config(), provider=crashed, manifest=RunManifest(tmp_path)).generate_from_texts(texts, 4)
+    except KeyboardInterrupt:
+        pass
+
+    resumed = RecordingProvider()
+    dataset = Generator(_config(run_dir=tmp_path), provider=resumed).generate_from_texts(texts, 4)
+
+    assert resumed.calls == ["chunk-2", "chunk-3"]
+    assert [item.context for item in dataset.items] == texts
+
+
+def test_chunk_that_meets_the_quota_is_recorded(tmp_path):
+    texts = ["chunk-0", "chunk-1"]
+    with RunManifest(tmp_path) as manifest:
+        Generator(_config(), provider=RecordingProvider(), manifest=manifest).generate_from_texts(texts, 4)
+    assert manifest._file is None
+
+    # The last chunk's items met the quota; a resume must not generate it again
+    resumed = RecordingProvider()
+    dataset = Generator(_config(run_dir=tmp_path), provider=resumed).generate_from_texts(texts, 4)
+
+    assert resumed.calls == []
+    assert len(dataset.items) == 4
@@ -0,0 +1,118 @@
+import numpy as np
+import pytest
+
+from findodo.config import Config, DedupConfig
+from findodo.dedup import Deduplicator, DedupWriter, MinHasher, SignatureIndex
+from findodo.models import DatasetItem
+from findodo.storage import JsonlWriter, read_jsonl
+
+REVENUE = "What was the company's total net revenue in fiscal 2023 compared to fiscal 2022?"
+REVENUE_REWORDED = "What was the company's total net revenue in fiscal 2023 compared with fiscal 2022?"
+EMPLOYEES = "How many full-time employees did the company have at the end of the fiscal year?"
+ANSWER = "Net revenue was $383.3 billion in 2023 and $394.3 billion in 2022."
+
+
+def item(question, answer=ANSWER):
+    return DatasetItem(question=question, answer=answer, context="chunk")
+
+
+def make_deduplicator(index=None, run_id="run1", **kwargs):
+    hasher = MinHasher(num_perm=128, bands=16)
+    return Deduplicator(hasher, index if index is not None else SignatureIndex(hasher), run_id=run_id, **kwargs)
+
+
+def test_signatures_estimate_jaccard_similarity():
+    hasher = MinHasher()
+    signatures = hasher.signatures([REVENUE, REVENUE_REWORDED, EMPLOYEES, REVENUE])
+
+    assert np.array_equal(signatures[0], signatures[3])
+    assert (signatures[0] == signatures[1]).mean() > 0.7
+    assert (signatures[0] == signatures[2]).mean() < 0.2
+    # Same seed, same signatures: indexes stay valid across runs
+    assert np.array_equal(MinHasher().signatures([EMPLOYEES]), signatures[2:3])
+
+
+def test_near_duplicates_within_a_batch_are_dropped():
+    deduplicator = make_deduplicator()
+
+    kept = deduplicator.filter([item(REVENUE), item(EMPLOYEES), item(REVENUE_REWORDED), item(REVENUE.upper())])
+
+    assert [i.question for i in kept] == [REVENUE, EMPLOYEES]
+    assert deduplicator.stats.duplicates_in_run == 2
+    assert deduplicator.stats.examples[0] == {"duplicate": REVENUE_REWORDED, "of": REVENUE}
+
+
+def test_threshold_and_fields_decide_what_counts_as_duplicate():
+    # Same question, different answers: duplicates on the question alone, distinct on question + answer
+    items = [item(EMPLOYEES, "About 161,000."), item(EMPLOYEES, "The filing does not state a headcount for 2021.")]
+
+    assert len(make_deduplicator(fields=["question"]).filter(items)) == 1
+    assert len(make_deduplicator().filter(items)) == 2
+    assert len(make_deduplicator(threshold=1.0).filter([item(REVENUE), item(REVENUE_REWORDED)])) == 2
+
+
+def test_index_matches_earlier_batches_and_runs(tmp_path):
+    path = tmp_path / "index.npz"
+    first = make_deduplicator(index_path=path)
+    assert len(first.filter([item(REVENUE)])) == 1
+    assert first.filter([item(REVENUE_REWORDED)]) == []
+    first.save()
+
+    hasher = MinHasher(num_perm=128, bands=16)
+    second = make_deduplicator(SignatureIndex.load(path, hasher), run_id="run2")
+    kept = second.filter([item(REVENUE_REWORDED), item(EMPLOYEES)])
+
+    assert [i.question for i in kept] == [EMPLOYEES]
+    assert second.stats.duplicates_of_previous_runs == 1
+    # A resumed run ignores its own earlier rows
+    assert len(SignatureIndex.load(path, hasher, exclude_run="run1")) == 0
+
+
+def test_index_rejects_other_hash_parameters(tmp_path):
+    path = tmp_path / "index.npz"
+    deduplicator = make_deduplicator(index_path=path)
+    deduplicator.filter([item(REVENUE)])
+    deduplicator.save()
+
+    with pytest.raises(ValueError):
+        SignatureIndex.load(path, MinHasher(num_perm=64, bands=16))
+    with pytest.raises(ValueError):
+        MinHasher(num_perm=128, bands=10)
+
+
+def test_many_segments_are_merged():
+    deduplicator = make_deduplicator()
+    questions = [f"Question number {i} about segment {i * 7919} revenue?" for i in range(40)]
+    for question in questions:
+        deduplicator.filter([item(question, answer=question)])
+
+    assert len(deduplicator.index) == 40
+    assert deduplicator.filter([item(q, answer=q) for q in questions]) == []
+
+
+def test_dedup_writer_filters_before_the_inner_writer(tmp_path):
+    deduplicator = make_deduplicator(index_path=tmp_path / "index.npz")
+    with DedupWriter(JsonlWriter(tmp_path / "run.jsonl"), deduplicator, batch_size=2) as writer:
+        writer.begin_target("AAPL")
+        for question in (REVENUE, EMPLOYEES, REVENUE_REWORDED):
+            writer.write(item(question))
+
+    assert [i.question for i in read_jsonl(tmp_path / "run.jsonl")] == [REVENUE, EMPLOYEES]
+    assert writer.count == 2
+    assert (tmp_path / "index.npz").exists()
+
+
+def test_from_config_defaults_the_index_under_output_dir(tmp_path):
+    config = Config(
+        chunker={"chunk_size": 100, "chunk_overlap": 0},
+        parser={"name": "sec"},
+        provider={"name": "openai", "model": "gpt-4"},
+        prompt={"name": "default", "system_prompt": "p"},
+        output_dir=str(tmp_path),
+        dedup=DedupConfig(enabled=True, num_perm=64, bands=8),
+    )
+    deduplicator = Deduplicator.from_config(config, run_id="run1")
+    deduplicator.filter([item(REVENUE)])
+    deduplicator.save()
+
+    assert (tmp_path / "dedup" / "index.npz").exists()
@@ -0,0 +1,110 @@
+import pytest
+
+from findodo.config import Config
+from findodo.estimate import DryRunProvider, Estimator, model_prices
+from findodo.generator import Generator
+from findodo.models import DatasetItem
+from findodo.providers.cache import ResponseCache
+from findodo.providers.openai import OpenAIProvider
+
+CHUNKS = [f"Net revenue of segment {i} grew {i * 3}% to ${i * 17} million in fiscal 2023." for i in range(4)]
+
+
+def make_generator(tmp_path, provider=None, estimate=None, **provider_settings):
+    config = Config(
+        chunker={"chunk_size": 100, "chunk_overlap": 0},
+        parser={"name": "sec"},
+        provider={"name": "openai", "model": "gpt-4", "cache": {"mode": "bypass"}, **provider_settings},
+        prompt={"name": "default", "system_prompt": "You write financial QA pairs."},
+        output_dir=str(tmp_path),
+        estimate=estimate or {},
+    )
+    return Generator(config, provider=provider or DryRunProvider.from_config(config))
+
+
+def test_prompt_tokens_match_what_the_provider_reserves(tmp_path):
+    generator = make_generator(tmp_path)
+    estimator = Estimator(generator)
+
+    target = estimator.add(CHUNKS, total_questions=8, source="AAPL")
+
+    openai = OpenAIProvider(generator.config.provider, generator.config.prompt)
+    reserved = sum(openai._estimate_tokens(openai._request_kwargs(text, 2), 2) for text in CHUNKS)
+    assert (target.requests, target.questions) == (4, 8)
+    assert target.completion_tokens == 8 * 150
+    assert target.prompt_tokens + target.completion_tokens == reserved
+
+
+def test_packing_and_cache_hits_reduce_requests(tmp_path):
+    cache = ResponseCache(tmp_path / "cache.sqlite")
+    key = ResponseCache.make_key("gpt-4", 0.0, "You write financial QA pairs.", CHUNKS[0], 2)
+    cache.put(key, [DatasetItem(question="q", answer="a", context=CHUNKS[0])])
+    cache.close()
+
+    generator = make_generator(
+        tmp_path,
+        cache={"mode": "read_only", "path": str(tmp_path / "cache.sqlite")},
+        packing={"enabled": True, "max_chunks": 8},
+    )
+    estimate = Estimator(generator)
+    estimate.add(CHUNKS, total_questions=8)
+    result = estimate.result()
+
+    # One packed request for the three uncached chunks
+    assert (result.requests, result.cached_chunks) == (1, 1)
+    assert result.completion_tokens == 6 * 150
+
+
+def test_wall_time_follows_concurrency_and_rate_limits(tmp_path):
+    settings = {"rate_limit": {"enabled": True, "completion_tokens_per_question": 0}}
+    estimate = {"request_overhead_s": 1.0}
+
+    concurrent = Estimator(make_generator(tmp_path, estimate=estimate, max_concurrency=2, **settings))
+    concurrent.add(CHUNKS, total_questions=4)
+    result = concurrent.result()
+    assert result.wall_time_s == pytest.approx(2.0)
+    assert result.limited_by == "concurrency"
+
+    # Two requests fit the first minute's burst, then one request every 30s
+    settings["rate_limit"]["requests_per_minute"] = 2
+    throttled = Estimator(make_generator(tmp_path, estimate=estimate, max_concurrency=4, **settings))
+    throttled.add(CHUNKS, total_questions=4)
+    result = throttled.result()
+    assert result.wall_time_s == pytest.approx(61.0)
+    assert result.limited_by == "requests_per_minute"
+
+
+def test_cost_uses_list_prices_unless_configured(tmp_path):
+    assert model_prices("gpt-4-turbo-preview") == (10.0, 30.0)
+    assert model_prices("gpt-4o-mini-2024-07-18") == (0.15, 0.6)
+    assert model_prices("my-local-model") is None
+
+    estimator = Estimator(make_generator(tmp_path))
+    estimator.add(CHUNKS, total_questions=4)
+    result = estimator.result()
+    assert result.cost_usd == pytest.approx((result.prompt_tokens * 30 + result.completion_tokens * 60) / 1e6)
+
+    estimator = Estimator(make_generator(tmp_path, estimate={"prompt_usd_per_1m": 1.0, "completion_usd_per_1m": 0}))
+    estimator.add(CHUNKS, total_questions=4)
+    result = estimator.result()
+    assert result.cost_usd == pytest.approx(result.prompt_tokens / 1e6)
+
+
+def test_batch_runs_are_discounted_and_have_no_wall_time(tmp_path):
+    generator = make_generator(tmp_path, name="openai_batch")
+    assert generator.provider.is_batch
+
+    estimator = Estimator(generator)
+    estimator.add(CHUNKS, total_questions=4)
+    result = estimator.result()
+
+    assert result.cost_usd == pytest.approx((result.prompt_tokens * 30 + result.completion_tokens * 60) / 2e6)
+    assert result.wall_time_s is None
+    assert "estimate.wall_time_s" not in result.metrics()
+
+
+def test_dry_run_provider_never_calls_the_api(tmp_path):
+    generator = make_generator(tmp_path)
+
+    with pytest.raises(RuntimeError):
+        generator.generate_from_texts(CHUNKS, total_questions=2)
@@ -0,0 +1,60 @@
+import subprocess
+import sys
+from importlib.metadata import EntryPoint
+from pathlib import Path
+
+import pytest
+
+from findodo import registry
+from findodo.parsers.pdf import PDFParser
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+
+
+def test_builtin_components_resolve_by_name():
+    assert registry.load_parser("pdf") is PDFParser
+    assert registry.load_provider("openai").__name__ == "OpenAIProvider"
+
+
+def test_unknown_names_list_the_available_ones():
+    with pytest.raises(ValueError, match="Available: .*'hybrid'"):
+        registry.load_parser("xbrl")
+
+
+def test_entry_points_extend_the_registry(monkeypatch):
+    plugin = EntryPoint(name="xbrl", value="findodo.parsers.pdf:PDFParser", group=registry.PARSER_ENTRY_POINTS)
+
+    def fake_entry_points(group, name=None):
+        return [ep for ep in [plugin] if ep.group == group and name in (None, ep.name)]
+
+    monkeypatch.setattr(registry, "entry_points", fake_entry_points)
+
+    assert registry.load_parser("xbrl") is PDFParser
+    assert "xbrl" in registry.available_parsers()
+
+
+def test_generator_imports_only_what_it_uses():
+    script = """
+import sys
+from findodo.config import Config, ChunkerConfig, ParserConfig, ProviderConfig, PromptConfig
+from findodo.generator import Generator
+import findodo.main
+
+config = Config(
+    chunker=ChunkerConfig(chunk_size=100, chunk_overlap=10),
+    parser=ParserConfig(name="pdf"),
+    provider=ProviderConfig(name="openai", model="gpt-test", api_key="sk-test"),
+    prompt=PromptConfig(name="test", system_prompt="Test Prompt"),
+)
+gen = Generator(config)
+# mlflow is bound lazily in findodo.main; its submodules only appear once it really loads
+before = {m for m in ("edgar", "pypdf", "docling", "mlflow.tracking") if m in sys.modules}
+gen.get_parser()
+after = {m for m in ("edgar", "pypdf", "docling") if m in sys.modules}
+print(sorted(before), sorted(after))
+"""
+    result = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, env={"PYTHONPATH": str(SRC)}, check=True
+    )
+
+    assert result.stdout.split("\n")[-2] == "[] ['pypdf']"
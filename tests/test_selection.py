@@ -0,0 +1,36 @@
+import numpy as np
+
+from findodo.selection import chunk_vectors, farthest_point_sample
+
+
+def test_chunk_vectors_are_normalized_and_seeded():
+    tokens = [[1, 2, 3, 4], [1, 2, 3, 5], [900, 901, 902], []]
+
+    vectors = chunk_vectors(tokens, num_features=64, seed=1)
+
+    assert vectors.shape == (4, 64)
+    assert np.allclose(np.linalg.norm(vectors[:3], axis=1), 1.0)
+    assert not vectors[3].any()
+    # Shared n-grams make chunks similar
+    assert vectors[0] @ vectors[1] > vectors[0] @ vectors[2]
+    assert np.array_equal(chunk_vectors(tokens, 64, seed=1), vectors)
+
+
+def test_farthest_point_sample_covers_every_cluster():
+    rng = np.random.default_rng(0)
+    centers = np.eye(8)[:4]
+    points = np.repeat(centers, 25, axis=0) + rng.normal(scale=0.05, size=(100, 8))
+    points /= np.linalg.norm(points, axis=1, keepdims=True)
+
+    picked, assignment = farthest_point_sample(points, 4, seed=3)
+
+    assert sorted(i // 25 for i in picked) == [0, 1, 2, 3]
+    # Every point is assigned to the picked point of its own cluster
+    assert all(picked[assignment[i]] // 25 == i // 25 for i in range(100))
+    assert farthest_point_sample(points, 4, seed=3)[0] == picked
+
+
+def test_farthest_point_sample_never_repeats_identical_points():
+    picked, _ = farthest_point_sample(np.ones((5, 3)) / np.sqrt(3), 3)
+
+    assert len(set(picked)) == 3